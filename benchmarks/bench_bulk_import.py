@@ -0,0 +1,121 @@
+#!/usr/bin/python3
+"""
+Benchmarks importing, updating and deleting Reviews one object at a time
+and with the bulk new_many(), update_many() and delete_many().
+
+For every count, in a fresh process per path, Reviews of one Place are
+built, then imported, given a new text and deleted, each step ending with
+a save(). The per-object path calls new(), update() and delete() for
+every Review; the bulk path makes one call per step. The time of every
+step is printed.
+
+The HBNB_* environment variables select the storage, e.g.
+HBNB_TYPE_STORAGE=db and the HBNB_MYSQL_* ones for DBStorage.
+
+Usage:
+    ./benchmarks/bench_bulk_import.py [objects ...]
+"""
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+def timed(function):
+    """Calls a function and returns the elapsed time in seconds"""
+    start = time.perf_counter()
+    function()
+    return time.perf_counter() - start
+
+
+def measure(objects_count, bulk):
+    """Prints the import, update and delete times of the Reviews"""
+    from models import storage
+    from models.city import City
+    from models.place import Place
+    from models.review import Review
+    from models.state import State
+    from models.user import User
+
+    user = User(email="bench@hbnb.io", password="bench")
+    state = State(name="Bench")
+    city = City(name="Bench", state_id=state.id)
+    place = Place(name="Bench", city_id=city.id, user_id=user.id)
+    for obj in (user, state, city, place):
+        storage.new(obj)
+    storage.save()
+
+    reviews = [Review(text=f"Review {i}", place_id=place.id,
+                      user_id=user.id) for i in range(objects_count)]
+    ids = [review.id for review in reviews]
+    count = storage.count("Review")
+
+    def import_reviews():
+        if bulk:
+            storage.new_many(reviews)
+        else:
+            for review in reviews:
+                storage.new(review)
+            storage.save()
+        storage.flush()
+
+    def update_reviews():
+        if bulk:
+            storage.update_many(Review, ids, {"text": "Updated"})
+        else:
+            for _id in ids:
+                storage.update(storage.find("Review", _id), text="Updated")
+            storage.save()
+        storage.flush()
+
+    def delete_reviews():
+        if bulk:
+            storage.delete_many(Review, ids)
+        else:
+            for _id in ids:
+                storage.delete(storage.find("Review", _id))
+            storage.save()
+        storage.flush()
+
+    times = [timed(import_reviews)]
+    assert storage.count("Review") == count + objects_count
+    times.append(timed(update_reviews))
+    times.append(timed(delete_reviews))
+    assert storage.count("Review") == count
+
+    for obj in (place, city, state, user):
+        storage.delete(storage.find(obj.__class__.__name__, obj.id))
+    storage.save()
+    storage.flush()
+
+    print(*times)
+
+
+def main():
+    """Runs the measurements in a process per count and path"""
+    if len(sys.argv) > 3 and sys.argv[1] == "--measure":
+        measure(int(sys.argv[2]), sys.argv[3] == "bulk")
+        return
+
+    counts = sys.argv[1:] or ["1000000"]
+
+    print(f"  {'objects':>9}  {'path':<12}{'import':>10}{'update':>10}"
+          f"{'delete':>10}")
+    for objects_count in counts:
+        for path in ("per object", "bulk"):
+            output = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), "--measure",
+                 objects_count, path.replace(" ", "_")],
+                cwd=tempfile.mkdtemp(), check=True,
+                capture_output=True, text=True
+            ).stdout
+            times = (f"{float(elapsed):>9.2f}s" for elapsed in output.split())
+            print(f"  {objects_count:>9}  {path:<12}{''.join(times)}")
+
+
+if __name__ == "__main__":
+    main()
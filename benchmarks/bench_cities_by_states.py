@@ -0,0 +1,86 @@
+#!/usr/bin/python3
+"""
+Benchmarks the /cities_by_states page in file storage mode.
+
+The page is rendered twice over the same data set: once with the
+original State.cities property, which scans every City for each State,
+and once with the foreign key index kept by FileStorage.
+
+Usage:
+    ./benchmarks/bench_cities_by_states.py [states] [cities]
+"""
+import importlib.util
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(tempfile.mkdtemp())
+
+from models import storage  # noqa: E402
+from models.city import City  # noqa: E402
+from models.state import State  # noqa: E402
+
+
+def legacy_cities(self):
+    """Returns the cities of a state by scanning every City"""
+    return [city for city in storage.all(City).values()
+            if city.state_id == self.id]
+
+
+def load_app():
+    """Imports the 8-cities_by_states Flask application"""
+    path = os.path.join(ROOT, "web_flask", "8-cities_by_states.py")
+    spec = importlib.util.spec_from_file_location("cities_by_states", path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module.app
+
+
+def populate(states_count, cities_count):
+    """Fills the storage with states and evenly distributed cities"""
+    states = [State(name=f"state_{i}") for i in range(states_count)]
+    for state in states:
+        storage.new(state)
+
+    for i in range(cities_count):
+        state = states[i % states_count]
+        storage.new(City(name=f"city_{i}", state_id=state.id))
+
+
+def render(client):
+    """Requests the page and returns the elapsed time in seconds"""
+    start = time.perf_counter()
+    response = client.get("/cities_by_states")
+    elapsed = time.perf_counter() - start
+    assert response.status_code == 200
+    return elapsed, len(response.data)
+
+
+def main():
+    """Runs the benchmark"""
+    states_count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    cities_count = int(sys.argv[2]) if len(sys.argv) > 2 else 50000
+
+    populate(states_count, cities_count)
+    client = load_app().test_client()
+
+    indexed_cities = State.cities
+    State.cities = property(legacy_cities)
+    before, size = render(client)
+    State.cities = indexed_cities
+    after, indexed_size = render(client)
+    assert size == indexed_size
+
+    print(f"/cities_by_states: {states_count} states x "
+          f"{cities_count} cities ({size} bytes)")
+    print(f"  before (scan):  {before:.3f}s")
+    print(f"  after (index):  {after:.3f}s")
+    print(f"  speedup:        {before / after:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+#!/usr/bin/python3
+"""
+Stress test of FileStorage shared by several processes.
+
+Writer processes each create States one at a time, rename every other
+one they created, and save() after each change, while reader processes
+keep refreshing the storage with close() and counting the States. Every
+save of a writer also sets an attribute of its own, writer_<number>, on
+a State shared by all writers. Once the writers are done, the file is
+loaded by a fresh process and every State created by a writer must be
+there under its last name, and the shared State must hold the last
+value of every writer's attribute: missing States, stale names and
+stale attributes are lost updates. The throughput of the writers and
+readers is printed, and the script exits with an error if an update was
+lost, a read failed or a reader saw the count of States go down.
+
+The HBNB_FILE_* environment variables are passed to the processes, so
+every storage mode can be tested.
+
+Usage:
+    ./benchmarks/bench_concurrent_storage.py [writers] [readers] [saves]
+"""
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+def setup():
+    """Saves the State shared by the writers, prints its id"""
+    from models import storage
+    from models.state import State
+
+    state = State(name="shared")
+    storage.new(state)
+    storage.save()
+    print(state.id)
+
+
+def writer(number, saves_count, shared_id):
+    """Creates and renames States and updates the shared State, prints
+    the final names by id and the last value of the shared attribute"""
+    from models import storage
+    from models.state import State
+
+    names = {}
+    created = []
+    attr = f"writer_{number}"
+    for i in range(saves_count):
+        if i % 2 and created:
+            state = created[i // 2 % len(created)]
+            state.name = f"{state.name}!"
+        else:
+            state = State(name=f"writer {number} state {i}")
+            storage.new(state)
+            created.append(state)
+        setattr(storage.find("State", shared_id), attr, i)
+        storage.save()
+        names[state.id] = state.name
+
+    print(json.dumps({"names": names, "shared": {attr: saves_count - 1}}))
+
+
+def reader():
+    """Refreshes the storage until told to stop, prints the statistics"""
+    from models import storage
+
+    reads = errors = regressions = 0
+    last_count = 0
+    while not os.path.exists("stop"):
+        try:
+            storage.close()
+            count = storage.count("State")
+        except Exception:
+            errors += 1
+            continue
+
+        reads += 1
+        if count < last_count:
+            regressions += 1
+        last_count = count
+
+    print(f"{reads} {errors} {regressions}")
+
+
+def check(expected):
+    """Prints the number of States missing or with a stale name, and of
+    stale attributes of the shared State"""
+    from models import storage
+
+    lost = 0
+    for _id, name in expected["names"].items():
+        state = storage.find("State", _id)
+        if not state or state.name != name:
+            lost += 1
+
+    shared = storage.find("State", expected["shared_id"])
+    lost_attributes = sum(1 for attr, value in expected["shared"].items()
+                          if getattr(shared, attr, None) != value)
+
+    print(lost, lost_attributes)
+
+
+def run(*args):
+    """Starts a process running this script with some arguments"""
+    env = dict(os.environ)
+    env.pop("HBNB_TYPE_STORAGE", None)
+    return subprocess.Popen(
+        [sys.executable, os.path.abspath(__file__), *map(str, args)],
+        env=env, stdout=subprocess.PIPE, text=True)
+
+
+def main():
+    """Runs the writers and readers, then checks for lost updates"""
+    if len(sys.argv) > 4 and sys.argv[1] == "--writer":
+        writer(int(sys.argv[2]), int(sys.argv[3]), sys.argv[4])
+        return
+    if len(sys.argv) > 1 and sys.argv[1] == "--setup":
+        setup()
+        return
+    if len(sys.argv) > 1 and sys.argv[1] == "--reader":
+        reader()
+        return
+    if len(sys.argv) > 1 and sys.argv[1] == "--check":
+        check(json.load(sys.stdin))
+        return
+
+    arguments = [int(arg) for arg in sys.argv[1:4]]
+    writers_count, readers_count, saves_count = \
+        arguments + [8, 8, 100][len(arguments):]
+    os.chdir(tempfile.mkdtemp())
+    shared_id = run("--setup").communicate()[0].strip()
+
+    start = time.perf_counter()
+    readers = [run("--reader") for _ in range(readers_count)]
+    writers = [run("--writer", number, saves_count, shared_id)
+               for number in range(writers_count)]
+
+    expected = {"names": {}, "shared": {}, "shared_id": shared_id}
+    for process in writers:
+        output, _ = process.communicate()
+        written = json.loads(output)
+        expected["names"].update(written["names"])
+        expected["shared"].update(written["shared"])
+    elapsed = time.perf_counter() - start
+
+    open("stop", "w").close()
+    reads = errors = regressions = 0
+    for process in readers:
+        output, _ = process.communicate()
+        counts = [int(value) for value in output.split()]
+        reads, errors, regressions = (
+            reads + counts[0], errors + counts[1], regressions + counts[2])
+
+    checker = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--check"],
+        input=json.dumps(expected), capture_output=True, text=True,
+        check=True)
+    lost, lost_attributes = map(int, checker.stdout.split())
+    saves = writers_count * saves_count
+
+    print(f"{writers_count} writers x {saves_count} saves, "
+          f"{readers_count} readers, {elapsed:.2f}s")
+    print(f"  saves:        {saves / elapsed:8.1f}/s")
+    print(f"  reads:        {reads / elapsed:8.1f}/s "
+          f"({errors} errors, {regressions} count regressions)")
+    print(f"  lost updates: {lost} of {len(expected['names'])} States, "
+          f"{lost_attributes} of {len(expected['shared'])} attributes of "
+          f"the shared State")
+    lost += lost_attributes
+    if lost or errors or regressions:
+        sys.exit(f"{lost} lost updates, {errors} read errors, "
+                 f"{regressions} count regressions")
+
+
+if __name__ == "__main__":
+    main()
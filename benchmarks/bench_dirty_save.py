@@ -0,0 +1,70 @@
+#!/usr/bin/python3
+"""
+Benchmarks FileStorage.save() latency against the number of objects
+changed since the previous save.
+
+Each measurement changes one attribute on a number of objects and then
+saves; the time of a full re-serialization of the store, as save() used
+to do, is reported for comparison.
+
+Usage:
+    ./benchmarks/bench_dirty_save.py [objects]
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(tempfile.mkdtemp())
+
+from models import storage  # noqa: E402
+from models.review import Review  # noqa: E402
+
+
+def full_save():
+    """Serializes every object, the way save() did before dirty tracking"""
+    serialized_objects = {
+        key: obj.to_dict()
+        for key, obj in storage.all().items()
+    }
+
+    with open("full.json", "w") as file:
+        json.dump(serialized_objects, file)
+
+
+def timed(function):
+    """Calls a function and returns the elapsed time in seconds"""
+    start = time.perf_counter()
+    function()
+    return time.perf_counter() - start
+
+
+def main():
+    """Runs the benchmark"""
+    objects_count = int(sys.argv[1]) if len(sys.argv) > 1 else 500000
+
+    for i in range(objects_count):
+        storage.new(Review(text=f"review {i}", place_id=f"place_{i % 1000}",
+                           user_id=f"user_{i % 5000}"))
+
+    objects = list(storage.all().values())
+    print(f"{objects_count} objects")
+    print(f"  first save (cold cache):  {timed(storage.save):.3f}s")
+    print(f"  full re-serialization:    {timed(full_save):.3f}s")
+
+    for dirty_count in (0, 1, 100, 10000, 100000, objects_count):
+        if dirty_count > objects_count:
+            continue
+
+        for obj in objects[:dirty_count]:
+            obj.text = "changed"
+
+        print(f"  save, {dirty_count:>7} dirty:      "
+              f"{timed(storage.save):.3f}s")
+
+
+if __name__ == "__main__":
+    main()
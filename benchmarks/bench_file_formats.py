@@ -0,0 +1,109 @@
+#!/usr/bin/python3
+"""
+Benchmarks the FileStorage file formats (HBNB_FILE_FORMAT).
+
+For every size and format, in a fresh process, a store of Users,
+States, Cities, Amenities, Places and Reviews is generated, then the time
+of a full save(), the time of a reload() and the size of the file are
+measured.
+
+Usage:
+    ./benchmarks/bench_file_formats.py [objects ...]
+"""
+import gc
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from uuid import uuid4
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+FORMATS = ("json", "binary")
+
+
+def record(i, parents):
+    """Returns the to_dict() dictionary of a generated object"""
+    now = datetime.now().isoformat()
+    parent = parents[i % len(parents)]
+    class_name = ("Review", "Review", "Place", "City", "User", "Amenity",
+                  "Review", "Place", "State", "Review")[i % 10]
+    dictionary = {"__class__": class_name, "id": str(uuid4()),
+                  "created_at": now, "updated_at": now}
+
+    if class_name in ("State", "Amenity"):
+        dictionary.update(name=f"{class_name} {i}")
+    elif class_name == "City":
+        dictionary.update(name=f"City {i}", state_id=parent)
+    elif class_name == "User":
+        dictionary.update(email=f"user{i}@hbnb.io", password="secret",
+                          first_name="Betty", last_name="Holberton")
+    elif class_name == "Place":
+        dictionary.update(name=f"Place {i}", city_id=parent, user_id=parent,
+                          description="A cozy place", number_rooms=2,
+                          number_bathrooms=1, max_guest=4,
+                          price_by_night=100, latitude=37.77,
+                          longitude=-122.41, amenity_ids=parents[:3])
+    else:
+        dictionary.update(text="Great stay", place_id=parent,
+                          user_id=parents[-1 - i % len(parents)])
+
+    return dictionary
+
+
+def measure(objects_count):
+    """Prints the save time, reload time and file size of the format"""
+    from models import storage
+
+    parents = [str(uuid4()) for _ in range(1000)]
+    for i in range(objects_count):
+        storage.new(storage._deserialize(record(i, parents)))
+
+    gc.collect()
+    start = time.perf_counter()
+    storage.save()
+    save_time = time.perf_counter() - start
+
+    size = sum(os.path.getsize(name) for name in os.listdir(".")
+               if name.startswith("file."))
+
+    gc.collect()
+    start = time.perf_counter()
+    storage.reload()
+    load_time = time.perf_counter() - start
+    assert len(storage.all()) == objects_count
+
+    print(f"{load_time} {save_time} {size}")
+
+
+def main():
+    """Runs the measurements in a process per size and format"""
+    if len(sys.argv) > 2 and sys.argv[1] == "--measure":
+        measure(int(sys.argv[2]))
+        return
+
+    sizes = sys.argv[1:] or ["10000", "100000", "1000000"]
+
+    print(f"  {'objects':>9}{'format':>8}{'load':>10}{'save':>10}"
+          f"{'size':>12}")
+    for objects_count in sizes:
+        for file_format in FORMATS:
+            env = dict(os.environ, HBNB_FILE_FORMAT=file_format)
+            env.pop("HBNB_TYPE_STORAGE", None)
+            output = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), "--measure",
+                 objects_count],
+                env=env, cwd=tempfile.mkdtemp(), check=True,
+                capture_output=True, text=True
+            ).stdout
+            load_time, save_time, size = output.split()
+            print(f"  {objects_count:>9}{file_format:>8}"
+                  f"{float(load_time):>9.3f}s{float(save_time):>9.3f}s"
+                  f"{int(size) / 1024 / 1024:>9.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
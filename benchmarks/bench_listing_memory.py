@@ -0,0 +1,128 @@
+#!/usr/bin/python3
+"""
+Benchmarks the peak memory of listing every Review, with all() and with
+the streaming iter_all(), and the time of reading them page by page.
+
+For every count, Reviews of one Place are added, then, in a fresh process
+per path, every Review is turned into its string, as the console "all"
+command does, either from all() or from iter_all() fetching a batch of
+rows at a time, or read page by page with page(). The peak memory traced
+while listing and the elapsed time, from another process without
+tracing, are printed. The Reviews are deleted afterwards.
+
+The HBNB_* environment variables select the storage, e.g.
+HBNB_TYPE_STORAGE=db and the HBNB_MYSQL_* ones for DBStorage.
+
+Usage:
+    ./benchmarks/bench_listing_memory.py [objects ...]
+"""
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+BATCH_SIZE = 1000
+
+
+def add_reviews(objects_count):
+    """Adds the Reviews of one Place, prints the IDs to delete after"""
+    from models import storage
+    from models.city import City
+    from models.place import Place
+    from models.review import Review
+    from models.state import State
+    from models.user import User
+
+    user = User(email="bench@hbnb.io", password="bench")
+    state = State(name="Bench")
+    city = City(name="Bench", state_id=state.id)
+    place = Place(name="Bench", city_id=city.id, user_id=user.id)
+    storage.new_many([user, state, city, place])
+    storage.new_many([Review(text=f"Review {i}", place_id=place.id,
+                             user_id=user.id)
+                      for i in range(objects_count)])
+    storage.flush()
+
+    print(user.id, state.id, city.id, place.id)
+
+
+def delete_reviews(user_id, state_id, city_id, place_id):
+    """Deletes the Reviews and the objects they belong to"""
+    from models import storage
+    from models.city import City
+    from models.place import Place
+    from models.review import Review
+    from models.state import State
+    from models.user import User
+
+    storage.delete_many(Review, [review.id for review in storage.query(
+        Review).filter("place_id", "==", place_id)])
+    for _class, _id in ((Place, place_id), (City, city_id),
+                        (State, state_id), (User, user_id)):
+        storage.delete_many(_class, [_id])
+    storage.flush()
+
+
+def measure(path, traced):
+    """Prints the peak memory or the time of listing the Reviews"""
+    from models import storage
+    from models.review import Review
+
+    if traced:
+        tracemalloc.start()
+    start = time.perf_counter()
+    if path == "page":
+        objects, token = storage.page(Review, BATCH_SIZE)
+        while token:
+            objects, token = storage.page(Review, BATCH_SIZE, token)
+    elif path == "iter_all":
+        for review in storage.iter_all(Review, BATCH_SIZE):
+            str(review)
+    else:
+        [str(review) for review in storage.all(Review).values()]
+    elapsed = time.perf_counter() - start
+
+    print(tracemalloc.get_traced_memory()[1] if traced else elapsed)
+
+
+def run(*args):
+    """Runs this script with arguments in a fresh process"""
+    return subprocess.run(
+        [sys.executable, os.path.abspath(__file__), *args],
+        cwd=run.cwd, check=True, capture_output=True, text=True
+    ).stdout.split()
+
+
+def main():
+    """Adds the Reviews and measures every path in its own process"""
+    if len(sys.argv) > 2 and sys.argv[1] == "--measure":
+        measure(sys.argv[2], len(sys.argv) > 3)
+        return
+    if len(sys.argv) > 2 and sys.argv[1] == "--add":
+        add_reviews(int(sys.argv[2]))
+        return
+    if len(sys.argv) > 2 and sys.argv[1] == "--delete":
+        delete_reviews(*sys.argv[2:])
+        return
+
+    counts = sys.argv[1:] or ["100000"]
+
+    print(f"  {'objects':>9}  {'path':<10}{'peak memory':>14}{'time':>10}")
+    for objects_count in counts:
+        run.cwd = tempfile.mkdtemp()
+        ids = run("--add", objects_count)
+        for path in ("all", "iter_all", "page"):
+            peak, = run("--measure", path, "--traced")
+            elapsed, = run("--measure", path)
+            print(f"  {objects_count:>9}  {path:<10}"
+                  f"{int(peak) / 2 ** 20:>11.1f} MB{float(elapsed):>9.2f}s")
+        run("--delete", *ids)
+
+
+if __name__ == "__main__":
+    main()
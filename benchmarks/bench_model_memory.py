@@ -0,0 +1,104 @@
+#!/usr/bin/python3
+"""
+Measures the memory held per file-mode model instance, with and without
+HBNB_COMPACT_MODELS=1.
+
+For every class, in a fresh process per class and mode, a JSON document
+of objects is decoded and hydrated the way FileStorage.reload() does it,
+the decoded dictionaries are dropped, and the memory still allocated is
+divided by the number of objects.
+Foreign keys reference a pool of 1000 parents, as in a real data set.
+
+Usage:
+    ./benchmarks/bench_model_memory.py [objects]
+"""
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import tracemalloc
+from datetime import datetime
+from uuid import uuid4
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+PARENTS = [str(uuid4()) for _ in range(1000)]
+
+
+def record(class_name, i):
+    """Returns the to_dict() dictionary of a generated object"""
+    now = datetime.now().isoformat()
+    dictionary = {"__class__": class_name, "id": str(uuid4()),
+                  "created_at": now, "updated_at": now}
+    parent = PARENTS[i % len(PARENTS)]
+
+    if class_name in ("State", "Amenity"):
+        dictionary.update(name=f"{class_name} {i}")
+    elif class_name == "City":
+        dictionary.update(name=f"City {i}", state_id=parent)
+    elif class_name == "User":
+        dictionary.update(email=f"user{i}@hbnb.io", password="secret",
+                          first_name="Betty", last_name="Holberton")
+    elif class_name == "Place":
+        dictionary.update(name=f"Place {i}", city_id=parent, user_id=parent,
+                          description="A cozy place", number_rooms=2,
+                          number_bathrooms=1, max_guest=4,
+                          price_by_night=100, latitude=37.77,
+                          longitude=-122.41, amenity_ids=PARENTS[:3])
+    elif class_name == "Review":
+        dictionary.update(text="Great stay", place_id=parent,
+                          user_id=PARENTS[-1 - i % len(PARENTS)])
+
+    return dictionary
+
+
+def measure(class_name, objects_count):
+    """Prints the bytes per object of a class in the current mode"""
+    from models import storage
+
+    text = json.dumps([record(class_name, i) for i in range(objects_count)])
+
+    tracemalloc.start()
+    dictionaries = json.loads(text)
+    objects = [storage._deserialize(dictionary)
+               for dictionary in dictionaries]
+    del dictionaries
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"{size / len(objects):.0f}")
+
+
+def main():
+    """Runs the measurement in a process per mode and prints a table"""
+    if len(sys.argv) > 3 and sys.argv[1] == "--measure":
+        measure(sys.argv[2], int(sys.argv[3]))
+        return
+
+    from models.engine.stored_classes import CLASSES
+
+    objects_count = sys.argv[1] if len(sys.argv) > 1 else "100000"
+    results = {}
+
+    for class_name in CLASSES.keys():
+        for compact in ("0", "1"):
+            env = dict(os.environ, HBNB_COMPACT_MODELS=compact)
+            env.pop("HBNB_TYPE_STORAGE", None)
+            output = subprocess.run(
+                [sys.executable, __file__, "--measure", class_name,
+                 objects_count],
+                env=env, cwd=tempfile.mkdtemp(), check=True,
+                capture_output=True, text=True
+            ).stdout
+            results.setdefault(class_name, []).append(int(output))
+
+    print(f"bytes per object ({objects_count} objects per class)")
+    print(f"  {'class':<10}{'default':>10}{'compact':>10}")
+    for class_name, (default, compact) in results.items():
+        print(f"  {class_name:<10}{default:>10}{compact:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+#!/usr/bin/python3
+"""
+Counts the SQL queries of the web_flask pages against the number of rows,
+with DBStorage.
+
+For every count, States, Cities, Users, Places and Amenities are added,
+every page listing them is requested through the Flask test client, and
+the number of statements sent to the database and the time of every
+request are printed. The rows are deleted afterwards. With the
+relationships the pages show loaded by all(), the number of queries of
+a page stays the same as rows are added, but for one more query per 500
+rows whose relationships are loaded by "selectin", the size of its IN
+lists.
+
+Requires HBNB_TYPE_STORAGE=db and the HBNB_MYSQL_* environment variables.
+
+Usage:
+    ./benchmarks/bench_page_queries.py [rows ...]
+"""
+import importlib
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+PAGES = (("8-cities_by_states", "/cities_by_states"),
+         ("10-hbnb_filters", "/hbnb_filters"),
+         ("100-hbnb", "/hbnb"))
+
+
+def main():
+    """Requests the pages for every count of rows, prints the queries"""
+    if os.getenv("HBNB_TYPE_STORAGE") != "db":
+        sys.exit("bench_page_queries.py requires HBNB_TYPE_STORAGE=db")
+
+    from sqlalchemy import event
+    from sqlalchemy.engine import Engine
+
+    from models import storage
+    from models.amenity import Amenity
+    from models.city import City
+    from models.place import Place
+    from models.state import State
+    from models.user import User
+
+    statements = []
+    event.listen(Engine, "before_cursor_execute",
+                 lambda *args: statements.append(args[2]))
+
+    clients = {module: importlib.import_module(f"web_flask.{module}")
+               .app.test_client() for module, _ in PAGES}
+
+    print(f"  {'rows':>6}  {'page':<20}{'queries':>8}{'time':>10}")
+    for rows_count in sys.argv[1:] or ["10", "100", "1000"]:
+        rows_count = int(rows_count)
+        objs = []
+        for i in range(rows_count):
+            user = User(email=f"bench{i}@hbnb.io", password=f"bench{i}",
+                        first_name="Bench", last_name=f"{i}")
+            state = State(name=f"State {i}")
+            city = City(name=f"City {i}", state_id=state.id)
+            objs += [user, state, city,
+                     Place(name=f"Place {i}", city_id=city.id,
+                           user_id=user.id),
+                     Amenity(name=f"Amenity {i}")]
+        storage.new_many(objs)
+
+        for module, url in PAGES:
+            del statements[:]
+            start = time.perf_counter()
+            clients[module].get(url)
+            elapsed = time.perf_counter() - start
+            print(f"  {rows_count:>6}  {url:<20}{len(statements):>8}"
+                  f"{elapsed * 1000:>7.1f} ms")
+
+        for _class in (Place, City, State, User, Amenity):
+            storage.delete_many(_class, [obj.id for obj in objs
+                                         if type(obj) is _class])
+
+
+if __name__ == "__main__":
+    main()
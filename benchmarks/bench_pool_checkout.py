@@ -0,0 +1,83 @@
+#!/usr/bin/python3
+"""
+Benchmarks the connection pool of DBStorage against the number of worker
+threads and the liveness check policy.
+
+For every number of workers and HBNB_DB_POOL_PRE_PING policy, in a fresh
+process, every worker handles requests of one short query, counting the
+States, each ending with storage.close() as the web_flask teardown does,
+which checks the connection back in. The elapsed time and the pool
+statistics are printed: the checkouts, the pings, the total and longest
+time checkouts waited for a connection, and the checkouts that timed
+out. Waits growing with the workers mean the pool is too small for them.
+
+Requires HBNB_TYPE_STORAGE=db and the HBNB_MYSQL_* environment variables;
+the other HBNB_DB_POOL_* ones are passed through.
+
+Usage:
+    ./benchmarks/bench_pool_checkout.py [workers ...]
+"""
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+REQUESTS = 200
+
+
+def measure(workers_count):
+    """Prints the elapsed time and pool statistics of the workers"""
+    from models import storage
+
+    def work():
+        for _ in range(REQUESTS):
+            storage.count("State")
+            storage.close()
+
+    workers = [threading.Thread(target=work) for _ in range(workers_count)]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - start
+
+    stats = storage.pool_stats()
+    print(elapsed, stats["checkouts"], stats["pings"], stats["wait_time"],
+          stats["max_wait"], stats["timeouts"])
+
+
+def main():
+    """Runs the measurements in a process per count and policy"""
+    if len(sys.argv) > 2 and sys.argv[1] == "--measure":
+        measure(int(sys.argv[2]))
+        return
+
+    if os.getenv("HBNB_TYPE_STORAGE") != "db":
+        sys.exit("bench_pool_checkout.py requires HBNB_TYPE_STORAGE=db")
+
+    counts = sys.argv[1:] or ["1", "5", "20"]
+
+    print(f"  {'workers':>7}  {'pre-ping':<8}{'time':>9}{'checkouts':>11}"
+          f"{'pings':>7}{'wait':>10}{'max wait':>10}{'timeouts':>10}")
+    for workers_count in counts:
+        for policy in ("always", "idle"):
+            output = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), "--measure",
+                 workers_count],
+                cwd=tempfile.mkdtemp(), check=True, capture_output=True,
+                text=True, env={**os.environ, "HBNB_DB_POOL_PRE_PING": policy}
+            ).stdout.split()
+            elapsed, checkouts, pings, wait_time, max_wait, timeouts = output
+            print(f"  {workers_count:>7}  {policy:<8}{float(elapsed):>8.2f}s"
+                  f"{checkouts:>11}{pings:>7}{float(wait_time):>9.3f}s"
+                  f"{float(max_wait):>9.3f}s{timeouts:>10}")
+
+
+if __name__ == "__main__":
+    main()
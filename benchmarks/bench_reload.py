@@ -0,0 +1,99 @@
+#!/usr/bin/python3
+"""
+Benchmarks FileStorage.reload() time.
+
+A file.json of the requested sizes is generated, then reloaded once
+through the original constructor path (class lookup through get_class()
+and __init__ setting every attribute through __setattr__) and once
+through the bulk hydration path (BaseModel.from_dict).
+
+Usage:
+    ./benchmarks/bench_reload.py [objects ...]
+"""
+import gc
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+from uuid import uuid4
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(tempfile.mkdtemp())
+
+from models import storage  # noqa: E402
+
+
+def legacy_deserialize(dictionary):
+    """Deserializes a dictionary the way reload() did before from_dict"""
+    _class = storage.get_class(dictionary.get("__class__"))
+    return _class(**dictionary)
+
+
+def generate(objects_count):
+    """Writes a file.json holding Places and Reviews"""
+    now = datetime.now().isoformat()
+    objects = {}
+
+    for i in range(objects_count):
+        _id = str(uuid4())
+        if i % 2:
+            dictionary = {"__class__": "Review", "text": f"review {i}",
+                          "place_id": str(uuid4()), "user_id": str(uuid4())}
+        else:
+            dictionary = {"__class__": "Place", "name": f"place {i}",
+                          "city_id": str(uuid4()), "user_id": str(uuid4()),
+                          "description": "A place", "number_rooms": 2,
+                          "number_bathrooms": 1, "max_guest": 4,
+                          "price_by_night": 100, "latitude": 1.5,
+                          "longitude": 2.5}
+
+        dictionary.update(id=_id, created_at=now, updated_at=now)
+        objects[f"{dictionary['__class__']}.{_id}"] = dictionary
+
+    with open("file.json", "w") as file:
+        json.dump(objects, file)
+
+
+def clear():
+    """Empties the storage, keeping file.json"""
+    os.replace("file.json", "data.json")
+    with open("file.json", "w") as file:
+        file.write("{}")
+    storage.reload()
+    os.replace("data.json", "file.json")
+
+
+def timed_reload():
+    """Reloads the storage and returns the elapsed time in seconds"""
+    gc.collect()
+    start = time.perf_counter()
+    storage.reload()
+    elapsed = time.perf_counter() - start
+    assert len(storage.all()) > 0
+    return elapsed
+
+
+def main():
+    """Runs the benchmark"""
+    sizes = [int(arg) for arg in sys.argv[1:]] or [100000, 1000000]
+
+    for objects_count in sizes:
+        generate(objects_count)
+
+        storage._deserialize = legacy_deserialize
+        before = timed_reload()
+        del storage._deserialize
+        clear()
+        after = timed_reload()
+        clear()
+
+        print(f"reload {objects_count} objects")
+        print(f"  before (__init__):   {before:.3f}s")
+        print(f"  after (from_dict):   {after:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
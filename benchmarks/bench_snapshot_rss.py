@@ -0,0 +1,111 @@
+#!/usr/bin/python3
+"""
+Benchmarks the memory of web workers reading the storage from file.json
+and from a memory-mapped snapshot (HBNB_FILE_SNAPSHOT=1).
+
+For every size, a store of States, Cities and Reviews is written both as
+file.json and as file.snapshot, then a worker process per mode loads the
+storage and renders the states list with the cities of 10 states. The
+private (anonymous) and file-backed resident memory of the workers are
+printed: file-backed pages of the snapshot are shared by every worker of
+the host through the page cache.
+
+Usage:
+    ./benchmarks/bench_snapshot_rss.py [objects ...]
+"""
+import os
+import subprocess
+import sys
+import tempfile
+from datetime import datetime
+from uuid import uuid4
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+if "--measure" not in sys.argv:
+    os.chdir(tempfile.mkdtemp())
+
+from models.engine.file_codecs import get_codec  # noqa: E402
+from models.engine.file_utils import write_atomically  # noqa: E402
+from models.engine.snapshot import Snapshot  # noqa: E402
+
+FOREIGN_KEYS = ("state_id", "city_id", "place_id", "user_id")
+
+
+def generate(objects_count):
+    """Writes file.json and file.snapshot, returns the dictionaries"""
+    now = datetime.now().isoformat()
+    states = [str(uuid4()) for _ in range(max(objects_count // 100, 10))]
+    records = {}
+
+    for i in range(objects_count):
+        _id = str(uuid4())
+        if i < len(states):
+            _id = states[i]
+            dictionary = {"__class__": "State", "name": f"State {i}"}
+        elif i % 10 == 0:
+            dictionary = {"__class__": "City", "name": f"City {i}",
+                          "state_id": states[i % len(states)]}
+        else:
+            dictionary = {"__class__": "Review", "text": "Great stay " * 8,
+                          "place_id": str(uuid4()), "user_id": str(uuid4())}
+
+        dictionary.update(id=_id, created_at=now, updated_at=now)
+        records[f"{dictionary['__class__']}.{_id}"] = dictionary
+
+    codec = get_codec("json")
+    write_atomically("file.json", codec.encode(
+        codec.fragment(key, dictionary)
+        for key, dictionary in records.items()))
+    Snapshot.write("file.snapshot", records.items(), FOREIGN_KEYS)
+
+
+def measure():
+    """Loads the storage, renders the states and prints the worker RSS"""
+    from models import storage
+    from models.state import State
+
+    states = sorted(storage.all(State).values(), key=lambda s: s.name)
+    lines = [f"{state.id}: {state.name}" for state in states]
+    for state in states[:10]:
+        lines.extend(city.name for city in state.cities)
+    storage.close()
+
+    memory = {}
+    with open("/proc/self/status") as file:
+        for line in file:
+            name, _, value = line.partition(":")
+            if name in ("RssAnon", "RssFile"):
+                memory[name] = int(value.split()[0]) // 1024
+
+    print(f"{memory['RssAnon']} {memory['RssFile']}")
+
+
+def main():
+    """Runs a worker per size and mode"""
+    if len(sys.argv) > 1 and sys.argv[1] == "--measure":
+        measure()
+        return
+
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10000, 100000, 1000000]
+
+    print(f"  {'objects':>9}  {'mode':<10}{'private':>10}{'shared':>10}")
+    for objects_count in sizes:
+        generate(objects_count)
+        for mode, env_var in (("file.json", None),
+                              ("snapshot", "HBNB_FILE_SNAPSHOT")):
+            env = {key: value for key, value in os.environ.items()
+                   if not key.startswith("HBNB_")}
+            if env_var:
+                env[env_var] = "1"
+            output = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), "--measure"],
+                env=env, check=True, capture_output=True, text=True
+            ).stdout
+            private, shared = output.split()
+            print(f"  {objects_count:>9}  {mode:<10}{private:>7} MB"
+                  f"{shared:>7} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+#!/usr/bin/python3
+"""
+Stress test of FileStorage shared by the threads of a process, as in a
+multi-threaded WSGI server.
+
+Reader threads keep listing the objects like the web pages do, iterating
+all(), all(State), the cities of States and find_all(), while a writer
+thread creates and deletes Cities and renames States, and reloads the
+storage every few changes. Every listing must be a consistent point in
+time: iterating it must not fail, it must not change while iterated, and
+it must hold every State. The throughput of the readers and writer, and
+the errors, are printed.
+
+The HBNB_FILE_* environment variables select the storage mode.
+
+Usage:
+    ./benchmarks/bench_threaded_reads.py [readers] [seconds] [objects]
+"""
+import os
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(tempfile.mkdtemp())
+
+from models import storage  # noqa: E402
+from models.city import City  # noqa: E402
+from models.state import State  # noqa: E402
+
+
+def reader(stop, results, states_count):
+    """Lists the objects until told to stop"""
+    reads = errors = 0
+    while not stop.is_set():
+        try:
+            objects = storage.all()
+            size = len(objects)
+            if sum(1 for _ in objects.values()) != size:
+                raise RuntimeError("all() changed while iterated")
+
+            states = storage.all(State)
+            size = len(states)
+            if size != states_count:
+                raise RuntimeError(f"all(State) listed {size} States")
+            for state in list(states.values())[:20]:
+                for city in state.cities:
+                    city.name
+            if len(list(states.values())) != size:
+                raise RuntimeError("all(State) changed while iterated")
+
+            storage.find_all("State")
+            reads += 1
+        except Exception as error:
+            errors += 1
+            results.setdefault("error", repr(error))
+
+    results.setdefault("reads", []).append(reads)
+    results.setdefault("errors", []).append(errors)
+
+
+def writer(stop, results, states):
+    """Changes the objects until told to stop"""
+    writes = 0
+    while not stop.is_set():
+        state = states[writes % len(states)]
+        city = City(name=f"City {writes}", state_id=state.id)
+        storage.new(city)
+        state.name = f"State {writes}"
+        if writes % 2:
+            storage.delete(city)
+        if writes % 50 == 49:
+            storage.save()
+            storage.reload()
+            states = list(storage.all(State).values())
+        writes += 1
+
+    results["writes"] = writes
+
+
+def main():
+    """Runs the readers and the writer, prints the statistics"""
+    arguments = [int(arg) for arg in sys.argv[1:4]]
+    readers_count, seconds, objects_count = \
+        arguments + [8, 5, 10000][len(arguments):]
+
+    states = [State(name=f"State {i}")
+              for i in range(max(objects_count // 10, 1))]
+    for i in range(objects_count):
+        if i < len(states):
+            storage.new(states[i])
+        else:
+            storage.new(City(name=f"City {i}",
+                             state_id=states[i % len(states)].id))
+    storage.save()
+
+    stop = threading.Event()
+    results = {}
+    threads = [threading.Thread(target=reader,
+                                args=(stop, results, len(states)))
+               for _ in range(readers_count)]
+    threads.append(threading.Thread(target=writer,
+                                    args=(stop, results, states)))
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    print(f"{readers_count} readers, 1 writer, {objects_count} objects, "
+          f"{seconds}s")
+    print(f"  reads:  {sum(results['reads']) / seconds:8.1f}/s "
+          f"({sum(results['errors'])} errors)")
+    print(f"  writes: {results['writes'] / seconds:8.1f}/s")
+    if "error" in results:
+        print(f"  first error: {results['error']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+#!/usr/bin/python3
+"""
+Benchmarks creating objects one save() at a time and inside a
+storage.transaction(), with FileStorage.
+
+For every count, in a fresh process per path, States are created and
+saved one by one, either on their own or inside one transaction. The
+time and the number of writes to the file are printed.
+
+Usage:
+    ./benchmarks/bench_transactions.py [objects ...]
+"""
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import nullcontext
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+def measure(objects_count, transaction):
+    """Prints the time and the number of writes of the creations"""
+    from models import storage
+    from models.state import State
+
+    start = time.perf_counter()
+    with storage.transaction() if transaction else nullcontext():
+        for i in range(objects_count):
+            State(name=f"State {i}").save()
+    elapsed = time.perf_counter() - start
+
+    assert storage.count("State") == objects_count
+    print(elapsed, storage.commit_stats()["commits"])
+
+
+def main():
+    """Runs the measurements in a process per count and path"""
+    if len(sys.argv) > 3 and sys.argv[1] == "--measure":
+        measure(int(sys.argv[2]), sys.argv[3] == "transaction")
+        return
+
+    counts = sys.argv[1:] or ["1000", "10000"]
+
+    print(f"  {'objects':>9}  {'path':<13}{'time':>10}{'writes':>8}")
+    for objects_count in counts:
+        for path in ("per object", "transaction"):
+            env = {key: value for key, value in os.environ.items()
+                   if key != "HBNB_TYPE_STORAGE"}
+            output = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), "--measure",
+                 objects_count, path.replace(" ", "_")],
+                env=env, cwd=tempfile.mkdtemp(), check=True,
+                capture_output=True, text=True
+            ).stdout
+            elapsed, writes = output.split()
+            print(f"  {objects_count:>9}  {path:<13}{float(elapsed):>9.2f}s"
+                  f"{writes:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+#!/usr/bin/python3
+"""
+Benchmarks the latency of save() with synchronous writes and in
+write-behind mode (HBNB_FILE_WRITE_BEHIND=1).
+
+For every size and mode, in a fresh process, a store of States is saved,
+then States are renamed and saved one at a time like the console does,
+and the latency of every save() is measured. The median and 99th
+percentile latencies, the total time including the final flush() and
+the number of writes are printed.
+
+Usage:
+    ./benchmarks/bench_write_behind.py [saves] [objects ...]
+"""
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+MODES = (("sync", {}),
+         ("behind", {"HBNB_FILE_WRITE_BEHIND": "1",
+                     "HBNB_FILE_WRITE_BEHIND_MAX_STALENESS": "0.1"}))
+
+
+def measure(saves_count, objects_count):
+    """Prints the save latencies, the total time and the writes count"""
+    from models import storage
+    from models.state import State
+
+    states = [State(name=f"State {i}") for i in range(objects_count)]
+    for state in states:
+        storage.new(state)
+    storage.save()
+    storage.flush()
+    commits = storage.commit_stats()["commits"]
+
+    latencies = []
+    start = time.perf_counter()
+    for i in range(saves_count):
+        state = states[i * 7919 % objects_count]
+        state.name = f"State {i}!"
+        save_start = time.perf_counter()
+        state.save()
+        latencies.append(time.perf_counter() - save_start)
+    storage.flush()
+    total = time.perf_counter() - start
+
+    latencies.sort()
+    print(latencies[len(latencies) // 2],
+          latencies[len(latencies) * 99 // 100], total,
+          storage.commit_stats()["commits"] - commits)
+
+
+def main():
+    """Runs the measurements in a process per size and mode"""
+    if len(sys.argv) > 3 and sys.argv[1] == "--measure":
+        measure(int(sys.argv[2]), int(sys.argv[3]))
+        return
+
+    saves_count = sys.argv[1] if len(sys.argv) > 1 else "200"
+    sizes = sys.argv[2:] or ["1000", "10000", "100000"]
+
+    print(f"  {'objects':>9}  {'mode':<8}{'p50':>10}{'p99':>10}"
+          f"{'total':>10}{'writes':>8}")
+    for objects_count in sizes:
+        for mode, variables in MODES:
+            env = {key: value for key, value in os.environ.items()
+                   if not key.startswith("HBNB_")}
+            env.update(variables)
+            output = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), "--measure",
+                 saves_count, objects_count],
+                env=env, cwd=tempfile.mkdtemp(), check=True,
+                capture_output=True, text=True
+            ).stdout
+            p50, p99, total, writes = output.split()
+            print(f"  {objects_count:>9}  {mode:<8}"
+                  f"{float(p50) * 1000:>7.2f} ms{float(p99) * 1000:>7.2f} ms"
+                  f"{float(total):>9.2f}s{writes:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -339,6 +339,7 @@ class AllCommand(AirBnBCommand):
         set_tokens(tokens): Sets command tokens for retrieving objects.
         reset_tokens(): Resets command tokens.
         execute(): Executes the command to retrieve all objects.
+        print_objects(objects): Prints objects as they are iterated over.
     """
 
     def __init__(self, storage):
@@ -370,14 +371,28 @@ class AllCommand(AirBnBCommand):
         """Executes the command to retrieve all objects."""
         class_name = self.__tokens['class_name']
         if not class_name:
-            print(self._storage.find_all())
+            self.print_objects(self._storage.iter_all())
             return
 
         _class = self.get_class(self.__tokens)
         if not _class:
             return
 
-        print(self._storage.find_all(class_name=_class.__name__))
+        self.print_objects(self._storage.iter_all(_class))
+
+    @staticmethod
+    def print_objects(objects):
+        """
+        Prints the string representations of objects as a list, as they
+        are iterated over rather than once they are all loaded.
+
+        Parameters:
+            objects (Iterable): The objects to print.
+        """
+        print("[", end="")
+        for i, obj in enumerate(objects):
+            print(", " if i else "", repr(str(obj)), sep="", end="")
+        print("]")
 
 
 class AbstractUpdateCommand(AirBnBCommand, ABC):
@@ -0,0 +1,20 @@
+#!/usr/bin/python3
+"""
+Script to convert a FileStorage snapshot file from a format to another.
+
+The formats are told by the file extensions: .json for the JSON format,
+.bin for the binary format (see models/engine/file_codecs.py).
+
+Usage:
+    ./convert_storage.py file.json file.bin
+"""
+import sys
+
+from models.engine.file_codecs import convert
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print(f"Usage: {sys.argv[0]} <source> <target>", file=sys.stderr)
+        sys.exit(1)
+
+    convert(sys.argv[1], sys.argv[2])
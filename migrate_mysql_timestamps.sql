@@ -0,0 +1,34 @@
+-- this script migrates the tables of the project to timestamps stored to the microsecond
+-- Run it on the database to migrate, e.g. "mysql -uroot -p hbnb_dev_db < migrate_mysql_timestamps.sql".
+-- Tables that don't exist yet are skipped: they are created with DATETIME(6) columns.
+
+-- Changes created_at and updated_at of the states table to DATETIME(6) if it exists.
+SET @migration = (SELECT IF(COUNT(*) = 0, 'DO 0', 'ALTER TABLE states MODIFY created_at DATETIME(6) NOT NULL, MODIFY updated_at DATETIME(6) NOT NULL') FROM information_schema.TABLES WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'states');
+PREPARE migration FROM @migration;
+EXECUTE migration;
+DEALLOCATE PREPARE migration;
+-- Changes created_at and updated_at of the cities table to DATETIME(6) if it exists.
+SET @migration = (SELECT IF(COUNT(*) = 0, 'DO 0', 'ALTER TABLE cities MODIFY created_at DATETIME(6) NOT NULL, MODIFY updated_at DATETIME(6) NOT NULL') FROM information_schema.TABLES WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'cities');
+PREPARE migration FROM @migration;
+EXECUTE migration;
+DEALLOCATE PREPARE migration;
+-- Changes created_at and updated_at of the users table to DATETIME(6) if it exists.
+SET @migration = (SELECT IF(COUNT(*) = 0, 'DO 0', 'ALTER TABLE users MODIFY created_at DATETIME(6) NOT NULL, MODIFY updated_at DATETIME(6) NOT NULL') FROM information_schema.TABLES WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'users');
+PREPARE migration FROM @migration;
+EXECUTE migration;
+DEALLOCATE PREPARE migration;
+-- Changes created_at and updated_at of the places table to DATETIME(6) if it exists.
+SET @migration = (SELECT IF(COUNT(*) = 0, 'DO 0', 'ALTER TABLE places MODIFY created_at DATETIME(6) NOT NULL, MODIFY updated_at DATETIME(6) NOT NULL') FROM information_schema.TABLES WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'places');
+PREPARE migration FROM @migration;
+EXECUTE migration;
+DEALLOCATE PREPARE migration;
+-- Changes created_at and updated_at of the amenities table to DATETIME(6) if it exists.
+SET @migration = (SELECT IF(COUNT(*) = 0, 'DO 0', 'ALTER TABLE amenities MODIFY created_at DATETIME(6) NOT NULL, MODIFY updated_at DATETIME(6) NOT NULL') FROM information_schema.TABLES WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'amenities');
+PREPARE migration FROM @migration;
+EXECUTE migration;
+DEALLOCATE PREPARE migration;
+-- Changes created_at and updated_at of the reviews table to DATETIME(6) if it exists.
+SET @migration = (SELECT IF(COUNT(*) = 0, 'DO 0', 'ALTER TABLE reviews MODIFY created_at DATETIME(6) NOT NULL, MODIFY updated_at DATETIME(6) NOT NULL') FROM information_schema.TABLES WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'reviews');
+PREPARE migration FROM @migration;
+EXECUTE migration;
+DEALLOCATE PREPARE migration;
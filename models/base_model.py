@@ -4,17 +4,99 @@ This module contains the BaseModel class, which serves
 as the base class for all models in the application.
 """
 import os
+import sys
 from uuid import uuid4
-from datetime import datetime
+from datetime import datetime, timedelta
 
-from sqlalchemy import Column, String, DATETIME
-from sqlalchemy.orm import declarative_base
+from sqlalchemy import Column, Integer, String
+from sqlalchemy.dialects.mysql import DATETIME
+from sqlalchemy.orm import declarative_base, declared_attr
 
 STORAGE_TYPE = os.getenv('HBNB_TYPE_STORAGE')
+COMPACT_MODELS = STORAGE_TYPE != 'db' and \
+    os.getenv('HBNB_COMPACT_MODELS') == "1"
+VERSIONED_MODELS = STORAGE_TYPE == 'db' and \
+    os.getenv('HBNB_DB_VERSIONING') == "1"
+
+FOREIGN_KEYS = ("state_id", "city_id", "place_id", "user_id")
+EPOCH = datetime(1970, 1, 1)
 
 Base = declarative_base()
 
 
+class CompactTimestamp:
+    """
+    Descriptor storing a datetime attribute as a float number of seconds
+    since the epoch, while still reading and accepting datetime objects.
+
+    The number is kept in a private attribute named after the managed one
+    ("_created_at" for "created_at").
+    """
+
+    def __set_name__(self, owner, name):
+        """
+        Records the name of the attribute managed by the descriptor.
+
+        Parameters:
+        - owner (type): The class owning the attribute.
+        - name (str): The attribute name.
+        """
+        self.name = name
+        self.private_name = f"_{name}"
+
+    def __get__(self, obj, owner=None):
+        """
+        Returns the attribute as a datetime.
+
+        Returns:
+        - datetime: The attribute value.
+        """
+        if obj is None:
+            return self
+
+        try:
+            value = object.__getattribute__(obj, self.private_name)
+        except AttributeError:
+            raise AttributeError(self.name) from None
+
+        if isinstance(value, float):
+            return EPOCH + timedelta(seconds=value)
+
+        return value
+
+    def __set__(self, obj, value):
+        """
+        Stores a datetime attribute as seconds since the epoch.
+
+        Parameters:
+        - obj (BaseModel): The instance.
+        - value (datetime | float): The new attribute value.
+        """
+        if isinstance(value, datetime):
+            value = (value - EPOCH).total_seconds()
+
+        object.__setattr__(obj, self.private_name, value)
+
+    @staticmethod
+    def from_isoformat(value):
+        """
+        Parses an ISO 8601 timestamp into seconds since the epoch.
+
+        Parameters:
+        - value (str | datetime): The timestamp, or None for the current
+          time.
+
+        Returns:
+        - float: Seconds since the epoch.
+        """
+        if type(value) is str:
+            value = datetime.fromisoformat(value)
+        elif not value:
+            value = datetime.now()
+
+        return (value - EPOCH).total_seconds()
+
+
 class BaseModel:
     """
     Base class for all models.
@@ -22,12 +104,31 @@ class BaseModel:
 
     if STORAGE_TYPE == 'db':
         id = Column(String(60), primary_key=True)
-        created_at = Column(DATETIME, nullable=False,
+        created_at = Column(DATETIME(fsp=6), nullable=False,
                             default=datetime.now)
-        updated_at = Column(DATETIME, nullable=False,
+        updated_at = Column(DATETIME(fsp=6), nullable=False,
                             default=datetime.now,
                             onupdate=datetime.now)
 
+    if VERSIONED_MODELS:
+        version = Column(Integer, nullable=False, default=1)
+
+        @declared_attr
+        def __mapper_args__(cls):
+            """
+            Makes the version column the version counter of the mapper:
+            every UPDATE or DELETE of a row checks and increments it, and
+            fails with StaleDataError if another writer changed the row.
+
+            Returns:
+            - dict: The mapper arguments.
+            """
+            return {"version_id_col": cls.version}
+
+    if COMPACT_MODELS:
+        created_at = CompactTimestamp()
+        updated_at = CompactTimestamp()
+
     def __init__(self, *args, **kwargs):
         """
         Initializes a new instance of the BaseModel class.
@@ -39,8 +140,9 @@ class BaseModel:
         self.id = kwargs.pop("id", str(uuid4()))
 
         value = kwargs.pop("updated_at", None)
-        self.updated_at = datetime.fromisoformat(value) \
+        updated_at = datetime.fromisoformat(value) \
             if value else datetime.now()
+        self.updated_at = updated_at
 
         value = kwargs.pop("created_at", None)
         self.created_at = datetime.fromisoformat(value) \
@@ -51,6 +153,76 @@ class BaseModel:
         for attr, value in kwargs.items():
             setattr(self, attr, value)
 
+        object.__setattr__(self, "updated_at", updated_at)
+
+    @classmethod
+    def from_dict(cls, dictionary):
+        """
+        Creates an instance from a dictionary produced by to_dict().
+
+        In file storage mode the attributes are set straight on the
+        instance, skipping __init__ and the per-attribute __setattr__
+        hook, which makes it the fast path for bulk loading. They are set
+        one by one rather than through __dict__.update() so instances of a
+        class keep sharing their attribute name table.
+
+        With HBNB_COMPACT_MODELS=1 the foreign key attributes are
+        interned, so the instances referencing the same object share one
+        string, and the timestamps are kept as numbers, shared when they
+        are equal.
+
+        Timestamps may be given as ISO 8601 strings or datetime objects.
+
+        Parameters:
+        - dictionary (dict[str, any]): Dictionary of object attributes.
+
+        Returns:
+        - BaseModel: The new instance.
+        """
+        if STORAGE_TYPE == 'db':
+            return cls(**dictionary)
+
+        attributes = dict(dictionary)
+        attributes.pop("__class__", None)
+
+        if not attributes.get("id"):
+            attributes["id"] = str(uuid4())
+
+        if COMPACT_MODELS:
+            updated_at = attributes.get("updated_at")
+            created_at = attributes.get("created_at")
+
+            attributes["updated_at"] = \
+                CompactTimestamp.from_isoformat(updated_at)
+            attributes["created_at"] = attributes["updated_at"] \
+                if created_at == updated_at \
+                else CompactTimestamp.from_isoformat(created_at)
+
+            for attr in FOREIGN_KEYS:
+                value = attributes.get(attr)
+                if type(value) is str:
+                    attributes[attr] = sys.intern(value)
+
+            amenity_ids = attributes.get("amenity_ids")
+            if type(amenity_ids) is list:
+                attributes["amenity_ids"] = [
+                    sys.intern(_id) if type(_id) is str else _id
+                    for _id in amenity_ids
+                ]
+        else:
+            for attr in ("updated_at", "created_at"):
+                value = attributes.get(attr)
+                if type(value) is str:
+                    attributes[attr] = datetime.fromisoformat(value)
+                elif not value:
+                    attributes[attr] = datetime.now()
+
+        obj = cls.__new__(cls)
+        for attr, value in attributes.items():
+            object.__setattr__(obj, attr, value)
+
+        return obj
+
     def save(self):
         """
         Saves the current object instance to persistent storage.
@@ -88,6 +260,10 @@ class BaseModel:
 
         dictionary.pop("_sa_instance_state", None)
 
+        if COMPACT_MODELS:
+            dictionary.pop("_created_at", None)
+            dictionary.pop("_updated_at", None)
+
         return dictionary
 
     def delete(self):
@@ -110,9 +286,27 @@ class BaseModel:
         dictionary = dict(self.__dict__)
         dictionary.pop("_sa_instance_state", None)
 
+        if COMPACT_MODELS:
+            attributes = {}
+            for attr, value in dictionary.items():
+                if attr in ("_updated_at", "_created_at"):
+                    attr = attr[1:]
+                    value = getattr(self, attr)
+                attributes[attr] = value
+            dictionary = attributes
+
         return f"[{self.__class__.__name__}] ({self.id}) {dictionary}"
 
     if STORAGE_TYPE != 'db':
         def __setattr__(self, key, value):
+            from models import storage
+
+            if COMPACT_MODELS and key in FOREIGN_KEYS \
+                    and type(value) is str:
+                value = sys.intern(value)
+
+            old_value = self.__dict__.get(key)
+            storage.before_change(self)
             object.__setattr__(self, "updated_at", datetime.now())
             object.__setattr__(self, key, value)
+            storage.track_change(self, key, old_value)
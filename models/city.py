@@ -40,3 +40,15 @@ class City(*parent_classes):
     else:
         name: str = ""
         state_id: str = ""
+
+        @property
+        def places(self):
+            """
+            Retrieves the places located in the city.
+
+            Returns:
+                list: A list of Place objects located in the city.
+            """
+            from models import storage
+
+            return storage.find_related("Place", "city_id", self.id)
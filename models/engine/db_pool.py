@@ -0,0 +1,167 @@
+#!/usr/bin/python3
+"""
+DB pool module
+
+This module defines the connection pool of DBStorage: MeteredQueuePool, a
+SQLAlchemy QueuePool recording how long checkouts wait for a connection
+in a PoolMetrics, and watch_liveness(), which pings the connections
+checked out after being idle for a while instead of on every checkout.
+
+Classes:
+    - PoolMetrics: Counters of the checkouts and pings of a pool.
+    - MeteredQueuePool: QueuePool recording its checkout waits.
+"""
+
+import threading
+import time
+
+from sqlalchemy import event
+from sqlalchemy.exc import DisconnectionError, TimeoutError
+from sqlalchemy.pool import QueuePool
+
+
+class PoolMetrics:
+    """PoolMetrics class - Counters of the checkouts and pings of a pool"""
+
+    def __init__(self):
+        """Initializes the counters to zero."""
+        self.__lock = threading.Lock()
+        self.__checkouts = 0
+        self.__wait_time = 0.0
+        self.__max_wait = 0.0
+        self.__timeouts = 0
+        self.__pings = 0
+        self.__ping_failures = 0
+
+    def record_wait(self, seconds, timed_out=False):
+        """
+        Records a checkout.
+
+        Parameters:
+            seconds (float): the time the checkout waited for a connection,
+                including the time to open it if it is a new one
+            timed_out (bool): whether the checkout gave up, the pool being
+                exhausted
+        """
+        with self.__lock:
+            self.__checkouts += 1
+            self.__wait_time += seconds
+            self.__max_wait = max(self.__max_wait, seconds)
+            if timed_out:
+                self.__timeouts += 1
+
+    def record_ping(self, failed=False):
+        """
+        Records a liveness check.
+
+        Parameters:
+            failed (bool): whether the connection was found dead
+        """
+        with self.__lock:
+            self.__pings += 1
+            if failed:
+                self.__ping_failures += 1
+
+    def stats(self):
+        """
+        Returns the counters.
+
+        Returns:
+            dict: checkouts, wait_time and max_wait (in seconds), timeouts,
+                pings and ping_failures.
+        """
+        with self.__lock:
+            return {
+                "checkouts": self.__checkouts,
+                "wait_time": self.__wait_time,
+                "max_wait": self.__max_wait,
+                "timeouts": self.__timeouts,
+                "pings": self.__pings,
+                "ping_failures": self.__ping_failures,
+            }
+
+
+class MeteredQueuePool(QueuePool):
+    """MeteredQueuePool class - QueuePool recording its checkout waits"""
+
+    def __init__(self, *args, **kwargs):
+        """
+        Initializes the pool, see QueuePool, with new metrics.
+        """
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+        self.__waiting = threading.local()
+
+    def recreate(self):
+        """
+        Returns a new pool with the same settings, listeners and metrics,
+        as engine.dispose() does.
+
+        Returns:
+            MeteredQueuePool: The new pool.
+        """
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+    def _do_get(self):
+        """
+        Takes a connection from the pool, or opens one within the
+        overflow, waiting up to the timeout for one to be checked in
+        otherwise, and records the time it took.
+
+        Returns:
+            ConnectionPoolEntry: The connection record.
+
+        Raises:
+            TimeoutError: If no connection was checked in in time.
+        """
+        if getattr(self.__waiting, "active", False):
+            return super()._do_get()
+
+        self.__waiting.active = True
+        start = time.monotonic()
+        timed_out = False
+        try:
+            return super()._do_get()
+        except TimeoutError:
+            timed_out = True
+            raise
+        finally:
+            self.__waiting.active = False
+            self.metrics.record_wait(time.monotonic() - start, timed_out)
+
+
+def watch_liveness(engine, ping_after):
+    """
+    Pings the connections of an engine on checkout when they were idle in
+    the pool for at least a number of seconds, with the ping of the
+    dialect (mysqlclient's ping() for MySQL). A dead connection is
+    replaced by a new one, as with pool_pre_ping, and the pings are
+    counted in the metrics of the pool. A connection dropped sooner
+    fails on use: MySQL drops the connections idle for wait_timeout
+    seconds, 8 hours by default, far beyond the threshold.
+
+    Parameters:
+        engine (Engine): the engine, whose pool is a MeteredQueuePool
+        ping_after (float): the idle time after which a connection is
+            pinged, 0 to ping every connection checked out again
+    """
+    @event.listens_for(engine, "checkin")
+    def checkin(dbapi_connection, connection_record):
+        connection_record.info["checked_in_at"] = time.monotonic()
+
+    @event.listens_for(engine, "checkout")
+    def checkout(dbapi_connection, connection_record, connection_proxy):
+        checked_in_at = connection_record.info.pop("checked_in_at", None)
+        if checked_in_at is None or \
+                time.monotonic() - checked_in_at < ping_after:
+            return
+
+        try:
+            engine.dialect.do_ping(dbapi_connection)
+        except Exception as err:
+            engine.pool.metrics.record_ping(failed=True)
+            raise DisconnectionError("Connection found dead on checkout") \
+                from err
+        engine.pool.metrics.record_ping()
@@ -12,12 +12,23 @@ Classes:
 """
 
 import os
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from itertools import chain
 
-from sqlalchemy import create_engine, func
+from sqlalchemy import (create_engine, delete, event, func, insert, inspect,
+                        tuple_, update)
 from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy.orm import sessionmaker, scoped_session
+from sqlalchemy.orm import (joinedload, make_transient_to_detached,
+                            selectinload, sessionmaker, scoped_session)
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.orm.exc import StaleDataError
 
-from models.base_model import Base
+from models.base_model import Base, VERSIONED_MODELS
+from models.engine.db_pool import MeteredQueuePool, watch_liveness
+from models.engine.object_cache import ObjectCache
+from models.engine.query import COMPARISONS
 from models.engine.storage import Storage
 
 
@@ -27,11 +38,56 @@ class DBStorage(Storage):
     """
     __engine = None
     __session = None
+    __transactions = threading.local()
+    __CHUNK_SIZE = 1000
+    __LOADERS = {"selectin": selectinload, "joined": joinedload}
+    __CACHE_POLICIES = ("validate", "trust")
+    __PING_POLICIES = ("idle", "always", "never")
 
     def __init__(self):
         """
         Initialize the DBStorage instance.
         Connects to the database and creates a session.
+
+        find() goes through a cache of the objects of the process, shared
+        by its threads and sessions, of at most HBNB_DB_CACHE_SIZE objects
+        (10000 by default, 0 to disable it), the least recently used ones
+        being evicted. HBNB_DB_CACHE_TTL sets how many seconds an object
+        is cached for (60 by default, 0 for as long as it is used).
+        Objects are dropped from the cache when this process changes them.
+        HBNB_DB_CACHE_STALENESS sets how changes made by other processes
+        are handled: "validate" (the default) checks the version of the
+        object in the database on a hit, or its updated_at without
+        versioning, "trust" serves the cached object without a query
+        until its time to live. HBNB_DB_CACHE_VALIDATE_INTERVAL sets how
+        many seconds a check holds for (1 by default, 0 to check on every
+        hit): an object read again within it is served without a query.
+
+        With HBNB_DB_VERSIONING=1 the rows carry a version column, see
+        update(); HBNB_DB_UPDATE_RETRIES sets how many times update()
+        retries after a conflict (3 by default). The tables must have the
+        column: "ALTER TABLE <table> ADD version INT NOT NULL DEFAULT 1".
+
+        The timestamps are stored to the microsecond, as DATETIME(6):
+        tables created with DATETIME columns are migrated by
+        migrate_mysql_timestamps.sql, which setup_mysql_dev.sql and
+        setup_mysql_test.sql run.
+
+        The connections are pooled: HBNB_DB_POOL_SIZE connections are
+        kept open (5 by default), up to HBNB_DB_POOL_MAX_OVERFLOW more
+        are opened when they are all checked out (10 by default, -1 for
+        no limit), and a checkout waits HBNB_DB_POOL_TIMEOUT seconds for
+        one to be checked in beyond that (30 by default). Connections
+        older than HBNB_DB_POOL_RECYCLE seconds are replaced (-1, the
+        default, never). HBNB_DB_POOL_PRE_PING sets when a connection is
+        pinged on checkout: "idle" (the default) once it was idle for
+        HBNB_DB_POOL_PING_AFTER seconds (30 by default), "always" on every
+        checkout, or "never". See pool_stats().
+
+        Raises:
+            ValueError: If a connection variable is missing, or
+                HBNB_DB_CACHE_STALENESS or HBNB_DB_POOL_PRE_PING is
+                unknown.
         """
         user = os.getenv('HBNB_MYSQL_USER')
         pwd = os.getenv('HBNB_MYSQL_PWD')
@@ -51,48 +107,129 @@ class DBStorage(Storage):
                              f"variables for database connection: "
                              f"{', '.join(missing_vars)}")
 
-        self._connect(user, pwd, host, db)
+        self.__cache_policy = os.getenv('HBNB_DB_CACHE_STALENESS',
+                                        "validate")
+        if self.__cache_policy not in self.__CACHE_POLICIES:
+            raise ValueError(f"Unknown HBNB_DB_CACHE_STALENESS: "
+                             f"{self.__cache_policy}")
+
+        self.__validate_interval = float(
+            os.getenv('HBNB_DB_CACHE_VALIDATE_INTERVAL', 1))
+        self.__update_retries = int(os.getenv('HBNB_DB_UPDATE_RETRIES', 3))
+
+        cache_size = int(os.getenv('HBNB_DB_CACHE_SIZE', 10000))
+        self.__cache = None
+        if cache_size > 0:
+            self.__cache = ObjectCache(
+                cache_size, float(os.getenv('HBNB_DB_CACHE_TTL', 60)))
+
+        ping_policy = os.getenv('HBNB_DB_POOL_PRE_PING', "idle")
+        if ping_policy not in self.__PING_POLICIES:
+            raise ValueError(f"Unknown HBNB_DB_POOL_PRE_PING: {ping_policy}")
+
+        self._connect(
+            user, pwd, host, db,
+            pool_size=int(os.getenv('HBNB_DB_POOL_SIZE', 5)),
+            max_overflow=int(os.getenv('HBNB_DB_POOL_MAX_OVERFLOW', 10)),
+            pool_timeout=float(os.getenv('HBNB_DB_POOL_TIMEOUT', 30)),
+            pool_recycle=int(os.getenv('HBNB_DB_POOL_RECYCLE', -1)),
+            ping_after=None if ping_policy == "never"
+            else 0.0 if ping_policy == "always"
+            else float(os.getenv('HBNB_DB_POOL_PING_AFTER', 30)))
 
         if hbnb_env == 'test':
             Base.metadata.drop_all(self.__engine)
 
     @classmethod
-    def _connect(cls, user, pwd, host, db, pool_pre_ping=True):
+    def _connect(cls, user, pwd, host, db, ping_after=None, **pool):
         """
         Creates a database engine connection using SQLAlchemy.
+
+        Parameters:
+            ping_after (float): The idle time after which a connection is
+                pinged on checkout, 0 to ping it on every checkout, None
+                to never ping it.
+            **pool: The pool_size, max_overflow, pool_timeout and
+                pool_recycle of the pool.
         """
         cls.__engine = create_engine(
             f"mysql+mysqldb://{user}:{pwd}@{host}/{db}",
-            pool_pre_ping=pool_pre_ping
+            poolclass=MeteredQueuePool, **pool
         )
+        if ping_after is not None:
+            watch_liveness(cls.__engine, ping_after)
 
-    def all(self, cls=None):
+    def all(self, cls=None, load=()):
         """
         Retrieve all objects of a given class from the database.
 
+        Relationships listed in load are loaded with the objects rather
+        than by a SELECT per object on first access, so listing N States
+        with their cities takes two queries instead of N + 1. By default
+        a collection, like State.cities, is loaded by one more
+        "SELECT ... WHERE state_id IN (...)" ("selectin") and a reference,
+        like Place.user, by a LEFT OUTER JOIN in the same SELECT
+        ("joined"); a dictionary picks the strategy of every relationship.
+
         Parameters:
             cls (class): The class of objects to retrieve.
+            load (Iterable[str] | dict[str, str]): The names of the
+                relationships to load, e.g. ("cities",) for State, or a
+                dictionary of their strategies by name, e.g.
+                {"amenities": "joined"}. Without a class, every class
+                having one of the relationships loads it.
 
         Returns:
             dict: A dictionary of objects, where keys are object IDs.
+
+        Raises:
+            ValueError: If the class has no relationship of one of the
+                names, or a strategy is unknown.
         """
+        classes = self.get_classes() if cls is None else (cls,)
+
         dictionary = {}
         try:
-            if cls is None:
-                for _class in self.get_classes():
-                    instances = self.__session.query(_class).all()
-                    dictionary.update(
-                        self._class_to_dict(_class.__name__, instances))
-            else:
-                instances = self.__session.query(cls).all()
+            for _class in classes:
+                options = self._loader_options(_class, load, cls is None)
+                instances = self.__session.query(_class) \
+                    .options(*options).all()
                 dictionary.update(
-                    self._class_to_dict(cls.__name__, instances))
+                    self._class_to_dict(_class.__name__, instances))
         except SQLAlchemyError as err:
             self.__session.rollback()
             raise err
 
         return dictionary
 
+    def iter_all(self, cls=None, batch_size=1000):
+        """
+        Iterates over the objects of a class, or of all classes, without
+        loading them all: the rows are streamed from a server-side cursor
+        and turned into objects batch_size at a time, the objects no
+        longer referenced being freed as the iteration goes. The session
+        can't send other statements until the iteration ends, which
+        closes the cursor, or the generator is closed.
+
+        Parameters:
+            cls (class): The class of objects to iterate over, None for
+                every class.
+            batch_size (int): The number of rows fetched at a time.
+
+        Returns:
+            generator: The objects.
+        """
+        classes = self.get_classes() if cls is None else (cls,)
+
+        try:
+            for _class in classes:
+                yield from self.__session.query(_class) \
+                    .execution_options(stream_results=True) \
+                    .yield_per(batch_size)
+        except SQLAlchemyError as err:
+            self.__session.rollback()
+            raise err
+
     def new(self, obj):
         """
         Adds a new object to the database session.
@@ -105,15 +242,100 @@ class DBStorage(Storage):
 
         try:
             self.__session.add(obj)
+            if not self._in_transaction():
+                self.__session.flush()
+        except SQLAlchemyError as err:
+            self.__session.rollback()
+            raise err
+
+    def new_many(self, objs):
+        """
+        Inserts objects into the database and commits them.
+
+        Instead of a flush per object, the objects of every class are
+        inserted with executemany INSERT statements, which the driver
+        sends as multi-row INSERTs of up to a thousand rows, parents
+        before children. The objects are then added to the session as
+        persistent ones, without a query, as after new(). Such an insert
+        only holds columns, so the objects with related objects set, like
+        a Place whose amenities were appended to, and the objects that
+        aren't new to the session, are added and flushed by the session
+        instead, class by class.
+
+        Inside a transaction the commit is left to the end of the
+        transaction.
+
+        Parameters:
+            objs (Iterable[BaseModel]): The objects to insert.
+
+        Raises:
+            SQLAlchemyError: If an insert fails, after rolling back.
+        """
+        objs_by_class = {}
+        for obj in objs:
+            if obj and type(obj) in self.get_classes():
+                objs_by_class.setdefault(type(obj), []).append(obj)
+        if not objs_by_class:
+            return
+
+        tables = Base.metadata.sorted_tables
+        try:
             self.__session.flush()
+            for _class in sorted(objs_by_class,
+                                 key=lambda c: tables.index(c.__table__)):
+                keys = [attr.key for attr in _class.__mapper__.column_attrs]
+                instances, related = [], []
+                for obj in objs_by_class[_class]:
+                    (instances if self._insertable(obj) else related) \
+                        .append(obj)
+
+                for start in range(0, len(instances), self.__CHUNK_SIZE):
+                    chunk = instances[start:start + self.__CHUNK_SIZE]
+                    self.__session.execute(insert(_class), [
+                        {key: obj.__dict__[key]
+                         for key in keys if key in obj.__dict__}
+                        for obj in chunk
+                    ])
+                    for obj in chunk:
+                        make_transient_to_detached(obj)
+                    self.__session.add_all(chunk)
+
+                if related:
+                    self.__session.add_all(related)
+                    self.__session.flush()
+            self.save()
         except SQLAlchemyError as err:
             self.__session.rollback()
             raise err
 
+    @staticmethod
+    def _insertable(obj):
+        """
+        Tells whether an object can be saved by an INSERT of its columns:
+        whether it is new to the session and has no related object set.
+
+        Parameters:
+            obj (BaseModel): The object.
+
+        Returns:
+            bool: True if it can, False if the session has to save it.
+        """
+        if not inspect(obj).transient:
+            return False
+
+        return not any(obj.__dict__.get(relationship.key)
+                       for relationship in obj.__mapper__.relationships)
+
     def save(self):
         """
         Commits changes to the database.
+
+        Inside a transaction the commit is left to the end of the
+        transaction.
         """
+        if self._in_transaction():
+            return
+
         try:
             self.__session.commit()
         except SQLAlchemyError as err:
@@ -132,11 +354,62 @@ class DBStorage(Storage):
 
         try:
             self.__session.delete(obj)
+            if not self._in_transaction():
+                self.__session.flush()
+        except SQLAlchemyError as err:
+            self.__session.rollback()
+            raise err
+
+    def delete_many(self, cls, ids):
+        """
+        Deletes the objects of a class with the given IDs and commits.
+
+        The objects are deleted with one set-based DELETE per thousand
+        IDs, their rows in association tables like place_amenity first.
+        The database deletes the rows referencing them, as delete() does.
+
+        Inside a transaction the commit is left to the end of the
+        transaction.
+
+        Parameters:
+            cls (class): The class of the objects.
+            ids (Iterable[str]): The IDs of the objects.
+
+        Returns:
+            int: The number of objects deleted.
+
+        Raises:
+            SQLAlchemyError: If a delete fails, after rolling back.
+        """
+        if cls not in self.get_classes():
+            return 0
+
+        associations = [
+            column
+            for relationship in cls.__mapper__.relationships
+            if relationship.secondary is not None
+            for column in relationship.secondary.columns
+            if column.references(cls.__table__.c.id)
+        ]
+
+        deleted = 0
+        try:
             self.__session.flush()
+            for chunk in self._chunks(ids):
+                for column in associations:
+                    self.__session.execute(
+                        delete(column.table).where(column.in_(chunk)))
+                deleted += self.__session.execute(
+                    delete(cls).where(cls.id.in_(chunk))).rowcount
+                self._invalidate(self.__session,
+                                 ((cls.__name__, _id) for _id in chunk))
+            self.save()
         except SQLAlchemyError as err:
             self.__session.rollback()
             raise err
 
+        return deleted
+
     def reload(self):
         """
         Reloads objects from the database.
@@ -148,6 +421,10 @@ class DBStorage(Storage):
             autocommit=False,
             expire_on_commit=False
         )
+        event.listen(session_factory, "after_flush", self._after_flush)
+        event.listen(session_factory, "after_commit", self._after_commit)
+        event.listen(session_factory, "after_rollback",
+                     self._after_rollback)
 
         DBStorage.__session = scoped_session(session_factory)
 
@@ -155,6 +432,19 @@ class DBStorage(Storage):
         """
         Finds an object in the database by its class name and ID.
 
+        A cached object is served without loading its row: in the
+        "validate" staleness policy its version, or its updated_at
+        without versioning, is read instead unless it was checked within
+        HBNB_DB_CACHE_VALIDATE_INTERVAL, and the row is loaded only if it
+        changed. A change that doesn't update them, like an UPDATE
+        statement of another program, is only seen once the object
+        expires from the cache, see HBNB_DB_CACHE_TTL. Otherwise the row
+        is loaded in a single query, overwriting the object of the
+        session if any, and cached unless the session holds changes not
+        committed yet.
+        The values of a cached object are copied into the object of the
+        session, unless it has changes of its own.
+
         Parameters:
             class_name (str): The name of the class.
             _id (str): The ID of the object.
@@ -166,15 +456,104 @@ class DBStorage(Storage):
         if not _class:
             return None
 
+        key = (class_name, _id)
         try:
-            obj = self.__session.query(_class).filter_by(id=_id).first()
+            values = self.__cache.get(key) if self.__cache else None
+            if values is not None and self.__cache_policy == "validate" \
+                    and self.__cache.validation_due(
+                        key, self.__validate_interval):
+                column = "version" if VERSIONED_MODELS else "updated_at"
+                stamp = self.__session.query(getattr(_class, column)) \
+                    .filter_by(id=_id).scalar()
+                if stamp != values[column]:
+                    self.__cache.invalidate((key,), stale=True)
+                    values = None
+                else:
+                    self.__cache.validated(key)
+
+            if values is not None:
+                return self._attach(_class, values)
+
+            obj = self.__session.query(_class).populate_existing() \
+                .filter_by(id=_id).first()
             if obj:
-                self.__session.refresh(obj)
+                self._cache_object(obj)
             return obj
         except SQLAlchemyError as err:
             self.__session.rollback()
             raise err
 
+    def find_many(self, class_name, ids):
+        """
+        Finds the objects of a class with the given IDs at once.
+
+        The objects are loaded with one "SELECT ... WHERE id IN (...)"
+        per thousand IDs instead of a query per ID, and cached as by
+        find(). Cached objects are served without a query only in the
+        "trust" staleness policy: validating them would take a query per
+        thousand IDs as well, which costs as much as loading them.
+
+        Parameters:
+            class_name (str): The name of the class.
+            ids (Iterable[str]): The IDs of the objects.
+
+        Returns:
+            dict: The found objects by ID, in the order of the IDs,
+                without the IDs not found.
+        """
+        _class = self.get_class(class_name)
+        if not _class:
+            return {}
+
+        ids = [_id for _id in dict.fromkeys(ids) if _id]
+        found = {}
+        try:
+            cached = {}
+            if self.__cache and self.__cache_policy == "trust":
+                for _id in ids:
+                    values = self.__cache.get((class_name, _id))
+                    if values is not None:
+                        cached[_id] = values
+
+            for _id, values in cached.items():
+                found[_id] = self._attach(_class, values)
+
+            for chunk in self._chunks(_id for _id in ids
+                                      if _id not in cached):
+                for obj in self.__session.query(_class).populate_existing() \
+                        .filter(_class.id.in_(chunk)):
+                    found[obj.id] = obj
+                    self._cache_object(obj)
+        except SQLAlchemyError as err:
+            self.__session.rollback()
+            raise err
+
+        return {_id: found[_id] for _id in ids if _id in found}
+
+    def exists(self, class_name, _id):
+        """
+        Tells whether an object is in the database, with a
+        "SELECT EXISTS (...)" that loads none of its columns.
+
+        Parameters:
+            class_name (str): The name of the class.
+            _id (str): The ID of the object.
+
+        Returns:
+            bool: True if the object exists, False otherwise.
+        """
+        _class = self.get_class(class_name)
+        if not _class or not _id:
+            return False
+
+        try:
+            return self.__session.query(
+                self.__session.query(_class.id).filter_by(id=_id).exists()
+            ).scalar()
+        except SQLAlchemyError as err:
+            self.__session.rollback()
+            raise err
+
     def find_all(self, class_name=""):
         """
         Finds all objects of a given class from the database.
@@ -186,24 +565,26 @@ class DBStorage(Storage):
             list: A list of string representations of the objects.
         """
         if not class_name:
-            return [str(instance) for instance in self.all().values()]
+            return [str(instance) for instance in self.iter_all()]
 
         _class = self.get_class(class_name)
         if not _class:
             return []
 
-        return [str(instance) for instance in self.all(_class).values()]
+        return [str(instance) for instance in self.iter_all(_class)]
 
     def update(self, obj=None, **kwargs):
         """
         Updates attributes of a given object with new values
         provided in kwargs.
 
-        This method updates the specified attributes of an
-        object in the database using the provided keyword arguments.
-        The method queries the object's class in the session and applies
-        the updates to the object with the matching ID. Changes are flushed
-        to the session but not committed.
+        The row is changed by a single UPDATE statement, without reading
+        it first, and the new values are set on the object. With
+        versioned models (HBNB_DB_VERSIONING=1) the statement is
+        "UPDATE ... WHERE id = ? AND version = ?" and increments the
+        version: if another writer changed the row since the object was
+        loaded, no row matches, the object is reloaded and the update is
+        retried on the current row, up to HBNB_DB_UPDATE_RETRIES times.
 
         Parameters:
             obj (BaseModel): The object to be updated. If None,
@@ -215,24 +596,106 @@ class DBStorage(Storage):
         Raises:
             SQLAlchemyError: If an error occurs during the update process, it
                              rolls back the session and raises the exception.
+                             StaleDataError if the row kept changing
+                             through every retry.
 
         Note:
-            The method flushes changes to the session but does not commit them.
+            The changes are sent to the database but not committed.
             After calling this method, you should call the save method
             to commit the changes to the database.
         """
         if not obj:
             return
 
+        state = inspect(obj)
+        if state.transient:
+            return
+
+        _class = obj.__class__
+        values = dict(kwargs, updated_at=datetime.now())
+        try:
+            if state.pending:
+                self.__session.flush()
+
+            for _ in range(self.__update_retries + 1):
+                statement = update(_class).where(_class.id == obj.id)
+                if VERSIONED_MODELS:
+                    values["version"] = obj.version + 1
+                    statement = statement.where(
+                        _class.version == obj.version)
+
+                result = self.__session.execute(
+                    statement.values(values)
+                    .execution_options(synchronize_session=False))
+                if result.rowcount:
+                    break
+
+                if not VERSIONED_MODELS or self.__session.query(_class) \
+                        .populate_existing().filter_by(id=obj.id) \
+                        .first() is None:
+                    return
+            else:
+                raise StaleDataError(
+                    f"{_class.__name__} {obj.id} kept changing during "
+                    f"{self.__update_retries} update retries")
+
+            for key, value in values.items():
+                set_committed_value(obj, key, value)
+            self._invalidate(self.__session,
+                             ((_class.__name__, obj.id),))
+        except SQLAlchemyError as err:
+            self.__session.rollback()
+            raise err
+
+    def update_many(self, cls, ids, values):
+        """
+        Sets the same attribute values on the objects of a class with the
+        given IDs and commits.
+
+        The objects are updated with one set-based UPDATE per thousand
+        IDs instead of a refresh and an UPDATE per object; updated_at is
+        set by the statement, and the version is incremented with
+        versioned models.
+
+        Inside a transaction the commit is left to the end of the
+        transaction.
+
+        Parameters:
+            cls (class): The class of the objects.
+            ids (Iterable[str]): The IDs of the objects.
+            values (dict[str, any]): The new values by attribute name.
+
+        Returns:
+            int: The number of objects updated.
+
+        Raises:
+            ValueError: If values holds the id.
+            SQLAlchemyError: If an update fails, after rolling back.
+        """
+        if cls not in self.get_classes() or not values:
+            return 0
+        if "id" in values:
+            raise ValueError("update_many() can't change the id")
+
+        if VERSIONED_MODELS:
+            values = dict(values, version=cls.version + 1)
+
+        updated = 0
         try:
-            self.__session.refresh(obj)
-            self.__session.query(obj.__class__) \
-                .filter_by(id=obj.id).update(kwargs)
             self.__session.flush()
+            for chunk in self._chunks(ids):
+                updated += self.__session.execute(
+                    update(cls).where(cls.id.in_(chunk)).values(values)
+                ).rowcount
+                self._invalidate(self.__session,
+                                 ((cls.__name__, _id) for _id in chunk))
+            self.save()
         except SQLAlchemyError as err:
             self.__session.rollback()
             raise err
 
+        return updated
+
     def count(self, class_name):
         """
         Counts the number of objects of a given class in the database.
@@ -253,6 +716,71 @@ class DBStorage(Storage):
             self.__session.rollback()
             raise err
 
+    @contextmanager
+    def transaction(self):
+        """
+        Makes the changes of a with block one unit of work: new(),
+        delete() and update() don't flush, and the changes are flushed
+        once and committed in a single database transaction when the
+        block ends, or rolled back if it raises.
+
+        Objects added inside the block are sent to the database only at
+        its end. save() calls inside the block are left to its end, and a
+        transaction opened inside another one joins it. Transactions are
+        per thread, like sessions.
+
+        Raises:
+            SQLAlchemyError: If the commit fails, after rolling back.
+        """
+        if self._in_transaction():
+            yield
+            return
+
+        self.__transactions.active = True
+        try:
+            yield
+            self.__session.flush()
+            self.__session.commit()
+        except BaseException:
+            self.__session.rollback()
+            raise
+        finally:
+            self.__transactions.active = False
+
+    def cache_stats(self):
+        """
+        Returns the statistics of the object cache of find().
+
+        Returns:
+            dict: hits, misses, stale, expirations, evictions,
+                invalidations and size, see ObjectCache.stats(), or an
+                empty dictionary if the cache is disabled.
+        """
+        return self.__cache.stats() if self.__cache else {}
+
+    def pool_stats(self):
+        """
+        Returns the statistics of the connection pool, to size it
+        against the number of workers: a pool running out of connections
+        shows in its overflow, wait times and timeouts.
+
+        Returns:
+            dict: size (the connections kept open), checked_out, idle (the
+                open connections in the pool), overflow (the connections
+                opened beyond the size), and the counters of the pool
+                since the start: checkouts, wait_time and max_wait (the
+                time checkouts waited for a connection, in seconds),
+                timeouts, pings and ping_failures.
+        """
+        pool = self.__engine.pool
+        return {
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "idle": pool.checkedin(),
+            "overflow": max(pool.overflow(), 0),
+            **pool.metrics.stats(),
+        }
+
     def close(self):
         """
         Remove the current SQLAlchemy session.
@@ -262,6 +790,306 @@ class DBStorage(Storage):
         """
         self.__session.remove()
 
+    def _in_transaction(self):
+        """
+        Tells whether the calling thread is inside a transaction.
+
+        Returns:
+            bool: True if it is, False otherwise.
+        """
+        return getattr(self.__transactions, "active", False)
+
+    def _run_query(self, query):
+        """
+        Runs a query compiled to a single SELECT, with its conditions,
+        order, limit and offset, plus the queries of the relationships
+        it loads. A query of rows selects only their columns, and its
+        rows aren't tracked by the session.
+
+        Parameters:
+            query (Query): The query.
+
+        Returns:
+            list: The objects, or the rows of the query.
+
+        Raises:
+            ValueError: If the class has no column of a filter, sort or
+                row attribute, or no relationship to load.
+        """
+        statement = self._compile(query)
+        if query.fields:
+            statement = statement.with_entities(
+                *(self._column(query.cls, attr) for attr in query.fields))
+        else:
+            statement = statement.options(
+                *self._loader_options(query.cls, query.relationships))
+        for attr, descending in query.order:
+            column = self._column(query.cls, attr)
+            statement = statement.order_by(
+                column.desc() if descending else column)
+        if query.offset_value:
+            statement = statement.offset(query.offset_value)
+        if query.limit_value is not None:
+            statement = statement.limit(query.limit_value)
+
+        try:
+            return statement.all()
+        except SQLAlchemyError as err:
+            self.__session.rollback()
+            raise err
+
+    def _page(self, cls, limit, after):
+        """
+        Selects the first objects after a position in (created_at, id)
+        order, with a single SELECT seeking past the position rather than
+        skipping the rows before it. The created_at of the positions is
+        the one of the rows: an object already in the session keeps the
+        one it was created with, which the database may have rounded.
+
+        Parameters:
+            cls (class): The class of the objects.
+            limit (int): The maximum number of objects.
+            after (tuple[datetime, str]): The created_at and id of the
+                last object of the previous page, or None.
+
+        Returns:
+            list: The (created_at, id) position and object pairs.
+        """
+        statement = self.__session.query(cls, cls.created_at)
+        if after:
+            statement = statement.filter(
+                tuple_(cls.created_at, cls.id) > tuple_(*after))
+
+        try:
+            rows = statement.order_by(cls.created_at, cls.id) \
+                .limit(limit).all()
+        except SQLAlchemyError as err:
+            self.__session.rollback()
+            raise err
+
+        return [((created_at, obj.id), obj) for obj, created_at in rows]
+
+    def _count_query(self, query):
+        """
+        Counts the objects of a query with a single SELECT count(*).
+
+        Parameters:
+            query (Query): The query.
+
+        Returns:
+            int: The number of objects.
+
+        Raises:
+            ValueError: If the class has no column of a filter attribute.
+        """
+        statement = self._compile(query)
+        try:
+            if query.offset_value or query.limit_value is not None:
+                statement = statement.offset(query.offset_value)
+                if query.limit_value is not None:
+                    statement = statement.limit(query.limit_value)
+                return statement.count()
+
+            return statement.with_entities(func.count(query.cls.id)) \
+                .scalar()
+        except SQLAlchemyError as err:
+            self.__session.rollback()
+            raise err
+
+    def _compile(self, query):
+        """
+        Compiles the class and conditions of a query.
+
+        Parameters:
+            query (Query): The query.
+
+        Returns:
+            sqlalchemy.orm.Query: The SELECT of the matching objects.
+
+        Raises:
+            ValueError: If the class has no column of a filter attribute.
+        """
+        statement = self.__session.query(query.cls)
+        for attr, op, value in query.filters:
+            column = self._column(query.cls, attr)
+            statement = statement.filter(
+                column.in_(value) if op == "in"
+                else COMPARISONS[op](column, value))
+
+        return statement
+
+    def _column(self, _class, attr):
+        """
+        Returns the column attribute of a class.
+
+        Parameters:
+            _class (class): The class.
+            attr (str): The name of the attribute.
+
+        Returns:
+            InstrumentedAttribute: The column attribute.
+
+        Raises:
+            ValueError: If the class has no column of that name.
+        """
+        if attr not in _class.__mapper__.column_attrs:
+            raise ValueError(f"{_class.__name__} has no column {attr}")
+
+        return getattr(_class, attr)
+
+    def _attach(self, _class, values):
+        """
+        Returns the object of the session with cached values, creating it
+        without a query if the session has none.
+
+        Parameters:
+            _class (class): The class of the object.
+            values (dict): The cached column values of the object.
+
+        Returns:
+            object: The object, persistent in the session.
+        """
+        mapper = _class.__mapper__
+        obj = self.__session.identity_map.get(
+            mapper.identity_key_from_primary_key([values["id"]]))
+
+        if obj is None:
+            obj = mapper.class_manager.new_instance()
+            for key, value in values.items():
+                set_committed_value(obj, key, value)
+            make_transient_to_detached(obj)
+            self.__session.add(obj)
+        elif not inspect(obj).modified:
+            for key, value in values.items():
+                set_committed_value(obj, key, value)
+
+        return obj
+
+    def _cache_object(self, obj):
+        """
+        Caches the column values of an object loaded from the database,
+        unless the session holds changes not committed yet.
+
+        Parameters:
+            obj (object): The object.
+        """
+        if not self.__cache or self._in_transaction() or \
+                self.__session.info.get("changed"):
+            return
+
+        self.__cache.put((obj.__class__.__name__, obj.id), {
+            attr.key: obj.__dict__[attr.key]
+            for attr in obj.__mapper__.column_attrs
+            if attr.key in obj.__dict__
+        })
+
+    def _invalidate(self, session, keys):
+        """
+        Drops objects changed by a session from the cache, and again when
+        the session commits, so other sessions don't cache them meanwhile
+        with their values before the commit.
+
+        Parameters:
+            session (Session): The session changing the objects.
+            keys (Iterable[tuple[str, str]]): The class names and IDs of
+                the objects.
+        """
+        if not self.__cache:
+            return
+
+        keys = set(keys)
+        self.__cache.invalidate(keys)
+        session.info.setdefault("changed", set()).update(keys)
+
+    def _after_flush(self, session, flush_context):
+        """
+        Drops the objects a session flushed from the cache.
+
+        Parameters:
+            session (Session): The session.
+            flush_context (UOWTransaction): The unit of work of the flush.
+        """
+        self._invalidate(session, (
+            (obj.__class__.__name__, obj.id)
+            for obj in chain(session.new, session.dirty, session.deleted)
+        ))
+
+    def _after_commit(self, session):
+        """
+        Drops the objects a session changed from the cache once they are
+        committed.
+
+        Parameters:
+            session (Session): The session.
+        """
+        changed = session.info.pop("changed", None)
+        if changed and self.__cache:
+            self.__cache.invalidate(changed)
+
+    def _after_rollback(self, session):
+        """
+        Forgets the objects a session changed, their changes being undone.
+
+        Parameters:
+            session (Session): The session.
+        """
+        session.info.pop("changed", None)
+
+    def _chunks(self, ids):
+        """
+        Splits IDs into lists small enough for an IN clause.
+
+        Parameters:
+            ids (Iterable[str]): The IDs.
+
+        Returns:
+            generator: Lists of at most a thousand IDs.
+        """
+        ids = list(ids)
+        for start in range(0, len(ids), self.__CHUNK_SIZE):
+            yield ids[start:start + self.__CHUNK_SIZE]
+
+    def _loader_options(self, _class, load, skip_missing=False):
+        """
+        Builds the loader options of the relationships of a class.
+
+        Parameters:
+            _class (class): The class of the queried objects.
+            load (Iterable[str] | dict[str, str]): The names of the
+                relationships, or their strategies by name.
+            skip_missing (bool): Whether to skip the names the class has
+                no relationship of, instead of raising.
+
+        Returns:
+            list: The loader options.
+
+        Raises:
+            ValueError: If the class has no relationship of one of the
+                names and skip_missing is False, or a strategy is unknown.
+        """
+        if not isinstance(load, dict):
+            load = dict.fromkeys(load)
+
+        options = []
+        relationships = _class.__mapper__.relationships
+        for name, strategy in load.items():
+            if name not in relationships:
+                if skip_missing:
+                    continue
+                raise ValueError(f"{_class.__name__} has no relationship "
+                                 f"named {name}")
+
+            if strategy is None:
+                strategy = "selectin" if relationships[name].uselist \
+                    else "joined"
+            if strategy not in self.__LOADERS:
+                raise ValueError(f"Unknown loading strategy: {strategy}")
+
+            options.append(
+                self.__LOADERS[strategy](getattr(_class, name)))
+
+        return options
+
     def _class_to_dict(self, class_name, instances):
         """
         Helper method to convert a list of instances to a dictionary.
@@ -0,0 +1,422 @@
+#!/usr/bin/python3
+"""
+File codecs module
+
+This module defines the codecs FileStorage uses to encode and decode its
+snapshot files, selected with HBNB_FILE_FORMAT:
+    json    JsonCodec, the default, one "key": {...} entry per line
+    binary  BinaryCodec, a compact columnar format
+
+Codecs encode a snapshot in two steps: every object is first turned into
+a fragment, cached by FileStorage until the object changes, then the
+fragments are joined into the content of the file.
+
+convert() converts a snapshot file from one format to the other, the
+formats being told by the file extensions (see convert_storage.py).
+"""
+
+import json
+import struct
+from datetime import datetime, timedelta
+from itertools import accumulate, repeat
+
+from models.engine.file_utils import write_atomically
+
+EPOCH = datetime(1970, 1, 1)
+MICROSECOND = timedelta(microseconds=1)
+MISSING = object()
+
+
+class JsonCodec:
+    """JsonCodec class - Encodes snapshots as JSON, one object per line"""
+
+    name = "json"
+    extension = ".json"
+
+    def fragment(self, key, dictionary):
+        """
+        Encodes an object into its "key": {...} entry
+        Parameters:
+            key (str): the storage key of the object
+            dictionary (dict): the to_dict() dictionary of the object
+        Returns:
+            The JSON text of the entry (str)
+        """
+        return f"{json.dumps(key)}: " \
+               f"{json.dumps(dictionary, default=self._default)}"
+
+    def encode(self, fragments):
+        """
+        Joins entries into the content of a snapshot file
+        Parameters:
+            fragments (Iterable[str]): the entries of the objects
+        Returns:
+            The content of the file (bytes)
+        """
+        return ("{\n" + ",\n".join(fragments) + "\n}").encode()
+
+    def decode(self, data):
+        """
+        Decodes the content of a snapshot file
+        Parameters:
+            data (bytes): the content of the file
+        Returns:
+            The dictionaries of the objects by key (dict[str, dict])
+        Raises:
+            ValueError: If the content isn't valid JSON.
+        """
+        return json.loads(data)
+
+    @staticmethod
+    def _default(value):
+        """Encodes the datetime values decoded by BinaryCodec"""
+        if isinstance(value, datetime):
+            return value.isoformat()
+
+        raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+class BinaryCodec:
+    """
+    BinaryCodec class - Encodes snapshots in a compact columnar format
+
+    A file holds a table per class, every attribute of the class being a
+    typed column:
+        file    := b"HBNB" u8 version, u32 tables, table*
+        table   := str class name, u32 rows, u32 columns, column*
+        column  := str name, u8 type, u8 has_presence,
+                   [rows bytes: 0 missing, 1 value, 2 None], values
+        values  := INT: q* | FLOAT: d* | BOOL: B* | TIME: q* microseconds
+                   since the epoch | STR: I* lengths in characters, u32
+                   byte length, UTF-8 text of the concatenated values |
+                   JSON: u32 byte length, UTF-8 JSON array of the values
+        str     := u32 byte length, UTF-8 text
+
+    Every number is little-endian. The keys of the objects are rebuilt
+    from the class names and ids. Timestamps are decoded as datetime
+    objects, which BaseModel.from_dict() accepts as they are.
+    """
+
+    name = "binary"
+    extension = ".bin"
+
+    MAGIC = b"HBNB"
+    VERSION = 1
+    INT, FLOAT, BOOL, TIME, STR, JSON = range(6)
+    TIMESTAMPS = ("created_at", "updated_at")
+    FORMATS = {INT: "q", FLOAT: "d", BOOL: "B", TIME: "q"}
+
+    def fragment(self, key, dictionary):
+        """
+        Returns the fragment of an object, its dictionary itself
+        Parameters:
+            key (str): the storage key of the object
+            dictionary (dict): the to_dict() dictionary of the object
+        Returns:
+            The dictionary (dict)
+        """
+        return dictionary
+
+    def encode(self, fragments):
+        """
+        Encodes object dictionaries into the content of a snapshot file
+        Parameters:
+            fragments (Iterable[dict]): the dictionaries of the objects
+        Returns:
+            The content of the file (bytes)
+        """
+        tables = {}
+        for dictionary in fragments:
+            tables.setdefault(dictionary.get("__class__"), []).append(
+                dictionary)
+
+        chunks = [self.MAGIC, struct.pack("<BI", self.VERSION, len(tables))]
+        for class_name, rows in tables.items():
+            columns = {}
+            for row in rows:
+                columns.update(dict.fromkeys(row))
+            columns.pop("__class__", None)
+
+            chunks.append(self._pack_str(class_name))
+            chunks.append(struct.pack("<II", len(rows), len(columns)))
+            for column in columns:
+                self._encode_column(column, rows, chunks)
+
+        return b"".join(chunks)
+
+    def decode(self, data):
+        """
+        Decodes the content of a snapshot file
+        Parameters:
+            data (bytes): the content of the file
+        Returns:
+            The dictionaries of the objects by key (dict[str, dict])
+        Raises:
+            ValueError: If the content isn't in the binary format.
+        """
+        if data[:4] != self.MAGIC or len(data) < 9 \
+                or data[4] != self.VERSION:
+            raise ValueError("not a binary storage snapshot")
+
+        try:
+            return self._decode(memoryview(data))
+        except (struct.error, UnicodeDecodeError, IndexError) as error:
+            raise ValueError(f"corrupted binary snapshot: {error}")
+
+    def _decode(self, data):
+        """
+        Decodes the tables of a snapshot file
+
+        The columns of a table are decoded whole, then zipped into the
+        dictionaries of its objects.
+        Parameters:
+            data (memoryview): the content of the file
+        Returns:
+            The dictionaries of the objects by key (dict[str, dict])
+        """
+        dictionaries = {}
+        (tables_count,) = struct.unpack_from("<I", data, 5)
+        offset = 9
+
+        for _ in range(tables_count):
+            class_name, offset = self._unpack_str(data, offset)
+            rows_count, columns_count = struct.unpack_from("<II", data, offset)
+            offset += 8
+
+            names = ["__class__"]
+            columns = [repeat(class_name, rows_count)]
+            sparse = False
+            for _ in range(columns_count):
+                name, values, offset = self._decode_column(
+                    data, offset, rows_count)
+                names.append(name)
+                columns.append(values)
+                sparse = sparse or MISSING in values
+
+            rows = [dict(zip(names, values)) for values in zip(*columns)]
+            if sparse:
+                for row in rows:
+                    if MISSING in row.values():
+                        for name in [name for name, value in row.items()
+                                     if value is MISSING]:
+                            del row[name]
+
+            dictionaries.update(
+                (f"{class_name}.{row.get('id')}", row) for row in rows)
+
+        return dictionaries
+
+    def _encode_column(self, column, rows, chunks):
+        """
+        Encodes a column of a table
+        Parameters:
+            column (str): the name of the column
+            rows (list[dict]): the dictionaries of the objects of the table
+            chunks (list[bytes]): the encoded file, appended to
+        """
+        cells = [row.get(column, MISSING) for row in rows]
+        values = [cell for cell in cells
+                  if cell is not MISSING and cell is not None]
+        _type = self._column_type(column, values)
+
+        chunks.append(self._pack_str(column))
+        if len(values) == len(cells):
+            chunks.append(struct.pack("<BB", _type, 0))
+        else:
+            chunks.append(struct.pack("<BB", _type, 1))
+            chunks.append(bytes(
+                0 if cell is MISSING else 2 if cell is None else 1
+                for cell in cells))
+
+        if _type == self.TIME:
+            values = [self._microseconds(value) for value in values]
+
+        if _type in self.FORMATS:
+            chunks.append(struct.pack(
+                f"<{len(values)}{self.FORMATS[_type]}", *values))
+        elif _type == self.JSON:
+            text = json.dumps(values, default=JsonCodec._default).encode()
+            chunks.append(struct.pack("<I", len(text)))
+            chunks.append(text)
+        else:
+            text = "".join(values).encode()
+            chunks.append(struct.pack(
+                f"<{len(values)}I", *map(len, values)))
+            chunks.append(struct.pack("<I", len(text)))
+            chunks.append(text)
+
+    def _decode_column(self, data, offset, rows_count):
+        """
+        Decodes a column of a table
+        Parameters:
+            data (memoryview): the content of the file
+            offset (int): the offset of the column
+            rows_count (int): the number of rows of the table
+        Returns:
+            The name of the column, its value for every row, MISSING for
+            the rows without it, and the offset following the column
+            (tuple[str, list, int])
+        """
+        column, offset = self._unpack_str(data, offset)
+        _type, has_presence = struct.unpack_from("<BB", data, offset)
+        offset += 2
+
+        presence = None
+        count = rows_count
+        if has_presence:
+            presence = bytes(data[offset:offset + rows_count])
+            offset += rows_count
+            count = presence.count(1)
+
+        if _type in self.FORMATS:
+            _format = f"<{count}{self.FORMATS[_type]}"
+            values = struct.unpack_from(_format, data, offset)
+            offset += struct.calcsize(_format)
+            if _type == self.TIME:
+                values = [EPOCH + value * MICROSECOND for value in values]
+            elif _type == self.BOOL:
+                values = [value == 1 for value in values]
+        elif _type == self.JSON:
+            (size,) = struct.unpack_from("<I", data, offset)
+            values = json.loads(str(data[offset + 4:offset + 4 + size],
+                                    "utf-8"))
+            offset += 4 + size
+        elif _type == self.STR:
+            lengths = struct.unpack_from(f"<{count}I", data, offset)
+            offset += 4 * count
+            (size,) = struct.unpack_from("<I", data, offset)
+            text = str(data[offset + 4:offset + 4 + size], "utf-8")
+            offset += 4 + size
+
+            ends = list(accumulate(lengths))
+            values = [text[end - length:end]
+                      for end, length in zip(ends, lengths)]
+        else:
+            raise ValueError(f"unknown column type {_type}")
+
+        if presence is None:
+            return column, values, offset
+
+        values = iter(values)
+        return column, [
+            next(values) if state == 1 else None if state == 2 else MISSING
+            for state in presence
+        ], offset
+
+    def _column_type(self, column, values):
+        """
+        Chooses the type of a column from its values
+        Parameters:
+            column (str): the name of the column
+            values (list): the values of the column, without None
+        Returns:
+            The column type (int)
+        """
+        types = set(map(type, values))
+
+        if column in self.TIMESTAMPS and types <= {str, datetime}:
+            try:
+                for value in values:
+                    if type(value) is str and \
+                            datetime.fromisoformat(value).tzinfo:
+                        break
+                else:
+                    return self.TIME
+            except ValueError:
+                pass
+
+        if types == {int} and all(
+                -2 ** 63 <= value < 2 ** 63 for value in values):
+            return self.INT
+        if types == {float}:
+            return self.FLOAT
+        if types == {bool}:
+            return self.BOOL
+        if types <= {str}:
+            return self.STR
+
+        return self.JSON
+
+    @staticmethod
+    def _microseconds(value):
+        """
+        Converts a timestamp into microseconds since the epoch
+        Parameters:
+            value (str | datetime): an ISO 8601 timestamp
+        Returns:
+            The number of microseconds (int)
+        """
+        if type(value) is str:
+            value = datetime.fromisoformat(value)
+
+        return (value - EPOCH) // MICROSECOND
+
+    @staticmethod
+    def _pack_str(value):
+        """Encodes a length-prefixed string"""
+        data = value.encode()
+        return struct.pack("<I", len(data)) + data
+
+    @staticmethod
+    def _unpack_str(data, offset):
+        """
+        Decodes a length-prefixed string
+        Returns:
+            The string and the offset following it (tuple[str, int])
+        """
+        (size,) = struct.unpack_from("<I", data, offset)
+        offset += 4
+        return str(data[offset:offset + size], "utf-8"), offset + size
+
+
+CODECS = {codec.name: codec for codec in (JsonCodec(), BinaryCodec())}
+
+
+def get_codec(name):
+    """
+    Returns the codec of a format
+    Parameters:
+        name (str): the name of the format, "json" or "binary"
+    Returns:
+        The codec (JsonCodec | BinaryCodec)
+    Raises:
+        ValueError: If the format is unknown.
+    """
+    codec = CODECS.get(name)
+    if not codec:
+        raise ValueError(f"Unknown storage file format: {name}")
+
+    return codec
+
+
+def codec_of(path):
+    """
+    Returns the codec of a file, told by its extension
+    Parameters:
+        path (str): the path of the file
+    Returns:
+        The codec (JsonCodec | BinaryCodec)
+    Raises:
+        ValueError: If the extension isn't the one of a codec.
+    """
+    for codec in CODECS.values():
+        if path.endswith(codec.extension):
+            return codec
+
+    raise ValueError(f"Unknown storage file extension: {path}")
+
+
+def convert(source, target):
+    """
+    Converts a snapshot file from a format to another
+    Parameters:
+        source (str): the path of the file to convert
+        target (str): the path of the converted file
+    """
+    source_codec, target_codec = codec_of(source), codec_of(target)
+    with open(source, "rb") as file:
+        dictionaries = source_codec.decode(file.read())
+
+    write_atomically(target, target_codec.encode(
+        target_codec.fragment(key, dictionary)
+        for key, dictionary in dictionaries.items()))
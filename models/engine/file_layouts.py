@@ -0,0 +1,936 @@
+#!/usr/bin/python3
+"""
+File layouts module
+
+This module defines the layouts FileStorage keeps its objects in on disk,
+selected with the HBNB_FILE_* mode variables:
+    file      FileLayout, the default, every object in one file
+    journal   JournalLayout, the file and a journal of the changes
+              appended since it was last written (HBNB_FILE_JOURNAL=1)
+    lazy      LazyLayout, the file decoded one object at a time, on
+              access (HBNB_FILE_LAZY=1)
+    sharded   ShardedLayout, a file per class, loaded on first use
+              (HBNB_FILE_SHARDED=1)
+    snapshot  SnapshotLayout, a read-only snapshot published by another
+              storage (HBNB_FILE_SNAPSHOT=1)
+
+FileStorage keeps the objects, their indexes and the changes not written
+yet in memory, and leaves reading, writing and merging its files to its
+layout, which changes the objects and indexes through the helpers of the
+storage. The write lock of the storage is held while a layout changes
+them, and a file lock while it reads or writes the files.
+"""
+
+import json
+import os
+from datetime import datetime
+from itertools import chain
+from types import MappingProxyType
+
+from models.base_model import FOREIGN_KEYS
+from models.engine.file_utils import file_version
+from models.engine.journal import Journal
+from models.engine.lazy_objects import LazyObjects, ObjectsView
+from models.engine.snapshot import Snapshot, SnapshotObjects
+
+
+class FileLayout:
+    """FileLayout class - Every object in one file, rewritten on write"""
+
+    name = "file"
+    writable = True
+
+    def __init__(self, storage, path, codec, lock, **options):
+        """
+        Initializes the layout of a storage.
+
+        Parameters:
+            storage (FileStorage): the storage
+            path (str): the path of the file
+            codec (JsonCodec | BinaryCodec): the codec of the files
+            lock (FileLock): the lock of the processes sharing the files
+            **options: the settings of the layouts: journal_max_bytes,
+                lazy_cache_bytes, snapshot_path and snapshot_cache
+        """
+        self._storage = storage
+        self._path = path
+        self._codec = codec
+        self._lock = lock
+
+    def paths(self):
+        """
+        Returns the paths of the files of the layout.
+
+        Returns:
+            list[str]: The paths.
+        """
+        return [self._path]
+
+    def changed(self):
+        """
+        Tells whether the files may have changed since they were read or
+        written by the storage.
+
+        Returns:
+            bool: True if they may have, False otherwise.
+        """
+        return self._storage._files_changed(*self.paths())
+
+    def reload(self):
+        """
+        Reads every object from the files, a shared file lock being held.
+        The objects in memory are kept if there is no file.
+        """
+        storage = self._storage
+        storage._forget_versions()
+        storage._record_versions(*self.paths())
+        if not any(os.path.isfile(path) for path in self.paths()):
+            return
+
+        try:
+            data = b""
+            dictionaries = {}
+            if os.path.isfile(self._path):
+                with open(self._path, "rb") as file:
+                    data = file.read()
+                dictionaries = self._codec.decode(data)
+            fragments = self._fragments(data, dictionaries)
+
+            objects = {
+                key: storage._deserialize(dictionary)
+                for key, dictionary in dictionaries.items()
+            }
+            indexes = ({}, {})
+            for key, obj in objects.items():
+                if obj:
+                    storage._index(key, obj, indexes)
+
+            storage._publish(objects, *indexes)
+            storage._reset_fragments(fragments)
+            storage._clear_changes()
+        except (OSError, ValueError):
+            pass
+
+    def refresh(self, pending):
+        """
+        Brings the objects in line with the files, discarding the changes
+        not saved. In the JSON format, only the records that differ from
+        the objects in memory are decoded again; the objects are reloaded
+        otherwise.
+
+        Parameters:
+            pending (bool): whether changes are pending
+        """
+        storage = self._storage
+        if self._codec.name == "json":
+            with self._lock.shared():
+                merged = storage._merge(self._path, list(storage._objects()))
+                if merged:
+                    storage._forget_versions()
+                    storage._record_versions(self._path)
+
+            if merged:
+                storage._take_dirty()
+                storage._clear_changes()
+                return
+
+        with self._lock.shared():
+            self.reload()
+
+    def write(self, changes, deleted):
+        """
+        Writes a set of changes, the exclusive file lock being held,
+        merging the objects written by other processes first.
+
+        Parameters:
+            changes (dict[str, set]): attributes changed by key, None for
+                objects that must be written whole
+            deleted (set[str]): keys of the deleted objects
+        """
+        if self.changed():
+            with self._storage._writing():
+                self.merge_written({**changes, **dict.fromkeys(deleted)})
+
+        self._rewrite()
+
+    def merge_written(self, pending):
+        """
+        Merges the objects written by other processes since the files
+        were read or written here.
+
+        Parameters:
+            pending (dict[str, set]): the attributes changed since the
+                last write by key, None for the objects new, deleted or
+                changed whole, see FileStorage._merge_entries()
+        """
+        storage = self._storage
+        storage._merge(self._path, list(storage._objects()), pending)
+
+    def load_classes(self, *class_names):
+        """
+        Makes sure the objects of classes are in memory, which they are
+        once reloaded.
+
+        Parameters:
+            class_names (str): the names of the classes
+        """
+        pass
+
+    def index_value(self, obj):
+        """
+        Returns the value of an object in the indexes.
+
+        Parameters:
+            obj (BaseModel): the object
+
+        Returns:
+            BaseModel: The object itself.
+        """
+        return obj
+
+    def track(self, key, obj):
+        """
+        Records that a stored object changed.
+
+        Parameters:
+            key (str): the storage key of the object
+            obj (BaseModel): the object
+        """
+        pass
+
+    def view(self, index):
+        """
+        Returns a read-only view of the objects of an index entry, shared
+        with the index until a writer changes it.
+
+        Parameters:
+            index (dict[str, BaseModel]): the objects by key
+
+        Returns:
+            Mapping: The objects by key.
+        """
+        if not index:
+            return {}
+
+        return MappingProxyType(self._storage._pin(index))
+
+    def view_all(self):
+        """
+        Returns a read-only view of every object.
+
+        Returns:
+            Mapping: The objects by key.
+        """
+        return MappingProxyType(self._storage._pin(self._storage._objects()))
+
+    def objects_of(self, class_name):
+        """
+        Returns a read-only view of the objects of a class.
+
+        Parameters:
+            class_name (str): the name of the class
+
+        Returns:
+            Mapping: The objects by key.
+        """
+        return self.view(self._storage._class_index(class_name))
+
+    def related(self, class_name, foreign_key, _id):
+        """
+        Returns a read-only view of the objects of a class referencing an
+        ID through a foreign key.
+
+        Parameters:
+            class_name (str): the name of the class
+            foreign_key (str): the foreign key attribute
+            _id (str): the referenced ID
+
+        Returns:
+            Mapping: The objects by key.
+        """
+        related = self._storage._related_index(class_name, foreign_key)
+        return self.view(related.get(_id, {}))
+
+    def count(self, class_name):
+        """
+        Returns the number of objects of a class.
+
+        Parameters:
+            class_name (str): the name of the class
+
+        Returns:
+            int: The number of objects.
+        """
+        return len(self._storage._class_index(class_name))
+
+    def _rewrite(self):
+        """Rewrites the file with every object"""
+        self._storage._write_file(self._path)
+
+    def _fragments(self, data, dictionaries):
+        """
+        Returns the JSON text of the entries of the file read, which the
+        storage caches until the objects change.
+
+        Parameters:
+            data (bytes): the content of the file
+            dictionaries (dict[str, dict]): the objects decoded from it
+
+        Returns:
+            dict[str, str]: The JSON text of the entries by key, or None
+                if the file isn't in the JSON line layout.
+        """
+        fragments = self._storage._split_entries(data)
+        if fragments and fragments.keys() == dictionaries.keys():
+            return fragments
+
+        return None
+
+
+class JournalLayout(FileLayout):
+    """
+    JournalLayout class - The file and a journal of the changes
+
+    Writes append the changes to the journal, which is compacted into the
+    file once it grows past journal_max_bytes.
+    """
+
+    name = "journal"
+
+    def __init__(self, storage, path, codec, lock, **options):
+        """Initializes the layout, see FileLayout."""
+        super().__init__(storage, path, codec, lock, **options)
+        self.__journal = Journal(f"{path}.journal")
+        self.__max_bytes = options["journal_max_bytes"]
+
+    def paths(self):
+        """
+        Returns the paths of the file and of the journal.
+
+        Returns:
+            list[str]: The paths.
+        """
+        return [self._path, self.__journal.path]
+
+    def refresh(self, pending):
+        """
+        Reloads the objects, discarding the changes not saved.
+
+        Parameters:
+            pending (bool): whether changes are pending
+        """
+        with self._lock.shared():
+            self.reload()
+
+    def write(self, changes, deleted):
+        """
+        Appends a set of changes to the journal, the exclusive file lock
+        being held, and compacts it into the file once it is too large.
+
+        Parameters:
+            changes (dict[str, set]): attributes changed by key, None for
+                objects that must be written whole
+            deleted (set[str]): keys of the deleted objects
+        """
+        storage = self._storage
+        changed = self.changed()
+
+        self.__journal.append(self._records(changes, deleted))
+        if not changed:
+            storage._record_versions(self.__journal.path)
+
+        if self.__journal.size() < self.__max_bytes:
+            return
+
+        if changed:
+            with storage._writing():
+                self.merge_written({**changes, **dict.fromkeys(deleted)})
+
+        self._rewrite()
+
+    def merge_written(self, pending):
+        """
+        Merges the objects of the file and journal written by other
+        processes.
+
+        Parameters:
+            pending (dict[str, set]): the changes made since the last
+                write, see FileLayout.merge_written()
+        """
+        storage = self._storage
+        try:
+            dictionaries = {}
+            if os.path.isfile(self._path):
+                with open(self._path, "rb") as file:
+                    dictionaries = self._codec.decode(file.read())
+            self.__journal.replay(dictionaries)
+        except (OSError, ValueError):
+            return
+
+        storage._merge_entries(dictionaries, list(storage._objects()),
+                               pending)
+
+    def _rewrite(self):
+        """Rewrites the file with every object and empties the journal"""
+        super()._rewrite()
+        self.__journal.truncate()
+        self._storage._record_versions(self.__journal.path)
+
+    def _fragments(self, data, dictionaries):
+        """
+        Replays the journal over the objects of the file read.
+
+        Parameters:
+            data (bytes): the content of the file
+            dictionaries (dict[str, dict]): the objects decoded from it
+
+        Returns:
+            None: The entries of the file aren't the objects.
+        """
+        self.__journal.replay(dictionaries)
+        return None
+
+    def _records(self, changes, deleted):
+        """
+        Builds the journal records of a set of changes.
+
+        Parameters:
+            changes (dict[str, set]): attributes changed by key, None for
+                objects that must be written whole
+            deleted (set[str]): keys of the deleted objects
+
+        Returns:
+            list[dict]: The journal records.
+        """
+        objects = self._storage._objects()
+        records = [{"op": "delete", "key": key} for key in deleted]
+
+        for key, changed_attrs in changes.items():
+            obj = objects.get(key)
+            if not obj:
+                continue
+
+            if changed_attrs is None:
+                records.append(
+                    {"op": "new", "key": key, "data": obj.to_dict()})
+                continue
+
+            data = {}
+            for attr in changed_attrs:
+                value = getattr(obj, attr, None)
+                if isinstance(value, datetime):
+                    value = value.isoformat()
+                data[attr] = value
+
+            records.append({"op": "update", "key": key, "data": data})
+
+        return records
+
+
+class LazyLayout(FileLayout):
+    """
+    LazyLayout class - The file decoded one object at a time, on access
+
+    Only the position of every object in the file is read, into a
+    LazyObjects mapping caching lazy_cache_bytes bytes of records. The
+    indexes hold keys only, the objects being resolved through the
+    mapping.
+    """
+
+    name = "lazy"
+
+    def __init__(self, storage, path, codec, lock, **options):
+        """Initializes the layout, see FileLayout."""
+        super().__init__(storage, path, codec, lock, **options)
+        self.__max_bytes = options["lazy_cache_bytes"]
+
+    def reload(self):
+        """
+        Reads the directory of the objects of the file, a shared file lock
+        being held.
+        """
+        self._storage._forget_versions()
+        self._storage._record_versions(*self.paths())
+        self._reload()
+
+    def refresh(self, pending):
+        """
+        Reloads the directory of the objects, discarding the changes not
+        saved.
+
+        Parameters:
+            pending (bool): whether changes are pending
+        """
+        with self._lock.shared():
+            self.reload()
+
+    def merge_written(self, pending):
+        """
+        Reloads the directory of a file written by another process,
+        keeping the objects changed since the last write, which take the
+        attributes they didn't change from the file.
+
+        Parameters:
+            pending (dict[str, set]): the changes made since the last
+                write, see FileLayout.merge_written()
+        """
+        storage = self._storage
+        objects = storage._objects()
+        kept = {key: objects[key] for key in pending if key in objects}
+
+        storage._record_versions(self._path)
+        self._reload()
+
+        objects = storage._objects()
+        for key, changed_attrs in pending.items():
+            other = objects.get(key)
+            if other is not None:
+                storage._unindex(key, other)
+                del objects[key]
+
+            obj = kept.get(key)
+            if obj:
+                if other is not None and changed_attrs is not None:
+                    storage._merge_attributes(obj, other, changed_attrs)
+                objects[key] = obj
+                storage._index(key, obj)
+
+    def index_value(self, obj):
+        """
+        Returns the value of an object in the indexes.
+
+        Parameters:
+            obj (BaseModel): the object
+
+        Returns:
+            None: The indexes hold keys only.
+        """
+        return None
+
+    def track(self, key, obj):
+        """
+        Pins a changed object in memory until the next write.
+
+        Parameters:
+            key (str): the storage key of the object
+            obj (BaseModel): the object
+        """
+        self._storage._objects().pin(key, obj)
+
+    def view(self, index):
+        """
+        Returns a read-only view of the objects of an index entry, loaded
+        on access.
+
+        Parameters:
+            index (dict[str, None]): the keys of the objects
+
+        Returns:
+            Mapping: The objects by key.
+        """
+        if not index:
+            return {}
+
+        return ObjectsView(self._storage._objects(), self._storage._pin(index))
+
+    def view_all(self):
+        """
+        Returns a read-only view of every object, loaded on access.
+
+        Returns:
+            Mapping: The objects by key.
+        """
+        storage = self._storage
+        indexes = (storage._class_index(class_name)
+                   for class_name in storage.get_classes_names())
+        return ObjectsView(storage._objects(), chain.from_iterable(
+            storage._pin(index) for index in indexes if index))
+
+    def _rewrite(self):
+        """Rewrites the file, copying the records of unchanged objects"""
+        storage = self._storage
+        with storage._writing():
+            storage._objects().write()
+        storage._record_versions(self._path)
+        storage._take_dirty()
+
+    def _reload(self):
+        """
+        Replaces the objects by a new lazy mapping of the file. The
+        previous mapping is closed once the views of readers over it are
+        gone.
+        """
+        storage = self._storage
+        objects = LazyObjects(
+            self._path, storage._deserialize, self.__max_bytes)
+        indexes = ({}, {})
+
+        storage._reset_fragments()
+        storage._clear_changes()
+
+        try:
+            self._scan(objects, indexes)
+        finally:
+            storage._publish(objects, *indexes)
+
+    def _scan(self, objects, indexes):
+        """
+        Reads the directory of the objects of the file into a new lazy
+        mapping and new indexes. A file that doesn't hold one object per
+        line, as written by older versions, is loaded whole once; the
+        next save rewrites it.
+
+        Parameters:
+            objects (LazyObjects): the new lazy mapping
+            indexes (tuple[dict, dict]): the new per-class and foreign key
+                indexes
+        """
+        storage = self._storage
+        if not os.path.isfile(self._path):
+            return
+
+        try:
+            records = objects.scan(FOREIGN_KEYS)
+        except ValueError:
+            records = None
+        except OSError:
+            return
+
+        if records is not None:
+            for key, foreign_keys in records:
+                storage._index_record(key, foreign_keys, indexes)
+            return
+
+        try:
+            with open(self._path, "r") as file:
+                for key, dictionary in json.load(file).items():
+                    obj = storage._deserialize(dictionary)
+                    if obj:
+                        objects.pin(key, obj)
+                        storage._index(key, obj, indexes)
+        except (OSError, json.JSONDecodeError):
+            pass
+
+
+class ShardedLayout(FileLayout):
+    """
+    ShardedLayout class - A file per class, loaded on first use
+
+    The objects of a class are stored in a file of their own
+    (file.<class>.json), rewritten only when one of them changed.
+    """
+
+    name = "sharded"
+
+    def __init__(self, storage, path, codec, lock, **options):
+        """Initializes the layout, see FileLayout."""
+        super().__init__(storage, path, codec, lock, **options)
+        self.__loaded = set()
+
+    def changed(self):
+        """
+        Tells whether the files may have changed: refresh() checks the
+        file of every loaded class.
+
+        Returns:
+            bool: True.
+        """
+        return True
+
+    def reload(self):
+        """Drops the objects, every class being loaded again on first use"""
+        storage = self._storage
+        storage._publish({}, {}, {})
+        storage._reset_fragments()
+        self.__loaded = set()
+        storage._forget_versions()
+        storage._clear_changes()
+
+    def refresh(self, pending):
+        """
+        Refreshes the loaded classes whose file changed, discarding the
+        changes not saved.
+
+        Parameters:
+            pending (bool): whether changes are pending, in which case
+                every loaded class is refreshed
+        """
+        storage = self._storage
+        with self._lock.shared():
+            for class_name in list(self.__loaded):
+                path = self._shard_path(class_name)
+                if not pending and not storage._files_changed(path):
+                    continue
+
+                if file_version(path) and self._codec.name == "json" and \
+                        storage._merge(path, list(
+                            storage._class_index(class_name))):
+                    storage._record_versions(path)
+                    continue
+
+                self._unload_class(class_name)
+
+        storage._take_dirty()
+        storage._clear_changes()
+
+    def write(self, changes, deleted):
+        """
+        Rewrites the files of the classes with objects changed since the
+        last write, the exclusive file lock being held, merging the
+        changes written by other processes first.
+
+        Parameters:
+            changes (dict[str, set]): attributes changed by key
+            deleted (set[str]): keys of the deleted objects
+        """
+        storage = self._storage
+        pending = {**changes, **dict.fromkeys(deleted)}
+        class_names = {key.split(".", 1)[0] for key in storage._dirty_keys()}
+        for class_name in class_names:
+            path = self._shard_path(class_name)
+            if storage._files_changed(path):
+                with storage._writing():
+                    storage._merge(path, list(
+                        storage._class_index(class_name)), pending)
+
+        dirty = storage._take_dirty()
+        try:
+            for class_name in class_names:
+                storage._write_class_file(
+                    self._shard_path(class_name), class_name)
+        except BaseException:
+            storage._restore_dirty(dirty)
+            raise
+
+    def load_classes(self, *class_names):
+        """
+        Loads the objects of classes from their files. A class is seen as
+        loaded by readers once all its objects are.
+
+        Parameters:
+            class_names (str): the names of the classes
+        """
+        storage = self._storage
+        for class_name in class_names:
+            if class_name in self.__loaded or \
+                    class_name not in storage.get_classes_names():
+                continue
+
+            with storage._writing():
+                if class_name not in self.__loaded:
+                    self._load_class(class_name)
+                    self.__loaded.add(class_name)
+
+    def _load_class(self, class_name):
+        """
+        Loads the objects of a class from its file. The objects of a class
+        without a file yet are read from the unsharded file, if any; the
+        next save of the class writes its file.
+
+        Parameters:
+            class_name (str): the name of the class
+        """
+        storage = self._storage
+        path = self._shard_path(class_name)
+        prefix = f"{class_name}."
+
+        try:
+            with self._lock.shared():
+                storage._record_versions(path)
+                if not os.path.isfile(path):
+                    path = self._path
+
+                with open(path, "rb") as file:
+                    data = file.read()
+            dictionaries = self._codec.decode(data)
+        except (OSError, ValueError):
+            return
+
+        fragments = {}
+        if path != self._path:
+            fragments = storage._split_entries(data) or {}
+
+        objects = storage._writable_objects()
+        cached = storage._fragments()
+        for key, dictionary in dictionaries.items():
+            if not key.startswith(prefix) or key in objects:
+                continue
+
+            obj = storage._deserialize(dictionary)
+            if obj:
+                objects[key] = obj
+                storage._index(key, obj)
+                if key in fragments:
+                    cached[key] = fragments[key]
+
+    def _unload_class(self, class_name):
+        """
+        Drops the objects of a class, loaded again on first use.
+
+        Parameters:
+            class_name (str): the name of the class
+        """
+        storage = self._storage
+        objects = storage._writable_objects()
+        fragments = storage._fragments()
+        for key, obj in list(storage._class_index(class_name).items()):
+            objects.pop(key, None)
+            fragments.pop(key, None)
+            storage._unindex(key, obj)
+
+        self.__loaded.discard(class_name)
+        storage._forget_versions(self._shard_path(class_name))
+
+    def _shard_path(self, class_name):
+        """
+        Returns the path of the file of a class.
+
+        Parameters:
+            class_name (str): the name of the class
+
+        Returns:
+            str: The path of the file, e.g. file.State.json.
+        """
+        root, extension = os.path.splitext(self._path)
+        return f"{root}.{class_name}{extension}"
+
+
+class SnapshotLayout(FileLayout):
+    """
+    SnapshotLayout class - A read-only snapshot published by a storage
+
+    The snapshot at snapshot_path is mapped in memory, shared by every
+    process reading it, and its objects are decoded on access, the
+    snapshot_cache most recently used ones being kept.
+    """
+
+    name = "snapshot"
+    writable = False
+
+    def __init__(self, storage, path, codec, lock, **options):
+        """Initializes the layout, see FileLayout."""
+        super().__init__(storage, path, codec, lock, **options)
+        self.__snapshot_path = options["snapshot_path"]
+        self.__max_objects = options["snapshot_cache"]
+
+    def paths(self):
+        """
+        Returns the path of the snapshot.
+
+        Returns:
+            list[str]: The path.
+        """
+        return [self.__snapshot_path]
+
+    def reload(self):
+        """Maps the published snapshot if it isn't the mapped one"""
+        storage = self._storage
+        objects = storage._objects()
+        if isinstance(objects, SnapshotObjects):
+            snapshot = objects.snapshot
+            version = snapshot.version if snapshot else None
+            if version == file_version(self.__snapshot_path):
+                return
+
+        try:
+            snapshot = Snapshot(self.__snapshot_path)
+        except (OSError, ValueError):
+            snapshot = None
+
+        storage._publish(SnapshotObjects(
+            snapshot, storage._deserialize, self.__max_objects), {}, {})
+
+    def view_all(self):
+        """
+        Returns every object of the snapshot, decoded on access.
+
+        Returns:
+            Mapping: The objects by key.
+        """
+        return self._storage._objects()
+
+    def objects_of(self, class_name):
+        """
+        Returns the objects of a class in the snapshot.
+
+        Parameters:
+            class_name (str): the name of the class
+
+        Returns:
+            Mapping: The objects by key.
+        """
+        return self._snapshot_view(class_name)
+
+    def related(self, class_name, foreign_key, _id):
+        """
+        Returns the objects of a class in the snapshot referencing an ID
+        through a foreign key.
+
+        Parameters:
+            class_name (str): the name of the class
+            foreign_key (str): the foreign key attribute
+            _id (str): the referenced ID
+
+        Returns:
+            Mapping: The objects by key.
+        """
+        return self._snapshot_view(class_name, foreign_key, _id)
+
+    def count(self, class_name):
+        """
+        Returns the number of objects of a class in the snapshot.
+
+        Parameters:
+            class_name (str): the name of the class
+
+        Returns:
+            int: The number of objects.
+        """
+        snapshot = self._storage._objects().snapshot
+        return snapshot.count(class_name) if snapshot else 0
+
+    def _snapshot_view(self, class_name, foreign_key=None, _id=None):
+        """
+        Returns a view of objects of the mapped snapshot.
+
+        Parameters:
+            class_name (str): the name of the class of the objects
+            foreign_key (str, optional): a foreign key attribute
+            _id (str, optional): the ID the foreign key references
+
+        Returns:
+            Mapping: The objects of the class, or those referencing the
+                ID, by key.
+        """
+        objects = self._storage._objects()
+        snapshot = objects.snapshot
+        if snapshot is None:
+            return {}
+
+        if foreign_key:
+            keys = snapshot.related(class_name, foreign_key, _id)
+        else:
+            keys = snapshot.keys(class_name)
+
+        return ObjectsView(objects, keys)
+
+
+LAYOUTS = {layout.name: layout for layout in (
+    FileLayout, JournalLayout, LazyLayout, ShardedLayout, SnapshotLayout)}
+
+
+def get_layout(name):
+    """
+    Returns the layout class of a name
+    Parameters:
+        name (str): the name of the layout, see LAYOUTS
+    Returns:
+        The layout class (type)
+    Raises:
+        ValueError: If the layout is unknown.
+    """
+    layout = LAYOUTS.get(name)
+    if not layout:
+        raise ValueError(f"Unknown storage file layout: {name}")
+
+    return layout
@@ -0,0 +1,146 @@
+#!/usr/bin/python3
+"""
+FileLock module
+
+This module defines FileLock, an advisory lock shared by the processes
+and threads using a FileStorage, held on a lock file next to the storage
+file with fcntl.flock(): shared while reading the storage files, and
+exclusive while writing them.
+
+The storage files are replaced by renames, so the lock is taken on a
+separate file whose inode never changes. Every acquisition opens its own
+descriptor, which makes threads of a process exclude each other as well.
+On platforms without fcntl the lock does nothing.
+"""
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+
+class FileLock:
+    """FileLock class - Shared/exclusive advisory lock on a file"""
+
+    def __init__(self, path, timeout=None):
+        """
+        Initializes a lock on a file.
+
+        Parameters:
+            path (str): the path of the lock file, created if needed
+            timeout (float, optional): the maximum number of seconds to
+                wait for the lock, None to wait as long as needed
+        """
+        self.__path = path
+        self.__timeout = timeout
+        self.__held = threading.local()
+
+    @property
+    def path(self):
+        """str: the path of the lock file"""
+        return self.__path
+
+    @contextmanager
+    def shared(self):
+        """
+        Holds the lock shared with other readers for the duration of a
+        with block.
+
+        Raises:
+            TimeoutError: If the lock isn't granted within the timeout.
+        """
+        with self._locked(fcntl.LOCK_SH if fcntl else None):
+            yield
+
+    @contextmanager
+    def exclusive(self):
+        """
+        Holds the lock exclusively for the duration of a with block.
+
+        Raises:
+            TimeoutError: If the lock isn't granted within the timeout.
+        """
+        with self._locked(fcntl.LOCK_EX if fcntl else None):
+            yield
+
+    @contextmanager
+    def _locked(self, operation):
+        """
+        Holds the lock in a mode for the duration of a with block.
+
+        A thread already holding the lock keeps it: an exclusive lock
+        covers nested acquisitions, and a shared one is upgraded for the
+        duration of a nested exclusive acquisition.
+
+        Parameters:
+            operation (int): fcntl.LOCK_SH or fcntl.LOCK_EX, None without
+                fcntl
+        """
+        if operation is None:
+            yield
+            return
+
+        held = getattr(self.__held, "lock", None)
+        if held:
+            fd, mode = held
+            if mode == fcntl.LOCK_EX or operation == mode:
+                yield
+                return
+
+            self._acquire(fd, operation)
+            self.__held.lock = (fd, operation)
+            try:
+                yield
+            finally:
+                fcntl.flock(fd, mode)
+                self.__held.lock = held
+            return
+
+        fd = os.open(self.__path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            self._acquire(fd, operation)
+            self.__held.lock = (fd, operation)
+            try:
+                yield
+            finally:
+                self.__held.lock = None
+        finally:
+            os.close(fd)
+
+    def _acquire(self, fd, operation):
+        """
+        Locks a descriptor, polling until the timeout expires.
+
+        Parameters:
+            fd (int): the descriptor of the lock file
+            operation (int): fcntl.LOCK_SH or fcntl.LOCK_EX
+
+        Raises:
+            TimeoutError: If the lock isn't granted within the timeout.
+        """
+        if self.__timeout is None:
+            fcntl.flock(fd, operation)
+            return
+
+        deadline = time.monotonic() + self.__timeout
+        delay = 0.001
+        while True:
+            try:
+                fcntl.flock(fd, operation | fcntl.LOCK_NB)
+                return
+            except BlockingIOError:
+                pass
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError(
+                    f"Timed out after {self.__timeout}s waiting for the "
+                    f"lock on {self.__path}")
+
+            time.sleep(min(delay, remaining))
+            delay = min(delay * 2, 0.05)
@@ -1,10 +1,27 @@
 #!/usr/bin/python3
 """FileStorage module - Handles file storage operations for objects"""
 
+import atexit
+import heapq
 import json
+import operator
 import os
+import threading
+from collections import namedtuple
+from contextlib import contextmanager
+from datetime import datetime
+from itertools import chain, islice
 
+from models.base_model import FOREIGN_KEYS
+from models.engine.file_codecs import get_codec
+from models.engine.file_layouts import get_layout
+from models.engine.file_lock import FileLock
+from models.engine.file_utils import file_version, write_atomically
+from models.engine.group_commit import GroupCommit
+from models.engine.query import COMPARISONS
+from models.engine.snapshot import Snapshot
 from models.engine.storage import Storage
+from models.engine.write_behind import WriteBehind
 
 
 class FileStorage(Storage):
@@ -12,8 +29,151 @@ class FileStorage(Storage):
 
     __file_path = "file.json"
     __objects = {}
+    __class_objects = {}
+    __relations = {}
+    __changes = {}
+    __deleted = set()
+    __fragments = {}
+    __dirty = set()
+    __versions = {}
+    __shared = set()
+    __writers = 0
+    __write_lock = threading.RLock()
+    __undo = None
+    __undo_changed = set()
+    __transaction_thread = None
+    __row_types = {}
 
-    def all(self, cls=None):
+    def __init__(self):
+        """
+        Initialize the FileStorage instance.
+
+        HBNB_FILE_FORMAT selects the format of the file: "json" (the
+        default, file.json) or "binary" (file.bin), see file_codecs.
+
+        Setting HBNB_FILE_JOURNAL=1 makes save() append the changes made
+        since the last save to a journal instead of rewriting the whole
+        file. The journal is compacted into the file once it grows past
+        HBNB_FILE_JOURNAL_MAX_BYTES (16 MiB by default).
+
+        Setting HBNB_FILE_LAZY=1 makes reload() read only the position of
+        every object in the file; objects are decoded on first access and
+        kept in a cache of at most HBNB_FILE_LAZY_CACHE_BYTES bytes of
+        records (64 MiB by default). Lazy mode can't be combined with the
+        journal.
+
+        Setting HBNB_FILE_SHARDED=1 stores the objects of every class in
+        a file of their own (file.<class>.json). A class is loaded the
+        first time it is needed and its file is rewritten only when one
+        of its objects changed. Sharded mode can't be combined with the
+        journal or lazy mode.
+
+        Setting HBNB_FILE_SNAPSHOT_PUBLISH=1 makes the storage publish a
+        read-only snapshot of the objects (file.snapshot), see
+        publish_snapshot(), from a background thread at most
+        HBNB_FILE_SNAPSHOT_INTERVAL seconds (1 by default) after a write,
+        one snapshot covering every write made in the meantime, and at
+        the exit of the interpreter. Saves don't wait for it, so readers
+        of the snapshot see a change up to the interval plus the time to
+        publish every object after it is written, and only once they
+        reload(). Setting HBNB_FILE_SNAPSHOT=1 makes the storage
+        a read-only view of the published snapshot, mapped in memory and
+        shared by every process reading it, for web workers. Objects are
+        decoded on access, and the HBNB_FILE_SNAPSHOT_CACHE most recently
+        used ones (10000 by default) are kept; reload() and close() switch
+        to a newly published snapshot.
+
+        Processes sharing the files hold a shared lock on file.json.lock
+        while reading them and an exclusive one while writing them, and
+        merge the changes written by the others before writing theirs.
+        HBNB_FILE_LOCK_TIMEOUT sets how long to wait for the lock (10
+        seconds by default, a negative value to wait as long as needed).
+
+        Setting HBNB_FILE_WRITE_BEHIND=1 makes save() return at once, the
+        changes being written by a background thread at most
+        HBNB_FILE_WRITE_BEHIND_MAX_STALENESS seconds later (1 by default),
+        one write covering every save() made in the meantime. flush()
+        waits for the saved changes to be written; close(), reload() and
+        the exit of the interpreter write them first.
+
+        Threads of a process share the objects: changes are made one
+        thread at a time, while reads never wait. all() and the lookups
+        return read-only point-in-time views of the indexes, which writers
+        leave untouched by changing a copy of the indexes readers hold.
+
+        Raises:
+            ValueError: If more than one of HBNB_FILE_LAZY,
+                HBNB_FILE_JOURNAL and HBNB_FILE_SHARDED are set, if
+                HBNB_FILE_FORMAT is unknown, if lazy mode is used with
+                another format than JSON, or if HBNB_FILE_SNAPSHOT is set
+                with another mode or with HBNB_FILE_WRITE_BEHIND.
+        """
+        self.__codec = get_codec(os.getenv('HBNB_FILE_FORMAT', "json"))
+        self.__file_path = \
+            os.path.splitext(FileStorage.__file_path)[0] + \
+            self.__codec.extension
+
+        journal = os.getenv('HBNB_FILE_JOURNAL') == "1"
+        lazy = os.getenv('HBNB_FILE_LAZY') == "1"
+        sharded = os.getenv('HBNB_FILE_SHARDED') == "1"
+        snapshot_reader = os.getenv('HBNB_FILE_SNAPSHOT') == "1"
+        snapshot_publish = os.getenv('HBNB_FILE_SNAPSHOT_PUBLISH') == "1"
+        write_behind = os.getenv('HBNB_FILE_WRITE_BEHIND') == "1"
+
+        if lazy and journal:
+            raise ValueError("HBNB_FILE_LAZY can't be combined with "
+                             "HBNB_FILE_JOURNAL")
+        if lazy and self.__codec.name != "json":
+            raise ValueError("HBNB_FILE_LAZY requires the json "
+                             "HBNB_FILE_FORMAT")
+        if sharded and (lazy or journal):
+            raise ValueError("HBNB_FILE_SHARDED can't be combined with "
+                             "HBNB_FILE_LAZY or HBNB_FILE_JOURNAL")
+        if snapshot_reader and (
+                lazy or journal or sharded or snapshot_publish or
+                write_behind):
+            raise ValueError("HBNB_FILE_SNAPSHOT can't be combined with "
+                             "another HBNB_FILE_* mode")
+
+        self.__snapshot_path = \
+            os.path.splitext(FileStorage.__file_path)[0] + ".snapshot"
+
+        self.__class_map = dict(
+            zip(self.get_classes_names(), self.get_classes()))
+
+        timeout = float(os.getenv('HBNB_FILE_LOCK_TIMEOUT', 10))
+        self.__lock = FileLock(f"{self.__file_path}.lock",
+                               None if timeout < 0 else timeout)
+
+        layout = "snapshot" if snapshot_reader else "lazy" if lazy else \
+            "sharded" if sharded else "journal" if journal else "file"
+        self.__layout = get_layout(layout)(
+            self, self.__file_path, self.__codec, self.__lock,
+            journal_max_bytes=int(os.getenv(
+                'HBNB_FILE_JOURNAL_MAX_BYTES', 16 * 1024 * 1024)),
+            lazy_cache_bytes=int(os.getenv(
+                'HBNB_FILE_LAZY_CACHE_BYTES', 64 * 1024 * 1024)),
+            snapshot_path=self.__snapshot_path,
+            snapshot_cache=int(os.getenv('HBNB_FILE_SNAPSHOT_CACHE', 10000)))
+
+        self.__group_commit = GroupCommit(
+            self._write, float(os.getenv('HBNB_FILE_COMMIT_WINDOW', 0)))
+
+        self.__write_behind = None
+        if write_behind:
+            self.__write_behind = WriteBehind(
+                self.__group_commit.commit,
+                float(os.getenv('HBNB_FILE_WRITE_BEHIND_MAX_STALENESS', 1)))
+            atexit.register(self.__write_behind.close)
+
+        self.__snapshot_publisher = None
+        if snapshot_publish:
+            self.__snapshot_publisher = WriteBehind(
+                self.publish_snapshot,
+                float(os.getenv('HBNB_FILE_SNAPSHOT_INTERVAL', 1)))
+            atexit.register(self.__snapshot_publisher.close)
+
+    def all(self, cls=None, load=()):
         """
         Retrieve all objects stored in the storage instance.
 
@@ -23,22 +183,46 @@ class FileStorage(Storage):
         Parameters:
             cls (class, optional): The class type to filter the objects.
             If not provided, returns all objects regardless of class type.
+            load (Iterable[str] | dict[str, str], optional): Relationships
+                to load with the objects in DBStorage. Ignored: the
+                related objects are found through the foreign key
+                indexes, a dictionary lookup each.
 
         Returns:
-            dict or None: A dictionary containing all objects if cls is None.
-                If cls is provided, and it exists in the stored classes,
-                returns a dictionary containing objects of the specified
-                class type. Returns None if cls is provided but not found in
-                the stored classes.
+            Mapping: A read-only mapping of all objects by key if cls is
+                None. If cls is provided, and it exists in the stored
+                classes, a read-only mapping of the objects of the
+                specified class type. An empty dictionary if cls is
+                provided but not found in the stored classes.
+                The mappings are point-in-time snapshots that later
+                changes to the storage don't alter.
         """
         if not cls:
-            return self.__objects
+            self.__layout.load_classes(*self.__class_map)
+            return self.__layout.view_all()
 
         if cls not in self.get_classes():
             return {}
 
-        return {key: obj for key, obj in self.__objects.items()
-                if obj.__class__ == cls}
+        self.__layout.load_classes(cls.__name__)
+        return self.__layout.objects_of(cls.__name__)
+
+    def iter_all(self, cls=None, batch_size=1000):
+        """
+        Iterates over the objects of a class, or of all classes, one
+        class at a time, without copying them: the objects are already in
+        memory, or mapped from the snapshot, so batch_size is ignored.
+        Parameters:
+            cls (class, optional): the class of the objects, None for every
+                class
+            batch_size (int, optional): the number of objects DBStorage
+                fetches at a time
+        Returns:
+            A generator of the objects (generator)
+        """
+        classes = self.get_classes() if cls is None else (cls,)
+        for _class in classes:
+            yield from self.all(_class).values()
 
     def new(self, obj):
         """Adds a new object to the storage.
@@ -49,36 +233,310 @@ class FileStorage(Storage):
         if not obj or type(obj) not in self.get_classes():
             return
 
+        self._check_writable()
+        self.__layout.load_classes(obj.__class__.__name__)
+
         key = self._get_obj_key(obj.__class__.__name__, obj.id)
-        self.__objects[key] = obj
+        with self._writing():
+            self._add(key, obj)
+
+    def new_many(self, objs):
+        """
+        Adds objects to the storage and saves them with a single write,
+        taking the write lock once for the whole batch. The objects are
+        added as a transaction, all or none.
+
+        Parameters:
+            objs (Iterable[BaseModel]): the objects to add
+
+        Raises:
+            ValueError: If the storage is a read-only snapshot.
+            TimeoutError: If the file lock isn't granted in time.
+        """
+        objs = [obj for obj in objs
+                if obj and type(obj) in self.get_classes()]
+        if not objs:
+            return
+
+        self._check_writable()
+        self.__layout.load_classes(*{obj.__class__.__name__ for obj in objs})
+
+        with self.transaction(), self._writing():
+            for obj in objs:
+                self._add(
+                    self._get_obj_key(obj.__class__.__name__, obj.id), obj)
 
     def save(self):
-        """Serializes objects to JSON and saves to file"""
-        serialized_objects = {
-            key: obj.to_dict()
-            for key, obj in self.__objects.items()
-        }
+        """
+        Serializes objects to JSON and saves to file
+
+        The JSON text of every object is cached between saves, so only
+        the objects that are new or changed since the last save are
+        serialized again. In sharded mode only the files of the classes
+        with new, changed or deleted objects are rewritten.
+
+        In journal mode only the changes made since the last save are
+        appended to the journal, and the whole file is rewritten only when
+        the journal has to be compacted.
+
+        Writes are durable: the file is replaced atomically and fsynced.
+        Concurrent calls from several threads are grouped into a single
+        write, optionally waiting HBNB_FILE_COMMIT_WINDOW seconds for more
+        callers to join, and every caller returns once its group is
+        durable.
+
+        Objects changed and saved by other processes since the storage
+        read or wrote the file are merged in first, the changes made here
+        taking precedence.
+
+        In write-behind mode the write is only requested, see flush().
+        Inside a transaction the write is left to the end of the
+        transaction.
+
+        A read-only snapshot storage has nothing to save.
+
+        Raises:
+            TimeoutError: If the file lock isn't granted in time.
+        """
+        if not self.__layout.writable or self._in_transaction():
+            return
+
+        if self.__write_behind:
+            self.__write_behind.request()
+            return
+
+        self.__group_commit.commit()
+
+    @contextmanager
+    def transaction(self):
+        """
+        Makes the changes of a with block one unit of work: they are saved
+        with a single write when the block ends, or undone if it raises.
+
+        Changes made by other threads wait for the end of the block, while
+        their reads don't wait. save() calls inside the block are left to
+        its end, and a transaction opened inside another one joins it.
+
+        Raises:
+            ValueError: If the storage is a read-only snapshot.
+            TimeoutError: If the file lock isn't granted in time when the
+                changes are saved.
+        """
+        self._check_writable()
+
+        if self._in_transaction():
+            yield
+            return
+
+        with self.__write_lock:
+            FileStorage.__undo = []
+            FileStorage.__undo_changed = set()
+            FileStorage.__transaction_thread = threading.get_ident()
+            changes = {key: None if attrs is None else set(attrs)
+                       for key, attrs in self.__changes.items()}
+            deleted = set(self.__deleted)
 
-        with open(self.__file_path, "w") as file:
-            json.dump(serialized_objects, file)
+            try:
+                yield
+            except BaseException:
+                with self._writing():
+                    self._rollback(changes, deleted)
+                raise
+            finally:
+                FileStorage.__undo = None
+                FileStorage.__undo_changed = set()
+                FileStorage.__transaction_thread = None
+
+        if self.__changes or self.__deleted:
+            self.save()
+
+    def flush(self):
+        """
+        Waits until the changes saved so far are written, in write-behind
+        mode, writing them in the calling thread if no write is in
+        progress. save() writes them itself otherwise.
+
+        Raises:
+            TimeoutError: If the file lock isn't granted in time.
+            ValueError: If called inside a transaction, whose changes
+                aren't saved yet and which the writer would wait for.
+        """
+        self._check_outside_transaction("flush()")
+        if self.__write_behind:
+            self.__write_behind.flush()
+
+    def shutdown(self):
+        """
+        Writes the saved changes and the requested snapshot, and stops
+        the background threads of write-behind mode and of the snapshot
+        publisher, which the exit of the interpreter stops otherwise.
+        Later saves and snapshots are written synchronously.
+
+        Raises:
+            TimeoutError: If the file lock isn't granted in time.
+        """
+        for worker in (self.__write_behind, self.__snapshot_publisher):
+            if worker:
+                atexit.unregister(worker.close)
+                worker.close()
+
+    def commit_stats(self):
+        """
+        Returns the statistics of the grouped save() commits
+        Returns:
+            dict: requests, commits, last/max/avg group size and
+                last/avg commit latency in seconds, and the write-behind
+                statistics under "write_behind" in write-behind mode
+        """
+        stats = self.__group_commit.stats()
+        if self.__write_behind:
+            stats["write_behind"] = self.__write_behind.stats()
+
+        return stats
+
+    def _write(self):
+        """
+        Writes the changes made since the last write to disk, either by
+        appending them to the journal or by replacing the file
+
+        Other writers wait for the write lock until the file is written,
+        but readers only copy the indexes while the objects written by
+        other processes are merged into them, not while the file is
+        encoded, synced and renamed.
+        """
+        with self.__write_lock:
+            changes, deleted = self.__changes, self.__deleted
+            self._clear_changes()
+
+            try:
+                with self.__lock.exclusive():
+                    self.__layout.write(changes, deleted)
+            except BaseException:
+                self._restore_changes(changes, deleted)
+                raise
+
+            if self.__snapshot_publisher:
+                self.__snapshot_publisher.request()
+
+    def publish_snapshot(self):
+        """
+        Publishes a read-only snapshot of every object for the storages
+        opened with HBNB_FILE_SNAPSHOT=1
+
+        The snapshot is written to a new file renamed over the previous
+        one, so readers switch from a whole snapshot to the next. Changes
+        wait for it, but reads don't.
+
+        Raises:
+            TimeoutError: If the file lock isn't granted in time.
+        """
+        self.__layout.load_classes(*self.__class_map)
+        with self.__write_lock, self.__lock.exclusive():
+            Snapshot.write(
+                self.__snapshot_path,
+                ((key, obj.to_dict()) for key, obj in self.__objects.items()
+                 if obj),
+                FOREIGN_KEYS)
 
     def reload(self):
-        """Deserializes JSON from file and reloads objects"""
+        """
+        Deserializes JSON from file and reloads objects
 
-        if not os.path.isfile(self.__file_path):
+        In journal mode the journal is replayed over the file contents.
+        In sharded mode the loaded objects are dropped, every class being
+        loaded again on first use.
+        In snapshot mode the snapshot is reopened only if a new one was
+        published.
+        In write-behind mode the saved changes are written first.
+
+        Raises:
+            TimeoutError: If the file lock isn't granted in time.
+            ValueError: If called inside a transaction.
+        """
+        if not self.__layout.writable:
+            self.__layout.reload()
             return
 
-        try:
-            with open(self.__file_path, "r") as file:
-                deserialized_objects = json.load(file)
+        self._check_outside_transaction("reload()")
+        self.flush()
+        with self._writing(), self.__lock.shared():
+            self.__layout.reload()
 
-                FileStorage.__objects = {
-                    key: self._deserialize(dictionary)
-                    for key, dictionary in deserialized_objects.items()
-                }
+    def _check_writable(self):
+        """
+        Checks that the storage can be changed
+        Raises:
+            ValueError: If the storage is a read-only snapshot.
+        """
+        if not self.__layout.writable:
+            raise ValueError("The storage is a read-only snapshot "
+                             "(HBNB_FILE_SNAPSHOT=1)")
 
-        except (OSError, json.JSONDecodeError):
-            pass
+    def _in_transaction(self):
+        """
+        Tells whether the calling thread is inside a transaction
+        Returns:
+            True if it is, False otherwise
+        """
+        return self.__transaction_thread == threading.get_ident()
+
+    def _check_outside_transaction(self, operation):
+        """
+        Checks that the calling thread isn't inside a transaction, whose
+        changes an operation would discard or wait for
+        Parameters:
+            operation (str): the name of the operation
+        Raises:
+            ValueError: If it is.
+        """
+        if self._in_transaction():
+            raise ValueError(f"{operation} can't be called inside a "
+                             "storage transaction")
+
+    def _log_undo(self, operation, key, obj):
+        """
+        Records how to undo a change made inside a transaction
+        Parameters:
+            operation (str): "new", "delete" or "change"
+            key (str): the storage key of the object
+            obj: the object replaced by new(), None if there was none,
+                the object removed by delete(), or the attributes of the
+                object before its first change
+        """
+        if self.__undo is not None and self._in_transaction():
+            self.__undo.append((operation, key, obj))
+
+    def _rollback(self, changes, deleted):
+        """
+        Undoes the changes made inside a transaction, the last ones first
+        Parameters:
+            changes (dict[str, set]): the attributes changed by key when
+                the transaction started
+            deleted (set[str]): the keys deleted when it started
+        """
+        objects = self._writable_objects()
+        for operation, key, value in reversed(self.__undo):
+            current = objects.get(key)
+            if operation == "change":
+                obj, attributes = value
+                if current is obj:
+                    self._unindex(key, obj)
+                obj.__dict__.clear()
+                obj.__dict__.update(attributes)
+                if current is obj:
+                    self._index(key, obj)
+            else:
+                if current:
+                    self._unindex(key, current)
+                    del objects[key]
+                if value:
+                    objects[key] = value
+                    self._index(key, value)
+
+            self._mark_dirty(key)
+
+        FileStorage.__changes = changes
+        FileStorage.__deleted = deleted
 
     def delete(self, obj=None):
         """
@@ -95,8 +553,123 @@ class FileStorage(Storage):
         if not obj or type(obj) not in self.get_classes():
             return
 
+        self._check_writable()
+        self.__layout.load_classes(obj.__class__.__name__)
+
         key = self._get_obj_key(obj.__class__.__name__, obj.id)
-        self.__objects.pop(key, None)
+        with self._writing():
+            self._remove(key)
+
+    def delete_many(self, cls, ids):
+        """
+        Deletes the objects of a class with the given IDs and saves the
+        deletions with a single write, taking the write lock once for the
+        whole batch. The objects are deleted as a transaction, all or
+        none.
+
+        Parameters:
+            cls (class): the class of the objects
+            ids (Iterable[str]): the IDs of the objects; unknown IDs are
+                skipped
+
+        Returns:
+            int: The number of objects deleted.
+
+        Raises:
+            ValueError: If the storage is a read-only snapshot.
+            TimeoutError: If the file lock isn't granted in time.
+        """
+        if cls not in self.get_classes():
+            return 0
+
+        self._check_writable()
+        self.__layout.load_classes(cls.__name__)
+
+        deleted = 0
+        with self.transaction(), self._writing():
+            for _id in ids:
+                key = self._get_obj_key(cls.__name__, _id)
+                if key and self._remove(key):
+                    deleted += 1
+
+        return deleted
+
+    def _add(self, key, obj):
+        """
+        Stores an object under its key, replacing the previous object
+        with that key, the write lock being held. An object stored
+        already is serialized again by the next save if it differs from
+        its last written entry, as changes made in place, such as to a
+        list attribute, aren't tracked
+        Parameters:
+            key (str): the storage key of the object
+            obj (BaseModel): the object to add
+        """
+        previous = self.__objects.get(key)
+        if previous is obj:
+            changed_attrs = self._changed_in_place(key, obj)
+            if changed_attrs == set():
+                return
+
+            self.__layout.track(key, obj)
+            if changed_attrs is None:
+                self.__changes.setdefault(key, None)
+            elif self.__changes.get(key, set()) is not None:
+                self.__changes[key] = \
+                    self.__changes.get(key, set()) | changed_attrs
+            self._mark_dirty(key)
+            return
+        if previous:
+            self._unindex(key, previous)
+
+        self._writable_objects()[key] = obj
+        self._index(key, obj)
+        self._log_undo("new", key, previous)
+
+        self.__deleted.discard(key)
+        self.__changes[key] = None
+        self._mark_dirty(key)
+
+    def _changed_in_place(self, key, obj):
+        """
+        Compares a stored object with its last written entry
+        Parameters:
+            key (str): the storage key of the object
+            obj (BaseModel): the object
+        Returns:
+            The names of the attributes that differ (set[str]), or None if
+            the entry isn't cached, the object being changed since it was
+            written or the layout not caching entries
+        """
+        written = self.__fragments.get(key)
+        if written is None:
+            return None
+
+        if type(written) is str:
+            written = json.loads(written[written.index('": ') + 3:])
+
+        current = obj.to_dict()
+        return {attr for attr in current.keys() | written.keys()
+                if current.get(attr) != written.get(attr)}
+
+    def _remove(self, key):
+        """
+        Removes the object stored under a key, the write lock being held
+        Parameters:
+            key (str): the storage key of the object
+        Returns:
+            The removed object, or None if there was none
+        """
+        obj = self._writable_objects().pop(key, None)
+        if obj:
+            self._unindex(key, obj)
+            self._log_undo("delete", key, obj)
+
+            self.__changes.pop(key, None)
+            self.__deleted.add(key)
+            self._mark_dirty(key)
+
+        return obj
 
     def find(self, class_name, _id):
         """
@@ -110,9 +683,49 @@ class FileStorage(Storage):
         if class_name not in self.get_classes_names() or not _id:
             return None
 
+        self.__layout.load_classes(class_name)
         key = self._get_obj_key(class_name, _id)
         return self.__objects.get(key, None)
 
+    def find_many(self, class_name, ids):
+        """
+        Finds and returns the objects of a class with the given IDs, by
+        key lookups
+        Parameters:
+            class_name (str): the name of the class
+            ids (Iterable[str]): the IDs of the objects
+        Returns:
+            The found objects by ID, in the order of the IDs, without the
+            IDs not found (dict)
+        """
+        if class_name not in self.get_classes_names():
+            return {}
+
+        self.__layout.load_classes(class_name)
+        objects = self.__objects
+        found = {}
+        for _id in ids:
+            obj = objects.get(self._get_obj_key(class_name, _id))
+            if obj is not None:
+                found[_id] = obj
+
+        return found
+
+    def exists(self, class_name, _id):
+        """
+        Tells whether an object is stored
+        Parameters:
+            class_name (str): the name of the class
+            _id (str): the ID of the object
+        Returns:
+            True if the object is stored, otherwise False
+        """
+        if class_name not in self.get_classes_names() or not _id:
+            return False
+
+        self.__layout.load_classes(class_name)
+        return self._get_obj_key(class_name, _id) in self.__objects
+
     def find_all(self, class_name=""):
         """
         Finds and returns all objects of a given class
@@ -122,13 +735,14 @@ class FileStorage(Storage):
             A list of objects if found, otherwise an empty list
         """
         if not class_name:
-            return [str(obj) for obj in self.__objects.values()]
+            return [str(obj) for obj in self.all().values()]
 
         if class_name not in self.get_classes_names():
             return []
 
-        return [str(obj) for key, obj in self.__objects.items()
-                if obj.__class__.__name__ == class_name]
+        self.__layout.load_classes(class_name)
+        return [str(obj) for obj in
+                self.__layout.objects_of(class_name).values()]
 
     def update(self, obj=None, **kwargs):
         """
@@ -153,6 +767,54 @@ class FileStorage(Storage):
         for attr, value in kwargs.items():
             setattr(obj, attr, value)
 
+    def update_many(self, cls, ids, values):
+        """
+        Sets the same attribute values on the objects of a class with the
+        given IDs and saves them with a single write, taking the write
+        lock once for the whole batch. The objects are updated as a
+        transaction, all or none.
+
+        Parameters:
+            cls (class): the class of the objects
+            ids (Iterable[str]): the IDs of the objects; unknown IDs are
+                skipped
+            values (dict[str, any]): the new values by attribute name
+
+        Returns:
+            int: The number of objects updated.
+
+        Raises:
+            ValueError: If values holds the id, or if the storage is a
+                read-only snapshot.
+            TimeoutError: If the file lock isn't granted in time.
+        """
+        if cls not in self.get_classes() or not values:
+            return 0
+        if "id" in values:
+            raise ValueError("update_many() can't change the id")
+
+        self._check_writable()
+        self.__layout.load_classes(cls.__name__)
+
+        updated = 0
+        with self.transaction(), self._writing():
+            updated_at = datetime.now()
+            for _id in ids:
+                key = self._get_obj_key(cls.__name__, _id)
+                obj = self.__objects.get(key)
+                if not obj:
+                    continue
+
+                self._log_change(key, obj)
+                old_values = {attr: obj.__dict__.get(attr) for attr in values}
+                for attr, value in values.items():
+                    object.__setattr__(obj, attr, value)
+                object.__setattr__(obj, "updated_at", updated_at)
+                self._track_changes(key, obj, old_values)
+                updated += 1
+
+        return updated
+
     def count(self, class_name):
         """
         Count and returns number of objects of a given class name
@@ -164,8 +826,344 @@ class FileStorage(Storage):
         if not class_name or class_name not in self.get_classes_names():
             return 0
 
-        return sum(1 for key in self.__objects.keys()
-                   if key.startswith(class_name))
+        self.__layout.load_classes(class_name)
+        return self.__layout.count(class_name)
+
+    def _run_query(self, query):
+        """
+        Runs a query: the objects are looked up by ID or through a foreign
+        key index when a condition allows it, the objects of the class
+        being scanned otherwise, and the other conditions are checked on
+        each of them. Missing attributes are None, which matches no
+        condition but equality to None, and sorts first. A query of rows
+        returns named tuples of the attributes of the objects.
+        Parameters:
+            query (Query): the query
+        Returns:
+            The list of the objects, or of the rows of the query (list)
+        Raises:
+            ValueError: If a row attribute isn't a valid field name.
+        """
+        objects, filters = self._query_candidates(query)
+        if filters:
+            objects = (obj for obj in objects
+                       if self._matches(obj, filters))
+
+        if query.order:
+            objects = list(objects)
+            for attrs, descending in reversed(self._sort_passes(query)):
+                objects = self._sorted(objects, attrs, descending)
+
+        start = query.offset_value
+        stop = None if query.limit_value is None \
+            else start + query.limit_value
+        objects = list(islice(objects, start, stop))
+        if not query.fields:
+            return objects
+
+        row = self._row_type(query.cls.__name__, query.fields)
+        try:
+            values = map(operator.attrgetter(*query.fields), objects)
+            if len(query.fields) == 1:
+                values = zip(values)
+            return list(map(row._make, values))
+        except AttributeError:
+            return [row._make(getattr(obj, attr, None)
+                              for attr in query.fields) for obj in objects]
+
+    @classmethod
+    def _row_type(cls, class_name, fields):
+        """
+        Returns the named tuple type of the rows of a class with fields,
+        created on first use
+        Parameters:
+            class_name (str): the name of the class
+            fields (tuple[str]): the names of the attributes of the rows
+        Returns:
+            The named tuple type (type)
+        Raises:
+            ValueError: If a field name isn't a valid one.
+        """
+        row = cls.__row_types.get((class_name, fields))
+        if row is None:
+            row = cls.__row_types[class_name, fields] = namedtuple(
+                f"{class_name}Row", fields)
+
+        return row
+
+    def _page(self, cls, limit, after):
+        """
+        Finds the first objects after a position in (created_at, id)
+        order, scanning the objects of the class and keeping the first
+        ones in a heap of the size of the page
+        Parameters:
+            cls (class): the class of the objects
+            limit (int): the maximum number of objects
+            after (tuple[datetime, str]): the created_at and id of the last
+                object of the previous page, or None
+        Returns:
+            The (created_at, id) position and object pairs (list)
+        """
+        position = operator.attrgetter("created_at", "id")
+        objects = self.all(cls).values()
+        if after:
+            objects = [obj for obj in objects if position(obj) > after]
+
+        return [(position(obj), obj)
+                for obj in heapq.nsmallest(limit, objects, key=position)]
+
+    def _count_query(self, query):
+        """
+        Counts the objects of a query, from the size of the per-class
+        index when it has no condition
+        Parameters:
+            query (Query): the query
+        Returns:
+            The number of objects (int)
+        """
+        if query.filters:
+            objects, filters = self._query_candidates(query)
+            count = sum(1 for obj in objects if self._matches(obj, filters))
+        else:
+            count = self.count(query.cls.__name__)
+
+        count = max(count - query.offset_value, 0)
+        if query.limit_value is not None:
+            count = min(count, query.limit_value)
+
+        return count
+
+    def _query_candidates(self, query):
+        """
+        Picks the objects a query has to check, through the most selective
+        index one of its conditions can use: an ID, then a foreign key.
+        Only non-empty string values are indexed: a condition on any other
+        value is checked on every object of the class
+        Parameters:
+            query (Query): the query
+        Returns:
+            A tuple of the candidate objects (Iterable[BaseModel]) and
+            the conditions left to check on them (tuple)
+        """
+        class_name = query.cls.__name__
+        filters = query.filters
+
+        def usable(attrs):
+            for i, (attr, op, value) in enumerate(filters):
+                if attr in attrs and op in ("==", "in") and all(
+                        _id and type(_id) is str
+                        for _id in (value if op == "in" else (value,))):
+                    return i
+            return None
+
+        i = usable(("id",))
+        if i is None:
+            i = usable(FOREIGN_KEYS)
+        if i is None:
+            return self.all(query.cls).values(), filters
+
+        attr, op, value = filters[i]
+        values = dict.fromkeys(value) if op == "in" else (value,)
+        if attr == "id":
+            objects = list(self.find_many(class_name, values).values())
+        else:
+            objects = list(chain.from_iterable(
+                self.find_related(class_name, attr, _id)
+                for _id in values))
+
+        return objects, filters[:i] + filters[i + 1:]
+
+    def _matches(self, obj, filters):
+        """
+        Tells whether an object meets the conditions of a query; values
+        that can't be ordered against the value of a condition, such as a
+        str against a number, don't meet it
+        Parameters:
+            obj (BaseModel): the object
+            filters (tuple): the (attribute, operator, value) conditions
+        Returns:
+            True if it meets all of them, False otherwise
+        """
+        for attr, op, value in filters:
+            actual = getattr(obj, attr, None)
+            if op == "in":
+                if actual not in value:
+                    return False
+            elif op == "==":
+                if actual != value:
+                    return False
+            elif actual is None:
+                return False
+            else:
+                try:
+                    if not COMPARISONS[op](actual, value):
+                        return False
+                except TypeError:
+                    return False
+
+        return True
+
+    @staticmethod
+    def _sort_passes(query):
+        """
+        Groups the consecutive sort keys of a query sharing a direction,
+        each group being sorted in one pass, the last one first.
+        Parameters:
+            query (Query): the query
+        Returns:
+            A list of (attribute names, descending) tuples (list)
+        """
+        passes = []
+        for attr, descending in query.order:
+            if passes and passes[-1][1] == descending:
+                passes[-1][0].append(attr)
+            else:
+                passes.append(([attr], descending))
+
+        return passes
+
+    @staticmethod
+    def _sorted(objects, attrs, descending):
+        """
+        Sorts objects by attributes, None values first; the attributes are
+        compared as they are unless some are None, missing or of types
+        that can't be compared, in which case the objects are sorted again
+        with a key ordering the values by type first, see _sort_key().
+        Parameters:
+            objects (list): the objects
+            attrs (list[str]): the names of the attributes
+            descending (bool): whether to sort in descending order
+        Returns:
+            The sorted objects (list)
+        """
+        try:
+            return sorted(objects, key=operator.attrgetter(*attrs),
+                          reverse=descending)
+        except (AttributeError, TypeError):
+            pass
+
+        def key(obj):
+            return [FileStorage._sort_key(getattr(obj, attr, None))
+                    for attr in attrs]
+
+        return sorted(objects, key=key, reverse=descending)
+
+    @staticmethod
+    def _sort_key(value):
+        """
+        Returns a sort key of a value comparable with the key of a value
+        of any type: None first, then the numbers, then the other values
+        grouped by type, those that can't be ordered by their repr()
+        Parameters:
+            value (any): the value
+        Returns:
+            The sort key (tuple)
+        """
+        if value is None:
+            return (0, "", 0)
+        if isinstance(value, (int, float)):
+            return (1, "", value)
+        if isinstance(value, (str, datetime)):
+            return (2, type(value).__name__, value)
+
+        return (3, type(value).__name__, repr(value))
+
+    def find_related(self, class_name, foreign_key, _id):
+        """
+        Finds and returns the objects of a given class whose foreign key
+        attribute references the given ID
+        Parameters:
+            class_name (str): the name of the class of the related objects
+            foreign_key (str): the foreign key attribute (e.g. "state_id")
+            _id (str): the ID of the referenced object
+        Returns:
+            A list of objects if found, otherwise an empty list
+        """
+        self.__layout.load_classes(class_name)
+        return list(self.__layout.related(
+            class_name, foreign_key, _id).values())
+
+    def before_change(self, obj):
+        """
+        Remembers the attributes of a stored object before its first
+        change inside a transaction, so they are restored if it rolls
+        back. Changes from other threads wait for the transaction to end.
+        Parameters:
+            obj (BaseModel): the object about to change
+        """
+        if self.__undo is None:
+            return
+
+        key = self._get_obj_key(obj.__class__.__name__,
+                                getattr(obj, "id", None))
+        if self.__objects.get(key) is not obj:
+            return
+
+        with self._writing():
+            if self.__undo is not None and self.__objects.get(key) is obj:
+                self._log_change(key, obj)
+
+    def track_change(self, obj, attr, old_value):
+        """
+        Records an attribute assignment made on a stored object, keeping
+        the foreign key indexes in sync and remembering the attribute as
+        changed for the next save
+        Parameters:
+            obj (BaseModel): the object whose attribute changed
+            attr (str): the name of the changed attribute
+            old_value (any): the value of the attribute before the change
+        """
+        if not self.__layout.writable:
+            return
+
+        key = self._get_obj_key(obj.__class__.__name__, obj.id)
+        if self.__objects.get(key) is not obj:
+            return
+
+        with self._writing():
+            if self.__objects.get(key) is obj:
+                self._track_changes(key, obj, {attr: old_value})
+
+    def _log_change(self, key, obj):
+        """
+        Records the attributes of a stored object before its first change
+        inside a transaction, the write lock being held
+        Parameters:
+            key (str): the storage key of the object
+            obj (BaseModel): the object about to change
+        """
+        if id(obj) not in self.__undo_changed:
+            self.__undo_changed.add(id(obj))
+            self._log_undo("change", key, (obj, dict(obj.__dict__)))
+
+    def _track_changes(self, key, obj, old_values):
+        """
+        Records attribute changes made on a stored object, the write lock
+        being held
+        Parameters:
+            key (str): the storage key of the object
+            obj (BaseModel): the object whose attributes changed
+            old_values (dict[str, any]): the values of the changed
+                attributes before the change, by name
+        """
+        self.__layout.track(key, obj)
+
+        class_name = obj.__class__.__name__
+        for attr, old_value in old_values.items():
+            if attr in FOREIGN_KEYS:
+                self._unrelate(key, class_name, attr, old_value)
+                self._relate(key, class_name, attr,
+                             getattr(obj, attr, None),
+                             self.__layout.index_value(obj))
+
+        self._mark_dirty(key)
+
+        if key not in self.__changes:
+            self.__changes[key] = {"updated_at"}
+
+        changed_attrs = self.__changes[key]
+        if changed_attrs is not None:
+            changed_attrs.update(old_values)
 
     def close(self):
         """
@@ -174,8 +1172,541 @@ class FileStorage(Storage):
         This method is intended to refresh the current instance with the latest
         data from the database, ensuring that any changes made by other
         transactions are reflected in the current instance.
+
+        The files are only stat'ed when no change is pending and they
+        weren't written since they were read, which makes close() cheap
+        after every request. Otherwise, in the JSON format, only the
+        records that differ from the objects in memory are decoded again;
+        the storage is reloaded in the other cases. Unsaved changes are
+        discarded either way, while in write-behind mode the saved ones
+        are written first.
+
+        Raises:
+            ValueError: If called inside a transaction.
+        """
+        if not self.__layout.writable:
+            self.__layout.reload()
+            return
+
+        self._check_outside_transaction("close()")
+        self.flush()
+
+        if not self.__changes and not self.__deleted and \
+                not self.__layout.changed():
+            return
+
+        with self._writing():
+            self.__layout.refresh(bool(self.__changes or self.__deleted))
+
+    def _merge(self, path, keys, pending=None):
+        """
+        Brings objects in line with a file, decoding only the entries that
+        differ from their cached JSON text when the file holds one JSON
+        entry per line
+        Parameters:
+            path (str): the path of the file
+            keys (list[str]): the keys of the objects the file holds
+            pending (dict[str, set], optional): the changes made since
+                the last write, see _merge_entries()
+        Returns:
+            True if the objects were merged, False if the file can't be
+            read, in which case the objects may be partly merged and must
+            be reloaded
+        """
+        try:
+            with open(path, "rb") as file:
+                data = file.read()
+            entries = self._split_entries(data)
+            if entries is None:
+                entries = self.__codec.decode(data)
+        except (OSError, ValueError):
+            return False
+
+        return self._merge_entries(entries, keys, pending)
+
+    def _merge_entries(self, entries, keys, pending=None):
+        """
+        Brings objects in line with the entries of a file
+
+        Objects changed since the last write keep the attributes changed
+        here and take the others from the file, so processes changing
+        different attributes of an object don't undo each other. New,
+        deleted and wholly rewritten objects are kept as they are.
+        Parameters:
+            entries (dict[str, str | dict]): the JSON text of the entries,
+                or their dictionaries, by key
+            keys (list[str]): the keys of the objects the entries cover
+            pending (dict[str, set], optional): the attributes changed
+                since the last write by key, None for the objects new,
+                deleted or changed whole
+        Returns:
+            True if the objects were merged, False if an entry can't be
+            decoded
+        """
+        pending = pending or {}
+        objects = self._writable_objects()
+        for key, entry in entries.items():
+            if self.__fragments.get(key) == entry or \
+                    key in pending and pending[key] is None:
+                continue
+
+            dictionary = entry
+            if type(entry) is str:
+                try:
+                    dictionary = json.loads(entry[entry.index('": ') + 3:])
+                except ValueError:
+                    return False
+
+            obj = self._deserialize(dictionary)
+            if key in pending:
+                previous = objects.get(key)
+                if obj and previous:
+                    self._unindex(key, previous)
+                    self._merge_attributes(previous, obj, pending[key])
+                    self._index(key, previous)
+                continue
+
+            previous = objects.pop(key, None)
+            if previous:
+                self._unindex(key, previous)
+            self._mark_dirty(key)
+
+            if obj:
+                objects[key] = obj
+                self._index(key, obj)
+                if type(entry) is str:
+                    self.__fragments[key] = entry
+                    self.__dirty.discard(key)
+
+        for key in keys:
+            if key not in entries and key not in pending:
+                obj = objects.pop(key, None)
+                self._mark_dirty(key)
+                if obj:
+                    self._unindex(key, obj)
+
+        return True
+
+    @staticmethod
+    def _merge_attributes(obj, other, changed_attrs):
+        """
+        Copies onto an object the attributes of another copy of it, read
+        from a file, except the attributes changed here, without tracking
+        them as changes
+        Parameters:
+            obj (BaseModel): the object
+            other (BaseModel): the copy read from the file
+            changed_attrs (set[str]): the names of the attributes changed
+                here since the last write
+        """
+        for name, value in other.__dict__.items():
+            if name not in changed_attrs and name[1:] not in changed_attrs:
+                obj.__dict__[name] = value
+
+    def _record_versions(self, *paths):
+        """
+        Records the current version of files, as read or written by the
+        storage
+        Parameters:
+            paths (str): the paths of the files
+        """
+        for path in paths:
+            self.__versions[path] = file_version(path)
+
+    def _files_changed(self, *paths):
+        """
+        Tells whether files changed since their versions were recorded
+        Parameters:
+            paths (str): the paths of the files
+        Returns:
+            True if one of them changed, False otherwise
+        """
+        return any(file_version(path) != self.__versions.get(path, False)
+                   for path in paths)
+
+    def _forget_versions(self, *paths):
+        """
+        Forgets the recorded versions of files, as if the storage never
+        read them
+        Parameters:
+            paths (str): the paths of the files, none for every file
+        """
+        if not paths:
+            FileStorage.__versions = {}
+
+        for path in paths:
+            self.__versions.pop(path, None)
+
+    def _write_file(self, path):
+        """
+        Writes every object to a file, serializing only the objects new or
+        changed since they were last written
+        Parameters:
+            path (str): the path of the file
+        """
+        dirty = self._take_dirty()
+        fragments = self.__fragments
+        try:
+            for key in list(dirty if fragments else self.__objects):
+                obj = self.__objects.get(key)
+                if obj:
+                    fragments[key] = self._serialize(key, obj)
+
+            write_atomically(path, self.__codec.encode(fragments.values()))
+            self._record_versions(path)
+        except BaseException:
+            self._restore_dirty(dirty)
+            raise
+
+    def _write_class_file(self, path, class_name):
+        """
+        Writes the objects of a class to a file, serializing only the
+        objects new or changed since they were last written
+        Parameters:
+            path (str): the path of the file
+            class_name (str): the name of the class
+        """
+        fragments = self.__fragments
+        class_fragments = []
+        for key, obj in self._class_index(class_name).items():
+            if key not in fragments:
+                fragments[key] = self._serialize(key, obj)
+            class_fragments.append(fragments[key])
+
+        write_atomically(path, self.__codec.encode(class_fragments))
+        self._record_versions(path)
+
+    def _split_entries(self, data):
+        """
+        Splits the content of a JSON file holding one "key": {...} entry
+        per line into its entries
+        Parameters:
+            data (bytes): the content of the file
+        Returns:
+            The JSON text of the entries by key (dict[str, str]), or None
+            if the content isn't in the JSON line layout
+        """
+        if self.__codec.name != "json":
+            return None
+
+        lines = data.decode().split("\n")
+        if len(lines) < 2 or lines[0] != "{" or lines[-1] != "}":
+            return None
+
+        entries = {}
+        for line in lines[1:-1]:
+            fragment = line[:-1] if line.endswith(",") else line
+            if not fragment:
+                continue
+
+            end = fragment.find('": ')
+            key = fragment[1:end]
+            if end < 0 or fragment[0] != '"' or "\\" in key or '"' in key:
+                return None
+            entries[key] = fragment
+
+        return entries
+
+    def _index(self, key, obj, indexes=None):
+        """
+        Adds an object to the per-class and foreign key indexes, as the
+        value the layout gives it: the object, or None in lazy mode
+        Parameters:
+            key (str): the storage key of the object
+            obj (BaseModel): the object to index
+            indexes (tuple[dict, dict], optional): new per-class and
+                foreign key indexes being built, instead of the current
+                ones
+        """
+        class_objects, relations = indexes or (
+            self.__class_objects, self.__relations)
+        value = self.__layout.index_value(obj)
+        class_name = obj.__class__.__name__
+        self._entry(class_objects, class_name)[key] = value
+
+        for attr in FOREIGN_KEYS:
+            _id = getattr(obj, attr, None)
+            if _id:
+                self._relate(key, class_name, attr, _id, value, relations)
+
+    def _index_record(self, key, foreign_keys, indexes=None):
+        """
+        Adds the key of an object that isn't loaded to the indexes
+        Parameters:
+            key (str): the storage key of the object
+            foreign_keys (dict[str, str]): the foreign key values of
+                the object
+            indexes (tuple[dict, dict], optional): new per-class and
+                foreign key indexes being built, instead of the current
+                ones
+        """
+        class_objects, relations = indexes or (
+            self.__class_objects, self.__relations)
+        class_name = key.split(".", 1)[0]
+        self._entry(class_objects, class_name)[key] = None
+
+        for attr, _id in foreign_keys.items():
+            self._relate(key, class_name, attr, _id, None, relations)
+
+    def _unindex(self, key, obj):
         """
-        self.reload()
+        Removes an object from the per-class and foreign key indexes
+        Parameters:
+            key (str): the storage key of the object
+            obj (BaseModel): the object to remove
+        """
+        class_name = obj.__class__.__name__
+        class_objects = self.__class_objects.get(class_name)
+        if class_objects and key in class_objects:
+            self._entry(self.__class_objects, class_name).pop(key, None)
+
+        for attr in FOREIGN_KEYS:
+            self._unrelate(key, class_name, attr, getattr(obj, attr, None))
+
+    def _relate(self, key, class_name, attr, _id, value, relations=None):
+        """
+        Adds an object to the foreign key index of one of its attributes
+        Parameters:
+            key (str): the storage key of the object
+            class_name (str): the class name of the object
+            attr (str): the foreign key attribute
+            _id (str): the ID referenced by the attribute
+            value (BaseModel): the object, or None in lazy mode
+            relations (dict, optional): a new foreign key index being
+                built, instead of the current one
+        """
+        if not _id or type(_id) is not str:
+            return
+
+        if relations is None:
+            relations = self.__relations
+        related = relations.setdefault((class_name, attr), {})
+        self._entry(related, _id)[key] = value
+
+    def _unrelate(self, key, class_name, attr, _id):
+        """
+        Removes an object from the foreign key index of one of its attributes
+        Parameters:
+            key (str): the storage key of the object
+            class_name (str): the class name of the object
+            attr (str): the foreign key attribute
+            _id (str): the ID referenced by the attribute
+        """
+        related = self.__relations.get((class_name, attr))
+        if not related or type(_id) is not str or _id not in related:
+            return
+
+        children = related[_id]
+        if key not in children:
+            return
+        if len(children) == 1:
+            del related[_id]
+            return
+
+        self._entry(related, _id).pop(key)
+
+    @contextmanager
+    def _writing(self):
+        """
+        Holds the write lock of the threads of the process for the
+        duration of a with block, during which readers copy the indexes
+        they read instead of sharing them
+        """
+        with self.__write_lock:
+            FileStorage.__writers += 1
+            try:
+                yield
+            finally:
+                FileStorage.__writers -= 1
+
+    def _pin(self, index):
+        """
+        Shares an index dictionary with a reader, which makes writers
+        change a copy of it from then on
+
+        The dictionary is marked as shared before checking for a write in
+        progress, and writers check the mark after announcing their
+        write, so either the reader sees the write and copies the
+        dictionary itself, or the writer sees the mark.
+        Parameters:
+            index (dict): the dictionary, of the current objects or indexes
+        Returns:
+            The dictionary, or a copy of it while a write is in progress
+        """
+        self.__shared.add(id(index))
+        if self.__writers:
+            return dict(index)
+
+        return index
+
+    def _entry(self, container, key):
+        """
+        Returns a dictionary of an index to change it, created if missing
+        and replaced by a copy first if readers share it
+        Parameters:
+            container (dict[any, dict]): the index holding the dictionary
+            key (any): the key of the dictionary in the index
+        Returns:
+            The dictionary to change (dict)
+        """
+        index = container.get(key)
+        if index is None:
+            index = container[key] = {}
+        elif id(index) in self.__shared:
+            self.__shared.discard(id(index))
+            index = container[key] = dict(index)
+
+        return index
+
+    def _writable_objects(self):
+        """
+        Returns the mapping of the objects to change it, replaced by a
+        copy first if readers share it
+        Returns:
+            The mapping of objects by key
+        """
+        objects = self.__objects
+        if id(objects) in self.__shared:
+            self.__shared.discard(id(objects))
+            objects = FileStorage.__objects = dict(objects)
+
+        return objects
+
+    def _publish(self, objects, class_objects, relations):
+        """
+        Replaces the objects and indexes by new ones built aside, so
+        readers see the previous generation or the new one as a whole
+        Parameters:
+            objects (Mapping): the objects by key
+            class_objects (dict): the per-class index
+            relations (dict): the foreign key index
+        """
+        self.__shared.clear()
+        FileStorage.__objects, FileStorage.__class_objects, \
+            FileStorage.__relations = objects, class_objects, relations
+
+    def _objects(self):
+        """
+        Returns the current mapping of the objects, for the layout
+        Returns:
+            The mapping of objects by key
+        """
+        return self.__objects
+
+    def _class_index(self, class_name):
+        """
+        Returns the index entry of the objects of a class
+        Parameters:
+            class_name (str): the name of the class
+        Returns:
+            The objects of the class by key (dict)
+        """
+        return self.__class_objects.get(class_name, {})
+
+    def _related_index(self, class_name, foreign_key):
+        """
+        Returns the foreign key index entry of a class
+        Parameters:
+            class_name (str): the name of the class
+            foreign_key (str): the foreign key attribute
+        Returns:
+            The objects of the class by key, by referenced ID (dict)
+        """
+        return self.__relations.get((class_name, foreign_key), {})
+
+    def _fragments(self):
+        """
+        Returns the cached JSON text of the objects, to change it
+        Returns:
+            The JSON text of the objects by key (dict[str, str])
+        """
+        return self.__fragments
+
+    def _reset_fragments(self, fragments=None):
+        """
+        Replaces the cached JSON text of the objects, after a reload
+        Parameters:
+            fragments (dict[str, str], optional): the JSON text of the
+                objects read by key, None if there is none
+        """
+        FileStorage.__fragments = fragments or {}
+        FileStorage.__dirty = set()
+
+    def _dirty_keys(self):
+        """
+        Returns the keys of the objects changed since they were written
+        Returns:
+            The keys (set[str])
+        """
+        return self.__dirty
+
+    def _take_dirty(self):
+        """
+        Takes the keys of the objects changed since they were written,
+        which a write is about to write
+        Returns:
+            The keys (set[str])
+        """
+        dirty = self.__dirty
+        FileStorage.__dirty = set()
+        return dirty
+
+    def _restore_dirty(self, keys):
+        """
+        Puts back the keys taken by a write that failed
+        Parameters:
+            keys (set[str]): the keys
+        """
+        self.__dirty.update(keys)
+
+    def _mark_dirty(self, key):
+        """
+        Drops the cached JSON text of an object so the next save
+        serializes it again
+        Parameters:
+            key (str): the storage key of the object
+        """
+        self.__fragments.pop(key, None)
+        self.__dirty.add(key)
+
+    def _clear_changes(self):
+        """Forgets the changes made since the last save"""
+        FileStorage.__changes = {}
+        FileStorage.__deleted = set()
+
+    def _restore_changes(self, changes, deleted):
+        """
+        Puts back changes taken by a write that failed, below the changes
+        made since
+        Parameters:
+            changes (dict[str, set]): attributes changed by key
+            deleted (set[str]): keys of the deleted objects
+        """
+        for key, changed_attrs in changes.items():
+            if key in self.__deleted:
+                continue
+
+            current = self.__changes.get(key, set())
+            if current is None or changed_attrs is None:
+                self.__changes[key] = None
+            else:
+                self.__changes[key] = current | changed_attrs
+
+        for key in deleted:
+            if key not in self.__changes:
+                self.__deleted.add(key)
+
+    def _serialize(self, key, obj):
+        """
+        Serializes an object into its fragment of the file, its "key": {...}
+        entry in JSON
+        Parameters:
+            key (str): the storage key of the object
+            obj (BaseModel): the object to serialize
+        Returns:
+            The JSON text of the entry (str)
+        """
+        return self.__codec.fragment(key, obj.to_dict())
 
     def _deserialize(self, dictionary):
         """
@@ -189,12 +1720,8 @@ class FileStorage(Storage):
         if dictionary is None:
             return None
 
-        class_name = dictionary.get("__class__", None)
-        if not class_name:
-            return None
-
-        _class = self.get_class(class_name)
+        _class = self.__class_map.get(dictionary.get("__class__", None))
         if not _class:
             return None
 
-        return _class(**dictionary)
+        return _class.from_dict(dictionary)
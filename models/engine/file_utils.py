@@ -0,0 +1,106 @@
+#!/usr/bin/python3
+"""
+This module provides helper functions for durable file writes.
+"""
+
+import os
+from contextlib import contextmanager
+
+
+def write_atomically(path, data):
+    """
+    Replaces the content of a file so that a crash leaves either the old
+    or the new content, never a truncated file.
+
+    Parameters:
+        path (str): the path of the file to replace
+        data (str | bytes): the new content of the file
+    """
+    mode = "wb" if isinstance(data, bytes) else "w"
+
+    with open_atomically(path, mode) as file:
+        file.write(data)
+
+
+@contextmanager
+def open_atomically(path, mode="w"):
+    """
+    Opens a temporary file to be written in place of a file.
+
+    When the block exits normally, the temporary file is fsynced, renamed
+    over the target, and the rename is made durable by fsyncing the
+    directory. When it raises, the target is left untouched.
+
+    Parameters:
+        path (str): the path of the file to replace
+        mode (str): "w" or "wb"
+
+    Yields:
+        file: the temporary file opened for writing
+    """
+    temp_path = f"{path}.tmp"
+
+    with open(temp_path, mode) as file:
+        yield file
+        file.flush()
+        os.fsync(file.fileno())
+
+    os.replace(temp_path, path)
+    fsync_directory(path)
+
+
+def append_durably(path, data):
+    """
+    Appends data to a file and fsyncs it.
+
+    Parameters:
+        path (str): the path of the file to append to
+        data (str): the data to append
+    """
+    with open(path, "a") as file:
+        file.write(data)
+        file.flush()
+        os.fsync(file.fileno())
+
+
+def fsync_directory(path):
+    """
+    Fsyncs the directory containing a file, making a rename or
+    creation of the file durable.
+
+    Parameters:
+        path (str): the path of a file in the directory
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def file_version(path):
+    """
+    Returns the version of a file, which changes whenever the file is
+    written or replaced.
+
+    Parameters:
+        path (str | int): the path or the descriptor of the file
+
+    Returns:
+        tuple: the inode, modification time and size of the file, or None
+            if it doesn't exist
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+
+    return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
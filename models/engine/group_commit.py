@@ -0,0 +1,117 @@
+#!/usr/bin/python3
+"""
+GroupCommit module
+
+This module defines the GroupCommit class, which coalesces concurrent
+commit requests into a single physical write.
+
+The first thread to request a commit becomes the leader of a group: it
+optionally waits for a short window so that more requests can join, then
+performs one write covering every request made until then. Threads that
+request a commit while a write is in progress wait and are covered by
+the next group. Every caller returns only once a write that started
+after its request has completed.
+"""
+
+import threading
+import time
+
+
+class GroupCommit:
+    """GroupCommit class - Coalesces concurrent commits into groups"""
+
+    def __init__(self, write, window=0.0):
+        """
+        Initializes a group commit around a write function.
+
+        Parameters:
+            write (callable): performs one durable write of the current
+                state; called without arguments by the group leader
+            window (float): seconds the leader waits for more requests
+                to join its group before writing
+        """
+        self.__write = write
+        self.__window = window
+        self.__condition = threading.Condition()
+        self.__requested = 0
+        self.__durable = 0
+        self.__writing = False
+
+        self.__commits = 0
+        self.__max_group_size = 0
+        self.__last_group_size = 0
+        self.__total_latency = 0.0
+        self.__last_latency = 0.0
+
+    def commit(self):
+        """
+        Requests a commit and blocks until it is durable.
+
+        Raises:
+            Exception: Any exception raised by the write of the group
+                this call leads. Followers of a failed group retry in a
+                new group.
+        """
+        with self.__condition:
+            self.__requested += 1
+            ticket = self.__requested
+
+            while self.__writing and self.__durable < ticket:
+                self.__condition.wait()
+
+            if self.__durable >= ticket:
+                return
+
+            self.__writing = True
+
+        try:
+            if self.__window:
+                time.sleep(self.__window)
+
+            with self.__condition:
+                target = self.__requested
+
+            start = time.perf_counter()
+            self.__write()
+            latency = time.perf_counter() - start
+        except BaseException:
+            with self.__condition:
+                self.__writing = False
+                self.__condition.notify_all()
+            raise
+
+        with self.__condition:
+            group_size = target - self.__durable
+            self.__durable = target
+            self.__writing = False
+
+            self.__commits += 1
+            self.__last_group_size = group_size
+            self.__max_group_size = max(self.__max_group_size, group_size)
+            self.__last_latency = latency
+            self.__total_latency += latency
+
+            self.__condition.notify_all()
+
+    def stats(self):
+        """
+        Returns the group commit statistics.
+
+        Returns:
+            dict: requests (commit calls), commits (physical writes),
+                last/max/avg group size and last/avg commit latency in
+                seconds.
+        """
+        with self.__condition:
+            commits = self.__commits
+            return {
+                "requests": self.__requested,
+                "commits": commits,
+                "last_group_size": self.__last_group_size,
+                "max_group_size": self.__max_group_size,
+                "avg_group_size":
+                    self.__durable / commits if commits else 0.0,
+                "last_commit_latency": self.__last_latency,
+                "avg_commit_latency":
+                    self.__total_latency / commits if commits else 0.0,
+            }
@@ -0,0 +1,112 @@
+#!/usr/bin/python3
+"""
+IdentityCache module
+
+This module defines the IdentityCache class, which the mappings decoding
+objects on access, LazyObjects and SnapshotObjects, keep them in.
+
+The most recently used objects are kept in a cache bounded by their total
+size, every object weighing the size given when it is cached: the size
+of its record, or 1 to bound the number of objects. Objects that are
+still referenced elsewhere keep their identity after they leave the
+cache, so they are found again instead of being decoded twice. Reader
+threads share a cache: lookups don't wait, while the changes to the
+cache are made one thread at a time.
+"""
+
+import threading
+import weakref
+from collections import OrderedDict
+
+
+class IdentityCache:
+    """IdentityCache class - Bounded LRU cache over a weak identity map"""
+
+    def __init__(self, max_size):
+        """
+        Initializes an empty cache.
+
+        Parameters:
+            max_size (int): the maximum total size of the cached objects
+        """
+        self.__max_size = max_size
+        self.__cache = OrderedDict()
+        self.__size = 0
+        self.__live = weakref.WeakValueDictionary()
+        self.__lock = threading.Lock()
+
+    def get(self, key):
+        """
+        Returns the object of a key, marking it as the most recently used.
+
+        Parameters:
+            key (str): the storage key of the object
+
+        Returns:
+            BaseModel: The object, or None if it isn't cached and no
+                longer referenced elsewhere.
+        """
+        entry = self.__cache.get(key)
+        if entry is None:
+            return self.__live.get(key)
+
+        try:
+            self.__cache.move_to_end(key)
+        except KeyError:
+            pass
+
+        return entry[0]
+
+    def put(self, key, obj, size=1):
+        """
+        Caches an object, evicting the least recently used ones past the
+        maximum size.
+
+        Parameters:
+            key (str): the storage key of the object
+            obj (BaseModel): the object
+            size (int): the weight of the object in the cache
+        """
+        with self.__lock:
+            self._uncache(key)
+            self.__live[key] = obj
+            self.__cache[key] = (obj, size)
+            self.__size += size
+
+            while self.__size > self.__max_size and self.__cache:
+                _, (_, evicted_size) = self.__cache.popitem(last=False)
+                self.__size -= evicted_size
+
+    def keep(self, key, obj):
+        """
+        Gives an object held elsewhere the identity of a key, without
+        caching it.
+
+        Parameters:
+            key (str): the storage key of the object
+            obj (BaseModel): the object
+        """
+        self.__live[key] = obj
+
+    def discard(self, key):
+        """
+        Forgets the object of a key.
+
+        Parameters:
+            key (str): the storage key of the object
+        """
+        with self.__lock:
+            self.__live.pop(key, None)
+            self._uncache(key)
+
+    def _uncache(self, key):
+        """
+        Removes an object from the cache, keeping its identity, the lock
+        being held.
+
+        Parameters:
+            key (str): the storage key of the object
+        """
+        entry = self.__cache.pop(key, None)
+        if entry:
+            self.__size -= entry[1]
@@ -0,0 +1,156 @@
+#!/usr/bin/python3
+"""
+Journal module
+
+This module defines the Journal class, an append-only log of the
+mutations applied to a FileStorage since its last snapshot.
+
+Each line of the journal is a JSON record of one of the forms:
+    {"op": "new", "key": "<key>", "data": {<full object dict>}}
+    {"op": "update", "key": "<key>", "data": {<changed attributes>}}
+    {"op": "delete", "key": "<key>"}
+
+Records only ever assign absolute values, so replaying a journal over a
+snapshot that already contains some of its records yields the same state.
+
+An append torn by a crash leaves a last line without its newline, or
+that doesn't decode. The journal is cut back to the end of the last
+valid record when it is replayed, and before every append, so later
+records never follow a torn one.
+"""
+
+import json
+import os
+
+from models.engine.file_utils import append_durably
+
+
+class Journal:
+    """Journal class - Append-only log of storage mutations"""
+
+    def __init__(self, path):
+        """
+        Initializes a journal backed by the given file.
+
+        Parameters:
+            path (str): the path of the journal file
+        """
+        self.__path = path
+
+    @property
+    def path(self):
+        """str: the path of the journal file"""
+        return self.__path
+
+    def append(self, records):
+        """
+        Appends records to the end of the journal and fsyncs it
+
+        Parameters:
+            records (list[dict]): the records to append
+        """
+        if not records:
+            return
+
+        self._trim()
+        lines = "".join(json.dumps(record) + "\n" for record in records)
+        append_durably(self.__path, lines)
+
+    def replay(self, dictionaries):
+        """
+        Applies the journal records to a dictionary of serialized objects
+
+        Replay stops at the first record that is incomplete or can't be
+        decoded, which is how a record torn by a crash in the middle of an
+        append shows up, and the journal is cut back to the end of the
+        record before it.
+
+        Parameters:
+            dictionaries (dict[str, dict]): serialized objects by key,
+                updated in place
+        """
+        if not os.path.isfile(self.__path):
+            return
+
+        records, end = self._records()
+        for record in records:
+            self._apply(record, dictionaries)
+
+        if end < self.size():
+            os.truncate(self.__path, end)
+
+    def size(self):
+        """
+        Returns the size of the journal in bytes
+
+        Returns:
+            int: the journal size, 0 if it doesn't exist
+        """
+        try:
+            return os.path.getsize(self.__path)
+        except OSError:
+            return 0
+
+    def truncate(self):
+        """Discards every record of the journal"""
+        if os.path.isfile(self.__path):
+            open(self.__path, "w").close()
+
+    def _records(self):
+        """
+        Reads the valid records of the journal, up to the first one that
+        is incomplete or can't be decoded
+
+        Returns:
+            tuple[list[dict], int]: the records, and the offset of the end
+                of the last one
+        """
+        records = []
+        offset = 0
+        with open(self.__path, "rb") as file:
+            for line in file:
+                if not line.endswith(b"\n"):
+                    break
+
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    break
+
+                offset += len(line)
+
+        return records, offset
+
+    def _trim(self):
+        """
+        Cuts a torn record off the end of the journal, which must end with
+        a newline unless it is empty
+        """
+        try:
+            with open(self.__path, "rb") as file:
+                file.seek(-1, os.SEEK_END)
+                if file.read(1) == b"\n":
+                    return
+        except OSError:
+            return
+
+        os.truncate(self.__path, self._records()[1])
+
+    @staticmethod
+    def _apply(record, dictionaries):
+        """
+        Applies a single record to a dictionary of serialized objects
+
+        Parameters:
+            record (dict): the record to apply
+            dictionaries (dict[str, dict]): serialized objects by key
+        """
+        op = record.get("op")
+        key = record.get("key")
+
+        if op == "new":
+            dictionaries[key] = record.get("data", {})
+        elif op == "update" and key in dictionaries:
+            dictionaries[key].update(record.get("data", {}))
+        elif op == "delete":
+            dictionaries.pop(key, None)
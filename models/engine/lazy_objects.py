@@ -0,0 +1,267 @@
+#!/usr/bin/python3
+"""
+LazyObjects module
+
+This module defines the LazyObjects mapping used by FileStorage in lazy
+mode, and ObjectsView, a read-only view over some of its keys.
+
+LazyObjects keeps only a directory of key -> (offset, length) of every
+record of the JSON file in memory. Objects are decoded from the file on
+first access and kept in an IdentityCache bounded by the number of
+bytes of the records it holds, and new or changed objects are pinned in
+memory until the next write.
+
+The JSON file must hold one record per line, the layout FileStorage
+writes:
+    {
+    "<key>": {...},
+    "<key>": {...}
+    }
+"""
+
+import json
+import os
+import re
+import sys
+from collections.abc import Mapping, MutableMapping
+
+from models.engine.file_utils import open_atomically
+from models.engine.identity_cache import IdentityCache
+
+
+class LazyObjects(MutableMapping):
+    """LazyObjects class - Mapping of keys to objects loaded on access"""
+
+    def __init__(self, path, deserialize, max_bytes):
+        """
+        Initializes an empty lazy mapping over a JSON file.
+
+        Parameters:
+            path (str): the path of the JSON file
+            deserialize (callable): builds an object from its dictionary,
+                returning None if it can't
+            max_bytes (int): the maximum number of bytes of records held
+                by the cache
+        """
+        self.__path = path
+        self.__deserialize = deserialize
+
+        self.__fd = None
+        self.__directory = {}
+        self.__cache = IdentityCache(max_bytes)
+        self.__pinned = {}
+
+    def scan(self, foreign_keys=()):
+        """
+        Builds the directory of the records of the JSON file.
+
+        Parameters:
+            foreign_keys (tuple[str]): attributes whose string values are
+                extracted from the records
+
+        Returns:
+            list[tuple[str, dict]]: the key of every record with its
+                foreign key values
+
+        Raises:
+            ValueError: If the file doesn't hold one record per line.
+        """
+        pattern = re.compile(
+            rb'"(' + b"|".join(attr.encode() for attr in foreign_keys) +
+            rb')": "([^"\\]*)"')
+        records = []
+
+        with open(self.__path, "rb") as file:
+            offset = 0
+            for line in file:
+                length = len(line)
+                stripped = line.rstrip(b"\r\n").rstrip(b",")
+
+                if stripped in (b"{", b"}", b"{}", b""):
+                    offset += length
+                    continue
+
+                end = stripped.find(b'": ', 1)
+                if not stripped.startswith(b'"') or end < 0 \
+                        or not stripped.endswith(b"}"):
+                    raise ValueError("file.json doesn't hold one record "
+                                     "per line")
+
+                key = stripped[1:end].decode()
+                start = end + 3
+                self.__directory[key] = (offset + start, len(stripped) - start)
+
+                records.append((key, {
+                    attr.decode(): sys.intern(value.decode())
+                    for attr, value in pattern.findall(stripped)
+                    if value
+                }))
+                offset += length
+
+        self._open()
+        return records
+
+    def pin(self, key, obj):
+        """
+        Keeps an object in memory until the next write.
+
+        Parameters:
+            key (str): the storage key of the object
+            obj (BaseModel): the object
+        """
+        self.__pinned[key] = obj
+        self.__cache.keep(key, obj)
+
+    def write(self):
+        """
+        Writes every object to the JSON file, one record per line.
+
+        Pinned objects are serialized, the others are copied from the
+        current file without being decoded. Pinned objects are moved to
+        the cache afterwards.
+        """
+        directory = {}
+
+        with open_atomically(self.__path, "wb") as file:
+            file.write(b"{")
+            separator = b"\n"
+
+            for key in list(self):
+                obj = self.__pinned.get(key)
+                if obj is not None:
+                    data = json.dumps(obj.to_dict()).encode()
+                else:
+                    data = self._read(key)
+
+                file.write(separator + json.dumps(key).encode() + b": ")
+                directory[key] = (file.tell(), len(data))
+                file.write(data)
+                separator = b",\n"
+
+            file.write(b"\n}")
+
+        self.__directory = directory
+        self._open()
+
+        pinned = self.__pinned
+        self.__pinned = {}
+        for key, obj in pinned.items():
+            if key in directory:
+                self.__cache.put(key, obj, directory[key][1])
+
+    def close(self):
+        """Closes the JSON file"""
+        if self.__fd is not None:
+            os.close(self.__fd)
+            self.__fd = None
+
+    def __del__(self):
+        """Closes the JSON file once the mapping is no longer used"""
+        self.close()
+
+    def __getitem__(self, key):
+        """
+        Returns the object of a key, decoding it from the file if needed.
+
+        Raises:
+            KeyError: If there is no object with this key.
+        """
+        obj = self.__pinned.get(key)
+        if obj is not None:
+            return obj
+
+        obj = self.__cache.get(key)
+        if obj is not None:
+            return obj
+
+        if key not in self.__directory:
+            raise KeyError(key)
+
+        obj = self.__deserialize(json.loads(self._read(key)))
+        if obj is None:
+            raise KeyError(key)
+
+        self.__cache.put(key, obj, self.__directory[key][1])
+        return obj
+
+    def __setitem__(self, key, obj):
+        """Adds a new object, pinned until the next write"""
+        self.pin(key, obj)
+
+    def __delitem__(self, key):
+        """
+        Removes the object of a key.
+
+        Raises:
+            KeyError: If there is no object with this key.
+        """
+        if key not in self:
+            raise KeyError(key)
+
+        self.__directory.pop(key, None)
+        self.__pinned.pop(key, None)
+        self.__cache.discard(key)
+
+    def __contains__(self, key):
+        """Tells whether there is an object with a key"""
+        return key in self.__directory or key in self.__pinned
+
+    def __iter__(self):
+        """Iterates over the keys, those of the file first"""
+        yield from self.__directory
+        for key in self.__pinned:
+            if key not in self.__directory:
+                yield key
+
+    def __len__(self):
+        """Returns the number of objects"""
+        return len(self.__directory) + sum(
+            1 for key in self.__pinned if key not in self.__directory)
+
+    def _open(self):
+        """(Re)opens the JSON file for reading records"""
+        self.close()
+        self.__fd = os.open(self.__path, os.O_RDONLY)
+
+    def _read(self, key):
+        """
+        Reads the JSON text of a record from the file.
+
+        Parameters:
+            key (str): the storage key of the record
+
+        Returns:
+            bytes: the JSON text of the record
+        """
+        offset, length = self.__directory[key]
+        return os.pread(self.__fd, length, offset)
+
+
+class ObjectsView(Mapping):
+    """ObjectsView class - Read-only view over some keys of a mapping"""
+
+    def __init__(self, objects, keys):
+        """
+        Initializes a view.
+
+        Parameters:
+            objects (Mapping): the mapping resolving keys to objects
+            keys (Iterable[str]): the keys of the view
+        """
+        self.__objects = objects
+        self.__keys = dict.fromkeys(keys)
+
+    def __getitem__(self, key):
+        """Returns the object of a key of the view"""
+        if key not in self.__keys:
+            raise KeyError(key)
+
+        return self.__objects[key]
+
+    def __iter__(self):
+        """Iterates over the keys of the view"""
+        return iter(self.__keys)
+
+    def __len__(self):
+        """Returns the number of keys of the view"""
+        return len(self.__keys)
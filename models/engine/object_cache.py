@@ -0,0 +1,165 @@
+#!/usr/bin/python3
+"""
+ObjectCache module
+
+This module defines the ObjectCache class, a bounded map of the column
+values of objects by (class name, id), shared by the threads of a
+process.
+
+The least recently used entries are evicted once the cache is full, and
+an entry older than the time to live, if any, is dropped on access. The
+values are immutable once cached: they are copied into the objects
+handed out, never changed in place. The cache also records when each
+entry was last checked against the database, so that the checks of the
+frequently read objects can be spaced out.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+
+class ObjectCache:
+    """ObjectCache class - Bounded LRU cache of object values"""
+
+    def __init__(self, max_size, ttl=0.0):
+        """
+        Initializes an empty cache.
+
+        Parameters:
+            max_size (int): the maximum number of cached objects
+            ttl (float): the number of seconds an entry is served for
+                after it is cached, 0 to serve it until it is evicted or
+                invalidated
+        """
+        self.__max_size = max_size
+        self.__ttl = ttl
+        self.__lock = threading.Lock()
+        self.__entries = OrderedDict()
+
+        self.__hits = 0
+        self.__misses = 0
+        self.__stale = 0
+        self.__expirations = 0
+        self.__evictions = 0
+        self.__invalidations = 0
+
+    def get(self, key):
+        """
+        Returns the cached values of an object, counting a hit or a miss.
+
+        Parameters:
+            key (tuple[str, str]): the class name and id of the object
+
+        Returns:
+            dict: The column values of the object, or None if it isn't
+                cached or its entry expired.
+        """
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is not None and self.__ttl and \
+                    time.monotonic() - entry[1] > self.__ttl:
+                del self.__entries[key]
+                self.__expirations += 1
+                entry = None
+
+            if entry is None:
+                self.__misses += 1
+                return None
+
+            self.__entries.move_to_end(key)
+            self.__hits += 1
+            return entry[0]
+
+    def validation_due(self, key, interval):
+        """
+        Tells whether the entry of an object was last checked against the
+        database, or cached, more than an interval ago.
+
+        Parameters:
+            key (tuple[str, str]): the class name and id of the object
+            interval (float): the number of seconds a check holds for
+
+        Returns:
+            bool: True if the entry is due for a check, or isn't cached.
+        """
+        with self.__lock:
+            entry = self.__entries.get(key)
+            return entry is None or \
+                time.monotonic() - entry[2] >= interval
+
+    def validated(self, key):
+        """
+        Records that the entry of an object was found up to date.
+
+        Parameters:
+            key (tuple[str, str]): the class name and id of the object
+        """
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is not None:
+                self.__entries[key] = (entry[0], entry[1], time.monotonic())
+
+    def put(self, key, values):
+        """
+        Caches the values of an object, evicting the least recently used
+        entries beyond the maximum size.
+
+        Parameters:
+            key (tuple[str, str]): the class name and id of the object
+            values (dict): the column values of the object
+        """
+        with self.__lock:
+            now = time.monotonic()
+            self.__entries[key] = (values, now, now)
+            self.__entries.move_to_end(key)
+
+            while len(self.__entries) > self.__max_size:
+                self.__entries.popitem(last=False)
+                self.__evictions += 1
+
+    def invalidate(self, keys, stale=False):
+        """
+        Drops the entries of objects.
+
+        Parameters:
+            keys (Iterable[tuple[str, str]]): the class names and ids of
+                the objects
+            stale (bool): whether the entries were found out of date
+                after a hit, rather than invalidated by a write
+        """
+        with self.__lock:
+            for key in keys:
+                if self.__entries.pop(key, None) is None:
+                    continue
+
+                if stale:
+                    self.__stale += 1
+                else:
+                    self.__invalidations += 1
+
+    def clear(self):
+        """Drops every entry"""
+        with self.__lock:
+            self.__invalidations += len(self.__entries)
+            self.__entries.clear()
+
+    def stats(self):
+        """
+        Returns the cache statistics.
+
+        Returns:
+            dict: hits (including the stale ones), misses, stale (hits
+                found out of date), expirations, evictions, invalidations
+                and size (the number of cached objects).
+        """
+        with self.__lock:
+            return {
+                "hits": self.__hits,
+                "misses": self.__misses,
+                "stale": self.__stale,
+                "expirations": self.__expirations,
+                "evictions": self.__evictions,
+                "invalidations": self.__invalidations,
+                "size": len(self.__entries),
+            }
@@ -0,0 +1,274 @@
+#!/usr/bin/python3
+"""
+Query module
+
+This module defines the Query class, a chainable description of a query
+on the objects of one class, built by storage.query(cls) and run by the
+storage engine:
+
+    storage.query(Place).filter("city_id", "==", city_id) \
+        .filter("price_by_night", "<", 100).order_by("-price_by_night") \
+        .limit(10).offset(20).all()
+
+A query can return rows of a few attributes instead of whole objects,
+for pages listing them:
+
+    storage.query(State).only("name").order_by("name").all()
+
+Every method returning a query returns a new one, so a query can be
+reused as the base of others. DBStorage compiles a query to SQL, while
+FileStorage runs it through its indexes where it can and scans the
+objects of the class where it can't.
+"""
+
+import operator
+
+COMPARISONS = {"==": operator.eq, "!=": operator.ne, "<": operator.lt,
+               "<=": operator.le, ">": operator.gt, ">=": operator.ge}
+OPERATORS = tuple(COMPARISONS) + ("in",)
+
+
+class Query:
+    """Query class - Chainable query on the objects of a class"""
+
+    def __init__(self, cls, run, count):
+        """
+        Initializes a query returning every object of a class.
+
+        Parameters:
+            cls (class): the class of the objects
+            run (callable): runs a query, returning the list of its
+                objects
+            count (callable): runs a query, returning its number of
+                objects
+        """
+        self.__cls = cls
+        self.__run = run
+        self.__count = count
+        self.__filters = ()
+        self.__order = ()
+        self.__limit = None
+        self.__offset = 0
+        self.__load = ()
+        self.__fields = ()
+
+    @property
+    def cls(self):
+        """The class of the objects"""
+        return self.__cls
+
+    @property
+    def filters(self):
+        """The conditions, as (attribute, operator, value) tuples"""
+        return self.__filters
+
+    @property
+    def order(self):
+        """The sort keys, as (attribute, descending) tuples"""
+        return self.__order
+
+    @property
+    def limit_value(self):
+        """The maximum number of objects, or None"""
+        return self.__limit
+
+    @property
+    def offset_value(self):
+        """The number of objects skipped"""
+        return self.__offset
+
+    @property
+    def relationships(self):
+        """The names of the relationships to load with the objects"""
+        return self.__load
+
+    @property
+    def fields(self):
+        """The names of the attributes of the rows, () for objects"""
+        return self.__fields
+
+    def filter(self, attr, op, value):
+        """
+        Returns the query keeping only the objects whose attribute
+        compares to a value; conditions are combined with AND.
+
+        Parameters:
+            attr (str): the name of the attribute
+            op (str): "==", "!=", "<", "<=", ">", ">=", or "in" for a
+                value among an iterable of values
+            value (any): the value to compare the attribute to
+
+        Returns:
+            Query: The new query.
+
+        Raises:
+            ValueError: If the operator is unknown.
+        """
+        if op not in OPERATORS:
+            raise ValueError(f"Unknown query operator: {op}")
+        if op == "in":
+            value = tuple(value)
+
+        return self._copy(filters=self.__filters + ((attr, op, value),))
+
+    def filter_by(self, **values):
+        """
+        Returns the query keeping only the objects whose attributes equal
+        the given values.
+
+        Parameters:
+            **values: the values by attribute name
+
+        Returns:
+            Query: The new query.
+        """
+        query = self
+        for attr, value in values.items():
+            query = query.filter(attr, "==", value)
+
+        return query
+
+    def order_by(self, *attrs):
+        """
+        Returns the query sorting the objects by attributes, after the
+        sort keys given before.
+
+        Parameters:
+            *attrs (str): the names of the attributes, prefixed with "-"
+                to sort in descending order
+
+        Returns:
+            Query: The new query.
+        """
+        order = tuple((attr.lstrip("-"), attr.startswith("-"))
+                      for attr in attrs)
+        return self._copy(order=self.__order + order)
+
+    def limit(self, n):
+        """
+        Returns the query returning at most a number of objects.
+
+        Parameters:
+            n (int): the maximum number of objects
+
+        Returns:
+            Query: The new query.
+
+        Raises:
+            ValueError: If n is negative.
+        """
+        if n < 0:
+            raise ValueError("The limit of a query can't be negative")
+
+        return self._copy(limit=n)
+
+    def offset(self, k):
+        """
+        Returns the query skipping a number of objects first.
+
+        Parameters:
+            k (int): the number of objects to skip
+
+        Returns:
+            Query: The new query.
+
+        Raises:
+            ValueError: If k is negative.
+        """
+        if k < 0:
+            raise ValueError("The offset of a query can't be negative")
+
+        return self._copy(offset=k)
+
+    def load(self, *relationships):
+        """
+        Returns the query loading relationships with the objects, see
+        DBStorage.all(); FileStorage ignores them.
+
+        Parameters:
+            *relationships (str): the names of the relationships
+
+        Returns:
+            Query: The new query.
+
+        Raises:
+            ValueError: If the query returns rows, see only().
+        """
+        if self.__fields:
+            raise ValueError("Rows of a query can't load relationships")
+
+        return self._copy(load=self.__load + relationships)
+
+    def only(self, *fields):
+        """
+        Returns the query returning rows of attributes of the objects,
+        the id first, instead of the objects: DBStorage selects only
+        their columns, and rows, like named tuples, have the attributes
+        but none of the methods or relationships of the objects.
+
+        Parameters:
+            *fields (str): the names of the attributes
+
+        Returns:
+            Query: The new query.
+
+        Raises:
+            ValueError: If the query loads relationships, see load().
+        """
+        if self.__load:
+            raise ValueError("Rows of a query can't load relationships")
+
+        fields = tuple(dict.fromkeys(("id",) + self.__fields + fields))
+        return self._copy(fields=fields)
+
+    def all(self):
+        """
+        Runs the query.
+
+        Returns:
+            list: The objects, or their rows, see only().
+        """
+        return self.__run(self)
+
+    def first(self):
+        """
+        Runs the query for its first object.
+
+        Returns:
+            The first object or row, or None if there is none.
+        """
+        objects = self.limit(1).all()
+        return objects[0] if objects else None
+
+    def count(self):
+        """
+        Counts the objects of the query, regardless of its order.
+
+        Returns:
+            int: The number of objects.
+        """
+        return self.__count(self)
+
+    def __iter__(self):
+        """Runs the query and iterates over its objects"""
+        return iter(self.all())
+
+    def _copy(self, **changes):
+        """
+        Returns a copy of the query with some of its parts replaced.
+
+        Parameters:
+            **changes: the new filters, order, limit, offset, load or
+                fields
+
+        Returns:
+            Query: The copy.
+        """
+        query = Query(self.__cls, self.__run, self.__count)
+        query.__filters = changes.get("filters", self.__filters)
+        query.__order = changes.get("order", self.__order)
+        query.__limit = changes.get("limit", self.__limit)
+        query.__offset = changes.get("offset", self.__offset)
+        query.__load = changes.get("load", self.__load)
+        query.__fields = changes.get("fields", self.__fields)
+        return query
@@ -0,0 +1,341 @@
+#!/usr/bin/python3
+"""
+Snapshot module
+
+This module defines Snapshot, a read-only file of the objects of a
+FileStorage that processes open through mmap, so the processes reading it
+on a host share one copy of it in the page cache, and SnapshotObjects,
+the mapping of keys to objects decoded from it on access.
+
+A snapshot file holds, little-endian:
+    header      b"HBNBSNAP", u32 version, u32 records,
+                u64 index offset, u64 relations offset
+    records     the key then the JSON of every object, sorted by key
+    index       a (u64 key offset, u16 key length, u32 record length)
+                entry per record, in the order of the records
+    relations   u32 tables, then per (class, foreign key) table:
+                u16 name length, name ("City.state_id"), u32 entries,
+                (u32 value offset, u16 value length, u32 record number)
+                entries sorted by value, u32 values length, values
+
+The objects of a class are contiguous since keys start with their class
+name, and the objects referencing an id are found by binary search, so a
+process reading a snapshot only holds the objects it decoded.
+
+Snapshots are published by writing a new file and renaming it over the
+previous one: processes that still map the previous file keep reading it
+until they reopen the path.
+"""
+
+import json
+import mmap
+import struct
+from collections.abc import Mapping
+
+from models.engine.file_utils import file_version, open_atomically
+from models.engine.identity_cache import IdentityCache
+
+MAGIC = b"HBNBSNAP"
+VERSION = 1
+HEADER = struct.Struct("<8sIIQQ")
+ENTRY = struct.Struct("<QHI")
+RELATION = struct.Struct("<IHI")
+
+
+class Snapshot:
+    """Snapshot class - Read-only memory-mapped file of objects"""
+
+    def __init__(self, path):
+        """
+        Opens and maps a snapshot file.
+
+        Parameters:
+            path (str): the path of the snapshot file
+
+        Raises:
+            OSError: If the file can't be opened.
+            ValueError: If the file isn't a snapshot.
+        """
+        with open(path, "rb") as file:
+            self.__version = file_version(file.fileno())
+            self.__map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, self.__count, self.__index, relations = \
+            HEADER.unpack_from(self.__map, 0)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"{path} isn't a storage snapshot")
+
+        self.__relations = {}
+        (tables_count,) = struct.unpack_from("<I", self.__map, relations)
+        offset = relations + 4
+        for _ in range(tables_count):
+            (size,) = struct.unpack_from("<H", self.__map, offset)
+            name = self.__map[offset + 2:offset + 2 + size].decode()
+            offset += 2 + size
+            (count,) = struct.unpack_from("<I", self.__map, offset)
+            entries = offset + 4
+            offset = entries + count * RELATION.size
+            (size,) = struct.unpack_from("<I", self.__map, offset)
+            self.__relations[name] = (entries, count, offset + 4)
+            offset += 4 + size
+
+    @staticmethod
+    def write(path, records, foreign_keys=()):
+        """
+        Writes a snapshot file, replacing the previous one atomically.
+
+        Parameters:
+            path (str): the path of the snapshot file
+            records (Iterable[tuple[str, dict]]): the key and to_dict()
+                dictionary of every object
+            foreign_keys (tuple[str]): the attributes indexed as foreign
+                keys
+        """
+        records = sorted(
+            (key.encode(), json.dumps(dictionary).encode(), dictionary)
+            for key, dictionary in records)
+
+        with open_atomically(path, "wb") as file:
+            file.write(bytes(HEADER.size))
+
+            entries = []
+            relations = {}
+            offset = HEADER.size
+            for number, (key, data, dictionary) in enumerate(records):
+                file.write(key)
+                file.write(data)
+                entries.append(ENTRY.pack(offset, len(key), len(data)))
+                offset += len(key) + len(data)
+
+                class_name = key.split(b".", 1)[0]
+                for attr in foreign_keys:
+                    value = dictionary.get(attr)
+                    if value and type(value) is str:
+                        relations.setdefault(
+                            class_name + b"." + attr.encode(), []
+                        ).append((value.encode(), number))
+
+            index = offset
+            file.write(b"".join(entries))
+
+            file.write(struct.pack("<I", len(relations)))
+            for name, values in relations.items():
+                values.sort()
+                blob = []
+                position = 0
+                file.write(struct.pack("<H", len(name)) + name)
+                file.write(struct.pack("<I", len(values)))
+                for value, number in values:
+                    file.write(RELATION.pack(position, len(value), number))
+                    blob.append(value)
+                    position += len(value)
+                file.write(struct.pack("<I", position))
+                file.write(b"".join(blob))
+
+            file.seek(0)
+            file.write(HEADER.pack(MAGIC, VERSION, len(records), index,
+                                   index + len(entries) * ENTRY.size))
+
+    @property
+    def version(self):
+        """tuple: the version of the mapped file, see file_version()"""
+        return self.__version
+
+    def close(self):
+        """Unmaps the file"""
+        self.__map.close()
+
+    def __len__(self):
+        """Returns the number of records"""
+        return self.__count
+
+    def get(self, key):
+        """
+        Returns the JSON of the record of a key.
+
+        Parameters:
+            key (str): the storage key of the object
+
+        Returns:
+            bytes: the JSON of the record, None if there is no such key
+        """
+        key = key.encode()
+        number = self._bisect(key)
+        if number < self.__count and self._key(number) == key:
+            return self._record(number)
+
+        return None
+
+    def keys(self, class_name=None):
+        """
+        Returns the keys of the records, or of the records of a class.
+
+        Parameters:
+            class_name (str, optional): the name of the class
+
+        Returns:
+            list[str]: the keys in sorted order
+        """
+        start, stop = 0, self.__count
+        if class_name:
+            start = self._bisect(f"{class_name}.".encode())
+            stop = self._bisect(f"{class_name}/".encode())
+
+        return [self._key(number).decode() for number in range(start, stop)]
+
+    def count(self, class_name):
+        """
+        Returns the number of records of a class.
+
+        Parameters:
+            class_name (str): the name of the class
+
+        Returns:
+            int: the number of records
+        """
+        return self._bisect(f"{class_name}/".encode()) - \
+            self._bisect(f"{class_name}.".encode())
+
+    def related(self, class_name, foreign_key, _id):
+        """
+        Returns the keys of the records of a class referencing an id.
+
+        Parameters:
+            class_name (str): the name of the class of the records
+            foreign_key (str): the foreign key attribute
+            _id (str): the referenced id
+
+        Returns:
+            list[str]: the keys of the records
+        """
+        table = self.__relations.get(f"{class_name}.{foreign_key}")
+        if not table or not _id:
+            return []
+
+        entries, count, values = table
+        value = _id.encode()
+
+        low, high = 0, count
+        while low < high:
+            middle = (low + high) // 2
+            if self._relation_value(table, middle) < value:
+                low = middle + 1
+            else:
+                high = middle
+
+        keys = []
+        while low < count and self._relation_value(table, low) == value:
+            _, _, number = RELATION.unpack_from(
+                self.__map, entries + low * RELATION.size)
+            keys.append(self._key(number).decode())
+            low += 1
+
+        return keys
+
+    def _bisect(self, key):
+        """
+        Returns the number of the first record whose key isn't lower than
+        a key.
+
+        Parameters:
+            key (bytes): the key to look for
+        """
+        low, high = 0, self.__count
+        while low < high:
+            middle = (low + high) // 2
+            if self._key(middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+
+        return low
+
+    def _key(self, number):
+        """Returns the key of a record (bytes)"""
+        offset, size, _ = ENTRY.unpack_from(
+            self.__map, self.__index + number * ENTRY.size)
+        return self.__map[offset:offset + size]
+
+    def _record(self, number):
+        """Returns the JSON of a record (bytes)"""
+        offset, size, length = ENTRY.unpack_from(
+            self.__map, self.__index + number * ENTRY.size)
+        return self.__map[offset + size:offset + size + length]
+
+    def _relation_value(self, table, position):
+        """Returns the referenced id of an entry of a relation table"""
+        entries, _, values = table
+        offset, size, _ = RELATION.unpack_from(
+            self.__map, entries + position * RELATION.size)
+        return self.__map[values + offset:values + offset + size]
+
+
+class SnapshotObjects(Mapping):
+    """
+    SnapshotObjects class - Mapping of keys to the objects of a snapshot
+
+    Objects are decoded on access and kept in an IdentityCache of a
+    bounded number of objects.
+    """
+
+    def __init__(self, snapshot, deserialize, max_objects):
+        """
+        Initializes a mapping over a snapshot.
+
+        Parameters:
+            snapshot (Snapshot): the snapshot, None for an empty mapping
+            deserialize (callable): builds an object from its dictionary,
+                returning None if it can't
+            max_objects (int): the maximum number of cached objects
+        """
+        self.__snapshot = snapshot
+        self.__deserialize = deserialize
+        self.__cache = IdentityCache(max_objects)
+
+    @property
+    def snapshot(self):
+        """Snapshot: the snapshot, None for an empty mapping"""
+        return self.__snapshot
+
+    def __getitem__(self, key):
+        """
+        Returns the object of a key, decoding it from the snapshot if
+        needed.
+
+        Raises:
+            KeyError: If there is no object with this key.
+        """
+        obj = self.__cache.get(key)
+        if obj is not None:
+            return obj
+
+        data = None
+        if self.__snapshot is not None:
+            data = self.__snapshot.get(key)
+
+        obj = self.__deserialize(json.loads(data)) if data else None
+        if obj is None:
+            raise KeyError(key)
+
+        self.__cache.put(key, obj)
+        return obj
+
+    def __contains__(self, key):
+        """Tells whether there is an object with a key"""
+        return self.__snapshot is not None and \
+            self.__snapshot.get(key) is not None
+
+    def __iter__(self):
+        """Iterates over the keys, in sorted order"""
+        if self.__snapshot is None:
+            return iter(())
+
+        return iter(self.__snapshot.keys())
+
+    def __len__(self):
+        """Returns the number of objects"""
+        if self.__snapshot is None:
+            return 0
+
+        return len(self.__snapshot)
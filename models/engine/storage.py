@@ -5,9 +5,13 @@ which serves as the interface for interacting with
 different storage mechanisms.
 """
 
+import base64
+import json
 import threading
 from abc import ABC, abstractmethod
+from datetime import datetime
 
+from models.engine.query import Query
 from models.engine.stored_classes import CLASSES
 
 
@@ -15,15 +19,25 @@ class Storage(ABC):
     __CLASSES = CLASSES
 
     @abstractmethod
-    def all(self, cls=None):
+    def all(self, cls=None, load=()):
         """Retrieve all objects of a given class or all classes."""
         pass
 
+    @abstractmethod
+    def iter_all(self, cls=None, batch_size=1000):
+        """Iterate over the objects of a class or all classes."""
+        pass
+
     @abstractmethod
     def new(self, obj):
         """Add a new object to the storage."""
         pass
 
+    @abstractmethod
+    def new_many(self, objs):
+        """Add several objects to the storage and save them at once."""
+        pass
+
     @abstractmethod
     def save(self):
         """Commit changes to the storage."""
@@ -39,11 +53,26 @@ class Storage(ABC):
         """Delete an object from the storage."""
         pass
 
+    @abstractmethod
+    def delete_many(self, cls, ids):
+        """Delete the objects of a class with the given IDs at once."""
+        pass
+
     @abstractmethod
     def find(self, class_name, _id):
         """Find an object by its class name and ID."""
         pass
 
+    @abstractmethod
+    def find_many(self, class_name, ids):
+        """Find the objects of a class with the given IDs at once."""
+        pass
+
+    @abstractmethod
+    def exists(self, class_name, _id):
+        """Tell whether an object is stored, without loading it."""
+        pass
+
     @abstractmethod
     def find_all(self, class_name=""):
         """Find all objects of a given class."""
@@ -54,6 +83,11 @@ class Storage(ABC):
         """Update an object's attributes."""
         pass
 
+    @abstractmethod
+    def update_many(self, cls, ids, values):
+        """Set attribute values on the objects of a class at once."""
+        pass
+
     @abstractmethod
     def count(self, class_name):
         """Count the number of objects of a given class."""
@@ -64,6 +98,109 @@ class Storage(ABC):
         """Close the storage session."""
         pass
 
+    @abstractmethod
+    def transaction(self):
+        """Group the changes of a with block into one commit."""
+        pass
+
+    def flush(self):
+        """Wait until the saved changes are durable, as after save()."""
+        pass
+
+    def query(self, cls):
+        """
+        Starts a chainable query on the objects of a class, see Query
+        Parameters:
+            cls (class): the class of the objects
+        Returns:
+            A query returning every object of the class (Query)
+        Raises:
+            ValueError: If the class isn't stored.
+        """
+        if cls not in self.get_classes():
+            raise ValueError(f"{cls!r} isn't a stored class")
+
+        return Query(cls, self._run_query, self._count_query)
+
+    def page(self, cls, size, token=None):
+        """
+        Returns a page of the objects of a class in (created_at, id)
+        order. The token of the next page is the position after the last
+        object of this one, so objects added or deleted meanwhile don't
+        shift the next pages. The position is the one stored, which may
+        be less precise than the created_at of an object in memory.
+        Parameters:
+            cls (class): the class of the objects
+            size (int): the maximum number of objects of the page
+            token (str, optional): the token of the page, returned with
+                the previous one, None for the first page
+        Returns:
+            A tuple of the objects of the page (list) and the token of the
+            next page, None after the last page (str)
+        Raises:
+            ValueError: If the class isn't stored, the size isn't
+                positive or the token is invalid.
+        """
+        if cls not in self.get_classes():
+            raise ValueError(f"{cls!r} isn't a stored class")
+        if size < 1:
+            raise ValueError("The size of a page must be positive")
+
+        after = self._page_position(token) if token else None
+        rows = self._page(cls, size + 1, after)
+        objects = [obj for _, obj in rows[:size]]
+        if len(rows) <= size:
+            return objects, None
+
+        return objects, self._page_token(rows[size - 1][0])
+
+    @abstractmethod
+    def _page(self, cls, limit, after):
+        """Return the first (position, object) after a (created_at, id)."""
+        pass
+
+    @abstractmethod
+    def _run_query(self, query):
+        """Return the list of the objects of a query."""
+        pass
+
+    @abstractmethod
+    def _count_query(self, query):
+        """Return the number of objects of a query."""
+        pass
+
+    @staticmethod
+    def _page_token(position):
+        """
+        Encodes the position after an object in (created_at, id) order
+        Parameters:
+            position (tuple[datetime, str]): the stored created_at and id
+                of the last object of a page
+        Returns:
+            An opaque, URL-safe token (str)
+        """
+        created_at, _id = position
+        position = json.dumps([created_at.isoformat(), _id])
+        return base64.urlsafe_b64encode(position.encode()).decode()
+
+    @staticmethod
+    def _page_position(token):
+        """
+        Decodes a page token
+        Parameters:
+            token (str): a token returned by page()
+        Returns:
+            The (created_at, id) tuple of the last object of the previous
+            page (tuple[datetime, str])
+        Raises:
+            ValueError: If the token is invalid.
+        """
+        try:
+            created_at, _id = json.loads(base64.urlsafe_b64decode(token))
+            return datetime.fromisoformat(created_at), str(_id)
+        except (TypeError, ValueError) as err:
+            raise ValueError(f"Invalid page token: {token!r}") from err
+
     @staticmethod
     def _get_obj_key(class_name, _id):
         """
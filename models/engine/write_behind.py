@@ -0,0 +1,180 @@
+#!/usr/bin/python3
+"""
+WriteBehind module
+
+This module defines the WriteBehind class, which runs a write in a
+background thread some time after it is requested, so callers don't wait
+for the disk.
+
+Requests made in a burst are coalesced into one write: the first request
+after the previous write starts a delay of at most the maximum staleness,
+then one write covers every request made until it starts. flush() is a
+barrier that returns once every request made before it is written, and
+close() drains the pending requests and stops the thread. A write that
+fails is retried after the delay, or raised to the caller of flush().
+"""
+
+import threading
+import time
+
+
+class WriteBehind:
+    """WriteBehind class - Runs requested writes in the background"""
+
+    def __init__(self, write, max_staleness=1.0):
+        """
+        Initializes a write-behind around a write function.
+
+        Parameters:
+            write (callable): performs one durable write of the current
+                state; called without arguments
+            max_staleness (float): the maximum number of seconds between
+                a request and the start of the write covering it
+        """
+        self.__write = write
+        self.__max_staleness = max_staleness
+        self.__condition = threading.Condition()
+        self.__requested = 0
+        self.__written = 0
+        self.__deadline = None
+        self.__writing = False
+        self.__closed = False
+        self.__thread = None
+
+        self.__writes = 0
+        self.__failures = 0
+
+    def request(self):
+        """
+        Requests a write and returns at once.
+
+        After close(), the write is made before returning.
+
+        Raises:
+            Exception: Any exception raised by the write, after close().
+        """
+        with self.__condition:
+            self.__requested += 1
+            if self.__deadline is None:
+                self.__deadline = time.monotonic() + self.__max_staleness
+
+            closed = self.__closed
+            if not closed and self.__thread is None:
+                self.__thread = threading.Thread(
+                    target=self._run, name="write-behind", daemon=True)
+                self.__thread.start()
+
+            self.__condition.notify_all()
+
+        if closed:
+            self.flush()
+
+    def flush(self):
+        """
+        Blocks until every write requested before the call is made,
+        making it in the calling thread if it isn't in progress.
+
+        Raises:
+            Exception: Any exception raised by the write made by this
+                call. The requests stay pending.
+        """
+        with self.__condition:
+            ticket = self.__requested
+            while self.__writing and self.__written < ticket:
+                self.__condition.wait()
+
+            if self.__written >= ticket:
+                return
+
+            self.__writing = True
+
+        self._write()
+
+    def close(self):
+        """
+        Writes the pending requests and stops the background thread.
+        Later requests are written synchronously.
+
+        Raises:
+            Exception: Any exception raised by the last write.
+        """
+        with self.__condition:
+            self.__closed = True
+            thread = self.__thread
+            self.__condition.notify_all()
+
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+
+        self.flush()
+
+    def stats(self):
+        """
+        Returns the write-behind statistics.
+
+        Returns:
+            dict: requests, writes, failures (failed background writes)
+                and pending (requests not written yet).
+        """
+        with self.__condition:
+            return {
+                "requests": self.__requested,
+                "writes": self.__writes,
+                "failures": self.__failures,
+                "pending": self.__requested - self.__written,
+            }
+
+    def _run(self):
+        """Makes the requested writes once they are due, until closed"""
+        while True:
+            with self.__condition:
+                while True:
+                    if self.__closed:
+                        return
+
+                    if self.__writing or self.__deadline is None:
+                        self.__condition.wait()
+                        continue
+
+                    delay = self.__deadline - time.monotonic()
+                    if delay <= 0:
+                        break
+                    self.__condition.wait(delay)
+
+                self.__writing = True
+
+            try:
+                self._write()
+            except Exception:
+                with self.__condition:
+                    self.__failures += 1
+
+    def _write(self):
+        """
+        Makes one write covering the requests made until now, the caller
+        having set the writing flag
+
+        Raises:
+            Exception: Any exception raised by the write, after which it
+                is scheduled again.
+        """
+        with self.__condition:
+            target = self.__requested
+            self.__deadline = None
+
+        try:
+            self.__write()
+        except BaseException:
+            with self.__condition:
+                retry = time.monotonic() + self.__max_staleness
+                if self.__deadline is None or self.__deadline > retry:
+                    self.__deadline = retry
+                self.__writing = False
+                self.__condition.notify_all()
+            raise
+
+        with self.__condition:
+            self.__written = target
+            self.__writes += 1
+            self.__writing = False
+            self.__condition.notify_all()
@@ -61,6 +61,18 @@ class Place(*parent_classes):
         longitude: float = 0.0
         amenity_ids: List[str] = []
 
+        @property
+        def user(self):
+            """
+            Retrieves the user owning the place.
+
+            Returns:
+                User: The owner of the place, or None if not found.
+            """
+            from models import storage
+
+            return storage.find("User", self.user_id)
+
         @property
         def reviews(self):
             """
@@ -71,14 +83,7 @@ class Place(*parent_classes):
             """
             from models import storage
 
-            related_reviews = []
-            reviews = storage.all(Review)
-
-            for review in reviews.values():
-                if review.place_id == self.id:
-                    related_reviews.append(review)
-
-            return related_reviews
+            return storage.find_related(Review.__name__, "place_id", self.id)
 
         @property
         def amenities(self):
@@ -90,14 +95,8 @@ class Place(*parent_classes):
             """
             from models import storage
 
-            amenities = storage.all(Amenity)
-            related_places = []
-
-            for amenity in amenities.values():
-                if amenity.id in self.amenity_ids:
-                    related_places.append(amenity)
-
-            return related_places
+            return list(
+                storage.find_many("Amenity", self.amenity_ids).values())
 
         @amenities.setter
         def amenities(self, obj):
@@ -114,7 +113,7 @@ class Place(*parent_classes):
                 return
 
             if obj.id not in self.amenity_ids:
-                self.amenity_ids.append(obj.id)
+                self.amenity_ids = self.amenity_ids + [obj.id]
 
 
 if STORAGE_TYPE == "db":
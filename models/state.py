@@ -43,11 +43,4 @@ class State(*parent_classes):
             """
             from models import storage
 
-            related_cities = []
-            cities = storage.all(City)
-
-            for city in cities.values():
-                if city.state_id == self.id:
-                    related_cities.append(city)
-
-            return related_cities
+            return storage.find_related(City.__name__, "state_id", self.id)
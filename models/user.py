@@ -39,3 +39,27 @@ class User(*parent_classes):
         password: str = ""
         first_name: str = ""
         last_name: str = ""
+
+        @property
+        def places(self):
+            """
+            Retrieves the places owned by the user.
+
+            Returns:
+                list: A list of Place objects owned by the user.
+            """
+            from models import storage
+
+            return storage.find_related("Place", "user_id", self.id)
+
+        @property
+        def reviews(self):
+            """
+            Retrieves the reviews written by the user.
+
+            Returns:
+                list: A list of Review objects written by the user.
+            """
+            from models import storage
+
+            return storage.find_related("Review", "user_id", self.id)
@@ -12,3 +12,6 @@ FLUSH PRIVILEGES;
 GRANT SELECT ON performance_schema.* TO 'hbnb_dev'@'localhost';
 -- Reloads the grant tables and applies changes immediately.
 FLUSH PRIVILEGES;
+-- Migrates the timestamps of the tables already created in hbnb_dev_db to DATETIME(6), run from the directory of this script.
+USE hbnb_dev_db;
+SOURCE migrate_mysql_timestamps.sql;
@@ -1,7 +1,46 @@
 #!/usr/bin/python3
 """Defines unittests for models/base_model.py"""
 
+import os
+import subprocess
+import sys
+import tempfile
 import unittest
+from datetime import datetime
+from unittest import mock
+
+from models.base_model import BaseModel
+from models.place import Place
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__))))
+COMPACT = """
+from datetime import datetime
+from models import storage
+from models.city import City
+from models.state import State
+
+state = State(name="California")
+city = City(name="Fresno", state_id=state.id)
+assert isinstance(city.created_at, datetime)
+assert type(city.__dict__["_created_at"]) is float
+assert "created_at" not in city.__dict__
+
+dictionary = city.to_dict()
+assert "_created_at" not in dictionary
+assert dictionary["created_at"] == city.created_at.isoformat()
+assert "'created_at': datetime" in str(city)
+
+copies = [City.from_dict(dict(dictionary, state_id="".join(state.id)))
+          for _ in range(2)]
+assert copies[0].state_id is copies[1].state_id
+assert copies[0].to_dict() == dictionary
+
+storage.new_many([state, city])
+storage.save()
+storage.reload()
+assert storage.find("City", city.id).to_dict() == dictionary
+"""
 
 
 class TestBaseModel(unittest.TestCase):
@@ -9,5 +48,60 @@ class TestBaseModel(unittest.TestCase):
     pass
 
 
+@unittest.skipIf(
+    os.getenv('HBNB_TYPE_STORAGE') == 'db', 'File Storage test')
+class TestBaseModelFromDict(unittest.TestCase):
+    """Unittests for BaseModel.from_dict()"""
+
+    def test_round_trip(self):
+        """from_dict() rebuilds the object to_dict() was made from"""
+        place = Place(name="Loft", city_id="city", amenity_ids=["a", "b"])
+        dictionary = place.to_dict()
+
+        copy = Place.from_dict(dictionary)
+        self.assertIs(type(copy), Place)
+        self.assertEqual(copy.to_dict(), dictionary)
+        self.assertEqual((copy.created_at, copy.updated_at),
+                         (place.created_at, place.updated_at))
+        self.assertNotIn("__class__", copy.__dict__)
+
+    def test_attributes_set_without_hook(self):
+        """The storage isn't told about the attributes set"""
+        dictionary = Place(name="Loft").to_dict()
+        with mock.patch("models.storage.track_change") as track_change, \
+                mock.patch("models.storage.before_change") as before_change:
+            Place.from_dict(dictionary)
+
+        track_change.assert_not_called()
+        before_change.assert_not_called()
+
+    def test_missing_id_and_timestamps(self):
+        """An id and the current time are given when they are missing"""
+        before = datetime.now()
+        obj = BaseModel.from_dict({"name": "Loft"})
+
+        self.assertTrue(obj.id)
+        self.assertGreaterEqual(obj.created_at, before)
+        self.assertGreaterEqual(obj.updated_at, before)
+        self.assertEqual(obj.name, "Loft")
+
+
+@unittest.skipIf(
+    os.getenv('HBNB_TYPE_STORAGE') == 'db', 'File Storage test')
+class TestBaseModelCompact(unittest.TestCase):
+    """Unittests for the models of HBNB_COMPACT_MODELS=1"""
+
+    def test_compact_models(self):
+        """Timestamps are kept as numbers and foreign keys interned, with
+        the same dictionaries as the regular models"""
+        with tempfile.TemporaryDirectory() as directory:
+            env = dict(os.environ, PYTHONPATH=ROOT, HBNB_COMPACT_MODELS="1")
+            result = subprocess.run([sys.executable, "-c", COMPACT],
+                                    cwd=directory, env=env,
+                                    capture_output=True, text=True,
+                                    timeout=60)
+        self.assertEqual(result.returncode, 0, result.stderr)
+
+
 if __name__ == "__main__":
     unittest.main()
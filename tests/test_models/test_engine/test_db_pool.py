@@ -0,0 +1,79 @@
+#!/usr/bin/python3
+"""test for the connection pool of DB storage"""
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import TimeoutError
+
+from models.engine.db_pool import MeteredQueuePool, watch_liveness
+
+
+class TestMeteredQueuePool(unittest.TestCase):
+    """Tests the metrics and the liveness checks of the pool"""
+
+    def setUp(self):
+        """Opens an engine of one connection on a SQLite file"""
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.engine = create_engine(
+            f"sqlite:///{os.path.join(directory.name, 'pool.db')}",
+            poolclass=MeteredQueuePool, pool_size=1, max_overflow=0,
+            pool_timeout=0.1)
+        self.addCleanup(self.engine.dispose)
+
+    def use_connection(self):
+        """Checks a connection out, runs a statement and checks it in"""
+        with self.engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+
+    def test_checkouts_and_timeouts(self):
+        """Checkouts are counted, with the ones the exhausted pool gave
+        up on and the time they waited"""
+        self.use_connection()
+        with self.engine.connect():
+            with self.assertRaises(TimeoutError):
+                self.engine.connect()
+
+        stats = self.engine.pool.metrics.stats()
+        self.assertEqual((stats["checkouts"], stats["timeouts"]), (3, 1))
+        self.assertGreaterEqual(stats["max_wait"], 0.1)
+        self.assertGreaterEqual(stats["wait_time"], stats["max_wait"])
+
+    def test_metrics_kept_by_dispose(self):
+        """The pool recreated by dispose() keeps the metrics"""
+        self.use_connection()
+        self.engine.dispose()
+        self.use_connection()
+
+        self.assertEqual(self.engine.pool.metrics.stats()["checkouts"], 2)
+
+    def test_idle_connections_pinged(self):
+        """Only connections idle for long enough are pinged"""
+        watch_liveness(self.engine, 60)
+        for _ in range(3):
+            self.use_connection()
+        self.assertEqual(self.engine.pool.metrics.stats()["pings"], 0)
+
+        with mock.patch("models.engine.db_pool.time.monotonic",
+                        side_effect=lambda: 10.0 ** 9):
+            self.use_connection()
+        self.assertEqual(self.engine.pool.metrics.stats()["pings"], 1)
+
+    def test_dead_connection_replaced(self):
+        """A connection failing its ping is replaced by a new one"""
+        watch_liveness(self.engine, 0)
+        self.use_connection()
+
+        with mock.patch.object(self.engine.dialect, "do_ping",
+                               side_effect=OSError("gone away")):
+            self.use_connection()
+
+        stats = self.engine.pool.metrics.stats()
+        self.assertEqual((stats["pings"], stats["ping_failures"]), (1, 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
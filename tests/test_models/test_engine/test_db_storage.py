@@ -1,13 +1,338 @@
 #!/usr/bin/python3
 """test for DB storage"""
+import importlib
 import os
 import unittest
+from datetime import datetime, timedelta
+from unittest import mock
+
+from sqlalchemy import event, inspect, update
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.orm.exc import StaleDataError
+
+from models import storage
+from models.base_model import VERSIONED_MODELS
+from models.amenity import Amenity
+from models.city import City
+from models.place import Place
+from models.state import State
+from models.user import User
 
 
 @unittest.skipIf(os.getenv("HBNB_TYPE_STORAGE") != 'db', 'DB Storage test')
 class TestDBStorage(unittest.TestCase):
     """Tests the DB Storage"""
-    pass
+
+    def setUp(self):
+        """Creates a place, with its city and owner, not stored yet"""
+        self.state = State(name="California")
+        self.city = City(name="Fresno", state_id=self.state.id)
+        self.user = User(email="a@b.c", password="pwd")
+        self.place = Place(name="Home", city_id=self.city.id,
+                           user_id=self.user.id)
+        self.amenity = Amenity(name="Wifi")
+        self.objects = [self.state, self.city, self.user, self.place,
+                        self.amenity]
+
+    def tearDown(self):
+        """Deletes the objects stored by the test"""
+        storage.close()
+        for obj in reversed(self.objects):
+            stored = storage.find(type(obj).__name__, obj.id)
+            if stored:
+                storage.delete(stored)
+        storage.save()
+        storage.close()
+
+
+@unittest.skipIf(os.getenv("HBNB_TYPE_STORAGE") != 'db', 'DB Storage test')
+class TestDBStorageNewMany(TestDBStorage):
+    """Tests storage.new_many() of the DB Storage"""
+
+    def test_objects_are_attached(self):
+        """The objects end up in the session, as after new()"""
+        storage.new_many(self.objects)
+        for obj in self.objects:
+            self.assertTrue(inspect(obj).persistent)
+
+    def test_relationships_are_saved(self):
+        """The related objects set before new_many() are saved too"""
+        self.place.amenities.append(self.amenity)
+        storage.new_many(self.objects)
+        storage.close()
+
+        place = storage.find("Place", self.place.id)
+        self.assertEqual([amenity.id for amenity in place.amenities],
+                         [self.amenity.id])
+
+
+@unittest.skipIf(os.getenv("HBNB_TYPE_STORAGE") != 'db', 'DB Storage test')
+class TestDBStoragePage(TestDBStorage):
+    """Tests storage.page() of the DB Storage"""
+
+    def test_token_from_stored_created_at(self):
+        """Pages seek past the created_at stored, not the one in memory"""
+        created_at = datetime(2000, 1, 1)
+        states = [State(name=f"State {i}", created_at=created_at.isoformat())
+                  for i in range(3)]
+        states.sort(key=lambda state: state.id)
+        self.objects += states
+        storage.new_many(states)
+        for state in states:
+            set_committed_value(state, "created_at",
+                                created_at + timedelta(microseconds=600))
+
+        found, token = [], None
+        while len(found) < len(states):
+            objects, token = storage.page(State, 1, token)
+            found += objects
+        self.assertEqual(found, states)
+
+
+@unittest.skipIf(os.getenv("HBNB_TYPE_STORAGE") != 'db', 'DB Storage test')
+@unittest.skipUnless(VERSIONED_MODELS, 'HBNB_DB_VERSIONING=1 test')
+class TestDBStorageVersionedUpdate(TestDBStorage):
+    """Tests storage.update() of the DB Storage on versioned rows"""
+
+    def setUp(self):
+        """Stores a state and counts the UPDATE statements sent"""
+        super().setUp()
+        storage.new(self.state)
+        storage.save()
+        self.engine = inspect(self.state).session.get_bind()
+        self.updates = []
+        event.listen(Engine, "before_cursor_execute", self.count)
+
+    def tearDown(self):
+        """Stops counting and deletes the state"""
+        event.remove(Engine, "before_cursor_execute", self.count)
+        super().tearDown()
+
+    def count(self, *args):
+        """Records an UPDATE statement"""
+        if args[2].startswith("UPDATE"):
+            self.updates.append(args[2])
+
+    def change_elsewhere(self, name):
+        """Changes the state as another writer would"""
+        with self.engine.begin() as connection:
+            connection.execute(
+                update(State).where(State.id == self.state.id)
+                .values(name=name, version=State.version + 1))
+        del self.updates[:]
+
+    def test_retried_on_the_current_row(self):
+        """An update of a row changed since it was loaded is retried on
+        the current version"""
+        self.change_elsewhere("Nevada")
+
+        storage.update(self.state, name="Oregon")
+        storage.save()
+        self.assertEqual(len(self.updates), 2)
+        self.assertEqual((self.state.name, self.state.version),
+                         ("Oregon", 3))
+
+        storage.close()
+        stored = storage.find("State", self.state.id)
+        self.assertEqual((stored.name, stored.version), ("Oregon", 3))
+
+    def test_retries_bounded(self):
+        """StaleDataError is raised once the retries are used up"""
+        storage.close()
+        self.change_elsewhere("Nevada")
+
+        with self.assertRaises(StaleDataError):
+            storage.update(self.state, name="Oregon")
+        self.assertEqual(len(self.updates),
+                         int(os.getenv("HBNB_DB_UPDATE_RETRIES", 3)) + 1)
+        storage.close()
+        self.assertEqual(storage.find("State", self.state.id).name, "Nevada")
+
+
+@unittest.skipIf(os.getenv("HBNB_TYPE_STORAGE") != 'db', 'DB Storage test')
+class TestDBStorageOnly(TestDBStorage):
+    """Tests the queries of rows of the DB Storage"""
+
+    def test_only_selects_the_columns(self):
+        """only() selects the id and the columns asked for"""
+        storage.new_many([self.state, self.city])
+        statements = []
+
+        def record(*args):
+            statements.append(args[2])
+
+        event.listen(Engine, "before_cursor_execute", record)
+        try:
+            rows = storage.query(City).only("name") \
+                .filter("state_id", "==", self.state.id).all()
+        finally:
+            event.remove(Engine, "before_cursor_execute", record)
+
+        self.assertEqual([tuple(row) for row in rows],
+                         [(self.city.id, "Fresno")])
+        self.assertEqual(rows[0].name, "Fresno")
+        self.assertEqual(len(statements), 1)
+        selected = statements[0].split("FROM")[0]
+        self.assertIn("name", selected)
+        self.assertNotIn("created_at", selected)
+
+    def test_only_unknown_column(self):
+        """A row attribute without a column raises ValueError"""
+        with self.assertRaises(ValueError):
+            storage.query(State).only("cities").all()
+
+
+@unittest.skipIf(os.getenv("HBNB_TYPE_STORAGE") != 'db', 'DB Storage test')
+class TestDBStorageLookups(TestDBStorage):
+    """Tests storage.find_many() and storage.exists() of the DB Storage"""
+
+    def setUp(self):
+        """Stores states and records the statements sent afterwards"""
+        super().setUp()
+        self.states = [State(name=f"State {i}") for i in range(3)]
+        self.objects += self.states
+        storage.new_many(self.states)
+        storage.close()
+        self.statements = []
+        event.listen(Engine, "before_cursor_execute", self.record)
+
+    def tearDown(self):
+        """Stops recording and deletes the states"""
+        event.remove(Engine, "before_cursor_execute", self.record)
+        super().tearDown()
+
+    def record(self, *args):
+        """Records a statement"""
+        self.statements.append(args[2])
+
+    def test_find_many_in_chunks(self):
+        """The objects are loaded with a query per thousand IDs, and
+        returned in the order of the IDs"""
+        ids = [self.states[2].id] + [f"missing {i}" for i in range(1000)] \
+            + [self.states[0].id, self.states[2].id]
+
+        found = storage.find_many("State", ids)
+        self.assertEqual([(_id, obj.name) for _id, obj in found.items()],
+                         [(self.states[2].id, "State 2"),
+                          (self.states[0].id, "State 0")])
+        if os.getenv("HBNB_DB_CACHE_STALENESS") != "trust":
+            self.assertEqual(len(self.statements), 2)
+        self.assertEqual(storage.find_many("Unknown", ids), {})
+
+    def test_exists_loads_no_column(self):
+        """exists() tells whether a row exists without selecting it"""
+        self.assertTrue(storage.exists("State", self.states[0].id))
+        self.assertFalse(storage.exists("State", "missing"))
+        self.assertFalse(storage.exists("City", self.states[0].id))
+
+        self.assertEqual(len(self.statements), 3)
+        for statement in self.statements:
+            self.assertIn("EXISTS", statement)
+            self.assertNotIn("name", statement)
+
+
+@unittest.skipIf(os.getenv("HBNB_TYPE_STORAGE") != 'db', 'DB Storage test')
+class TestDBStoragePageQueries(unittest.TestCase):
+    """Tests the number of queries of the web_flask pages"""
+
+    PAGES = (("9-states", "/states"),
+             ("8-cities_by_states", "/cities_by_states"),
+             ("10-hbnb_filters", "/hbnb_filters"),
+             ("100-hbnb", "/hbnb"))
+
+    def setUp(self):
+        """Counts the statements sent to the database"""
+        self.statements = []
+        self.objects = []
+        event.listen(Engine, "before_cursor_execute", self.count)
+
+    def tearDown(self):
+        """Stops counting and deletes the rows added by the test"""
+        event.remove(Engine, "before_cursor_execute", self.count)
+        for _class in (Place, City, State, User, Amenity):
+            storage.delete_many(_class, [obj.id for obj in self.objects
+                                         if type(obj) is _class])
+
+    def count(self, *args):
+        """Records a statement"""
+        self.statements.append(args[2])
+
+    def add_rows(self, rows_count):
+        """Adds a number of States, Cities, Users, Places and Amenities"""
+        objs = []
+        for i in range(rows_count):
+            user = User()
+            user.email, user.password = f"{user.id}@hbnb.io", user.id
+            state = State(name=f"State {i}")
+            city = City(name=f"City {i}", state_id=state.id)
+            objs += [user, state, city,
+                     Place(name=f"Place {i}", city_id=city.id,
+                           user_id=user.id),
+                     Amenity(name=f"Amenity {i}")]
+        storage.new_many(objs)
+        self.objects += objs
+
+    def page_queries(self):
+        """Returns the number of statements of every page"""
+        queries = {}
+        for module, url in self.PAGES:
+            client = importlib.import_module(f"web_flask.{module}") \
+                .app.test_client()
+            del self.statements[:]
+            self.assertEqual(client.get(url).status_code, 200)
+            queries[url] = len(self.statements)
+        return queries
+
+    def test_queries_dont_grow_with_rows(self):
+        """A page sends as many queries for N rows as for 2N rows"""
+        self.add_rows(10)
+        queries = self.page_queries()
+        self.add_rows(10)
+        self.assertEqual(self.page_queries(), queries)
+
+
+@unittest.skipIf(os.getenv("HBNB_TYPE_STORAGE") != 'db', 'DB Storage test')
+class TestDBStorageCache(TestDBStorage):
+    """Tests the object cache of storage.find()"""
+
+    def setUp(self):
+        """Stores a state and counts the statements sent afterwards"""
+        super().setUp()
+        storage.new(self.state)
+        storage.save()
+        storage.close()
+        self.statements = []
+        event.listen(Engine, "before_cursor_execute", self.count)
+
+    def tearDown(self):
+        """Stops counting and deletes the state"""
+        event.remove(Engine, "before_cursor_execute", self.count)
+        super().tearDown()
+
+    def count(self, *args):
+        """Records a statement"""
+        self.statements.append(args[2])
+
+    def test_hit_checked_once_per_interval(self):
+        """A hit within the validation interval sends no query"""
+        if os.getenv("HBNB_DB_CACHE_STALENESS", "validate") != "validate":
+            self.skipTest("validate staleness policy only")
+        storage.find("State", self.state.id)
+        storage.close()
+        del self.statements[:]
+
+        self.assertEqual(storage.find("State", self.state.id).name,
+                         "California")
+        self.assertEqual(self.statements, [])
+
+        storage.close()
+        later = mock.patch("models.engine.object_cache.time.monotonic",
+                           return_value=10 ** 9)
+        with later:
+            self.assertEqual(storage.find("State", self.state.id).name,
+                             "California")
+        self.assertEqual(len(self.statements), 1)
 
 
 if __name__ == "__main__":
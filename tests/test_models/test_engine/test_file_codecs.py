@@ -0,0 +1,129 @@
+#!/usr/bin/python3
+"""test for the file codecs"""
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from datetime import datetime
+from unittest import mock
+
+from models.engine.file_codecs import convert, get_codec
+from models.engine.file_storage import FileStorage
+from models.place import Place
+from models.state import State
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__)))))
+DICTIONARIES = {
+    "Place.1": {"__class__": "Place", "id": "1", "name": "Lôft ✓",
+                "created_at": "2024-01-02T03:04:05.123456",
+                "updated_at": "2024-01-02T03:04:05",
+                "number_rooms": 2 ** 62, "latitude": 1.5,
+                "amenity_ids": ["a", "b"], "description": None},
+    "Place.2": {"__class__": "Place", "id": "2", "name": "",
+                "created_at": "2024-01-02T03:04:05.000001",
+                "updated_at": "2024-01-02T03:04:06",
+                "number_rooms": -1, "latitude": -0.25,
+                "amenity_ids": []},
+    "State.3": {"__class__": "State", "id": "3", "name": "California",
+                "created_at": "2024-01-02T03:04:05",
+                "updated_at": "2024-01-02T03:04:05",
+                "active": True, "capital": {"name": "Sacramento"}},
+}
+
+
+def as_json(dictionaries):
+    """Returns dictionaries with their timestamps as ISO 8601 strings"""
+    return {key: {attr: value.isoformat() if isinstance(value, datetime)
+                  else value for attr, value in dictionary.items()}
+            for key, dictionary in dictionaries.items()}
+
+
+@unittest.skipIf(
+    os.getenv('HBNB_TYPE_STORAGE') == 'db', 'File Storage test')
+class TestBinaryCodec(unittest.TestCase):
+    """Tests the binary format of the File Storage"""
+
+    def setUp(self):
+        """Runs every test in a new directory, removed afterwards"""
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.addCleanup(os.chdir, os.getcwd())
+        os.chdir(directory.name)
+        self.codec = get_codec("binary")
+
+    def encode(self, dictionaries):
+        """Encodes dictionaries into the content of a binary file"""
+        return self.codec.encode(
+            self.codec.fragment(key, dictionary)
+            for key, dictionary in dictionaries.items())
+
+    def test_round_trip(self):
+        """Every column type decodes to the values encoded, missing
+        attributes staying missing"""
+        decoded = self.codec.decode(self.encode(DICTIONARIES))
+
+        self.assertIsInstance(decoded["Place.1"]["created_at"], datetime)
+        self.assertNotIn("description", decoded["Place.2"])
+        self.assertEqual(as_json(decoded), DICTIONARIES)
+
+    def test_corrupted_file_refused(self):
+        """A truncated file or another format raises ValueError"""
+        data = self.encode(DICTIONARIES)
+        for content in (data[:len(data) // 2], b"{}", b""):
+            with self.assertRaises(ValueError):
+                self.codec.decode(content)
+
+    def test_storage_round_trip(self):
+        """A binary storage reloads the objects it saved"""
+        with mock.patch.dict(os.environ, {"HBNB_FILE_FORMAT": "binary"}):
+            storage = FileStorage()
+        storage.reload()
+        state = State(name="California")
+        place = Place(name="Loft", amenity_ids=["a"], number_rooms=3)
+        storage.new_many([state, place])
+        storage.save()
+        dictionaries = (state.to_dict(), place.to_dict())
+
+        storage.reload()
+        self.assertEqual(
+            (storage.find("State", state.id).to_dict(),
+             storage.find("Place", place.id).to_dict()), dictionaries)
+
+    def test_convert_both_ways(self):
+        """A JSON file converted to binary and back is unchanged"""
+        with open("file.json", "w") as file:
+            json.dump(DICTIONARIES, file)
+
+        convert("file.json", "file.bin")
+        os.rename("file.json", "original.json")
+        convert("file.bin", "file.json")
+
+        with open("file.json") as file:
+            self.assertEqual(json.load(file), DICTIONARIES)
+
+    def test_convert_script(self):
+        """convert_storage.py converts a file, and tells its usage"""
+        with open("file.json", "w") as file:
+            json.dump(DICTIONARIES, file)
+        env = dict(os.environ, PYTHONPATH=ROOT)
+        script = os.path.join(ROOT, "convert_storage.py")
+
+        subprocess.run([sys.executable, script, "file.json", "file.bin"],
+                       env=env, check=True, timeout=60)
+        with open("file.bin", "rb") as file:
+            self.assertEqual(as_json(self.codec.decode(file.read())),
+                             DICTIONARIES)
+
+        result = subprocess.run([sys.executable, script, "file.json"],
+                                env=env, capture_output=True, text=True,
+                                timeout=60)
+        self.assertEqual(result.returncode, 1)
+        self.assertIn("Usage", result.stderr)
+
+
+if __name__ == "__main__":
+    unittest.main()
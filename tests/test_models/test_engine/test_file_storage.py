@@ -1,14 +1,899 @@
-#!/usr/bin/
+#!/usr/bin/python3
 """test for File storage"""
+import json
 import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
 import unittest
+from unittest import mock
+
+from models import storage
+from models.city import City
+from models.engine.file_storage import FileStorage
+from models.engine.file_utils import file_version, write_atomically
+from models.engine.snapshot import Snapshot
+from models.place import Place
+from models.review import Review
+from models.state import State
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__)))))
+WRITER = """
+import sys
+from models import storage
+from models.state import State
+
+for i in range(int(sys.argv[2])):
+    storage.new(State(name=f"writer {sys.argv[1]} state {i}"))
+    storage.save()
+"""
+UPDATER = """
+import os
+import sys
+import time
+from models import storage
+
+state = storage.find("State", sys.argv[1])
+setattr(state, sys.argv[2], sys.argv[3])
+open(sys.argv[2] + ".ready", "w").close()
+while not os.path.exists("go"):
+    time.sleep(0.01)
+state.save()
+"""
+CHANGER = """
+import sys
+from models import storage
+from models.state import State
+
+storage.find("State", sys.argv[1]).name = "renamed"
+storage.delete(storage.find("State", sys.argv[2]))
+storage.new(State(name="added"))
+storage.save()
+"""
+
+
+def stored_keys():
+    """Returns the keys of the objects written to file.json"""
+    with open("file.json") as file:
+        return set(json.load(file))
 
 
 @unittest.skipIf(
     os.getenv('HBNB_TYPE_STORAGE') == 'db', 'File Storage test')
 class TestFileStorage(unittest.TestCase):
     """Tests the File Storage"""
-    pass
+
+    def setUp(self):
+        """Runs every test on an empty file.json in a new directory,
+        removed afterwards"""
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.addCleanup(os.chdir, os.getcwd())
+        os.chdir(directory.name)
+        with open("file.json", "w") as file:
+            file.write("{}")
+        storage.reload()
+
+
+@unittest.skipIf(
+    os.getenv('HBNB_TYPE_STORAGE') == 'db', 'File Storage test')
+class TestFileStorageSave(TestFileStorage):
+    """Tests storage.save() of the File Storage"""
+
+    def test_save_after_change_in_place(self):
+        """obj.save() writes changes made in place to an attribute"""
+        place = Place(name="Loft")
+        place.amenity_ids = ["a"]
+        place.save()
+        place.amenity_ids.append("b")
+        place.save()
+
+        storage.reload()
+        self.assertEqual(storage.find("Place", place.id).amenity_ids,
+                         ["a", "b"])
+
+
+@unittest.skipIf(
+    os.getenv('HBNB_TYPE_STORAGE') == 'db', 'File Storage test')
+class TestFileStorageCommit(TestFileStorage):
+    """Tests the durable and grouped writes of storage.save()"""
+
+    def setUp(self):
+        """Opens a storage waiting for saves to group"""
+        super().setUp()
+        with mock.patch.dict(os.environ, {"HBNB_FILE_COMMIT_WINDOW": "0.2"}):
+            self.storage = FileStorage()
+
+    def save_concurrently(self, states):
+        """Saves each state from its own thread, returning the errors"""
+        errors = []
+
+        def save(state):
+            self.storage.new(state)
+            try:
+                self.storage.save()
+            except OSError as err:
+                errors.append(err)
+
+        threads = [threading.Thread(target=save, args=(state,))
+                   for state in states]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return errors
+
+    def test_concurrent_saves_grouped(self):
+        """Saves from several threads share one write"""
+        states = [State(name=f"State {i}") for i in range(4)]
+        self.assertEqual(self.save_concurrently(states), [])
+
+        stats = self.storage.commit_stats()
+        self.assertEqual(stats["requests"], 4)
+        self.assertLess(stats["commits"], 4)
+        self.assertEqual(stored_keys(),
+                         {f"State.{state.id}" for state in states})
+
+    def test_failed_group_retried_by_followers(self):
+        """Only the leader of a failed write raises, its followers write
+        every change"""
+        states = [State(name=f"State {i}") for i in range(3)]
+        failures = [OSError("disk full")]
+
+        def fail_once(*args):
+            if failures:
+                raise failures.pop()
+            return write_atomically(*args)
+
+        with mock.patch("models.engine.file_storage.write_atomically",
+                        side_effect=fail_once):
+            errors = self.save_concurrently(states)
+
+        self.assertEqual(len(errors), 1)
+        self.assertEqual(stored_keys(),
+                         {f"State.{state.id}" for state in states})
+
+    def test_failed_rename_keeps_the_file(self):
+        """A write failing before the rename leaves the previous file,
+        and the changes are written by the next save"""
+        state = State(name="California")
+        self.storage.new(state)
+        with mock.patch("models.engine.file_utils.os.replace",
+                        side_effect=OSError("read-only")):
+            with self.assertRaises(OSError):
+                self.storage.save()
+
+        self.assertEqual(stored_keys(), set())
+        self.storage.save()
+        self.assertEqual(stored_keys(), {f"State.{state.id}"})
+
+
+@unittest.skipIf(
+    os.getenv('HBNB_TYPE_STORAGE') == 'db', 'File Storage test')
+class TestFileStorageTransaction(TestFileStorage):
+    """Tests storage.transaction() of the File Storage"""
+
+    def test_commit_writes_once_at_the_end(self):
+        """Changes are saved with one write when the block ends, not
+        before"""
+        first, second = State(name="California"), State(name="Nevada")
+        with mock.patch("models.engine.file_storage.write_atomically",
+                        wraps=write_atomically) as write:
+            with storage.transaction():
+                storage.new(first)
+                storage.save()
+                storage.new(second)
+                storage.save()
+                self.assertEqual(write.call_count, 0)
+                self.assertEqual(stored_keys(), set())
+
+        self.assertEqual(write.call_count, 1)
+        self.assertEqual(stored_keys(),
+                         {f"State.{first.id}", f"State.{second.id}"})
+
+    def test_rollback_new(self):
+        """An object added in a failed block is removed"""
+        state = State(name="California")
+        with self.assertRaises(RuntimeError):
+            with storage.transaction():
+                storage.new(state)
+                raise RuntimeError
+
+        self.assertIsNone(storage.find("State", state.id))
+        self.assertEqual(storage.count("State"), 0)
+        storage.save()
+        self.assertEqual(stored_keys(), set())
+
+    def test_rollback_delete(self):
+        """An object deleted in a failed block is stored again"""
+        state = State(name="California")
+        storage.new(state)
+        storage.save()
+
+        with self.assertRaises(RuntimeError):
+            with storage.transaction():
+                storage.delete(state)
+                raise RuntimeError
+
+        self.assertIs(storage.find("State", state.id), state)
+        self.assertEqual(stored_keys(), {f"State.{state.id}"})
+
+    def test_rollback_change(self):
+        """Attributes changed in a failed block are restored, with the
+        foreign key indexes"""
+        first, second = State(name="California"), State(name="Nevada")
+        city = City(name="Fresno", state_id=first.id)
+        storage.new_many([first, second, city])
+
+        with self.assertRaises(RuntimeError):
+            with storage.transaction():
+                city.name = "Reno"
+                city.state_id = second.id
+                raise RuntimeError
+
+        self.assertEqual((city.name, city.state_id), ("Fresno", first.id))
+        self.assertEqual(storage.find_related("City", "state_id", first.id),
+                         [city])
+        self.assertEqual(
+            storage.find_related("City", "state_id", second.id), [])
+
+    def test_nested_transaction_joins_the_outer_one(self):
+        """A nested block is saved and undone with the outer one"""
+        first, second = State(name="California"), State(name="Nevada")
+        with storage.transaction():
+            storage.new(first)
+            with storage.transaction():
+                storage.new(second)
+            self.assertEqual(stored_keys(), set())
+
+        self.assertEqual(stored_keys(),
+                         {f"State.{first.id}", f"State.{second.id}"})
+
+        third = State(name="Oregon")
+        with self.assertRaises(RuntimeError):
+            with storage.transaction():
+                first.name = "Arizona"
+                with storage.transaction():
+                    storage.new(third)
+                    raise RuntimeError
+
+        self.assertEqual(first.name, "California")
+        self.assertIsNone(storage.find("State", third.id))
+
+    def test_reload_close_and_flush_refused(self):
+        """Operations discarding or waiting for the changes raise"""
+        with storage.transaction():
+            for operation in (storage.reload, storage.close, storage.flush):
+                with self.assertRaises(ValueError):
+                    operation()
+
+
+@unittest.skipIf(
+    os.getenv('HBNB_TYPE_STORAGE') == 'db', 'File Storage test')
+class TestFileStorageJournal(TestFileStorage):
+    """Tests the journal mode of the File Storage"""
+
+    def setUp(self):
+        """Opens a storage appending its changes to a journal"""
+        super().setUp()
+        with mock.patch.dict(os.environ, {"HBNB_FILE_JOURNAL": "1"}):
+            self.storage = FileStorage()
+        self.storage.reload()
+
+    def test_torn_record_is_cut_off(self):
+        """The records saved after a torn append survive reloads"""
+        self.storage.new(State(name="before-crash"))
+        self.storage.save()
+        with open("file.json.journal", "a") as file:
+            file.write('{"op": "new", "key": "State.torn", "da')
+
+        self.storage.new(State(name="after-crash"))
+        self.storage.save()
+
+        for _ in range(2):
+            self.storage.reload()
+            self.assertEqual(
+                sorted(state.name
+                       for state in self.storage.all(State).values()),
+                ["after-crash", "before-crash"])
+
+    def test_replay_cuts_a_torn_tail(self):
+        """Reloading a journal ending in a torn record cuts it off"""
+        self.storage.new(State(name="before-crash"))
+        self.storage.save()
+        size = os.path.getsize("file.json.journal")
+        with open("file.json.journal", "a") as file:
+            file.write('{"op": "delete", "ke')
+
+        self.storage.reload()
+        self.assertEqual(os.path.getsize("file.json.journal"), size)
+        self.assertEqual(self.storage.count("State"), 1)
+
+
+@unittest.skipIf(
+    os.getenv('HBNB_TYPE_STORAGE') == 'db', 'File Storage test')
+class TestFileStorageIndexes(TestFileStorage):
+    """Tests the class and foreign key indexes of the File Storage"""
+
+    def test_class_index_follows_deletes(self):
+        """all(cls), count() and find_all() drop the deleted objects"""
+        states = [State(name=f"State {i}") for i in range(3)]
+        city = City(name="Fresno", state_id=states[2].id)
+        storage.new_many(states + [city])
+
+        storage.delete(states[0])
+        storage.delete_many(State, [states[1].id])
+
+        for _ in range(2):
+            self.assertEqual(dict(storage.all(State)),
+                             {f"State.{states[2].id}": states[2]})
+            self.assertEqual(storage.count("State"), 1)
+            self.assertEqual(storage.find_all("State"), [str(states[2])])
+            self.assertEqual(dict(storage.all(City)),
+                             {f"City.{city.id}": city})
+            storage.save()
+            storage.reload()
+            states[2] = storage.find("State", states[2].id)
+            city = storage.find("City", city.id)
+
+    def test_foreign_key_index_follows_changes(self):
+        """state.cities and place.reviews follow reassigned and deleted
+        objects"""
+        first, second = State(name="California"), State(name="Nevada")
+        city = City(name="Fresno", state_id=first.id)
+        place = Place(name="Loft", city_id=city.id)
+        review = Review(text="Nice", place_id=place.id)
+        storage.new_many([first, second, city, place, review])
+        self.assertEqual(first.cities, [city])
+        self.assertEqual(place.reviews, [review])
+
+        city.state_id = second.id
+        self.assertEqual((first.cities, second.cities), ([], [city]))
+
+        storage.delete(review)
+        self.assertEqual(place.reviews, [])
+
+        storage.save()
+        storage.reload()
+        first = storage.find("State", first.id)
+        second = storage.find("State", second.id)
+        self.assertEqual(first.cities, [])
+        self.assertEqual([city.name for city in second.cities], ["Fresno"])
+        self.assertEqual(storage.find("Place", place.id).reviews, [])
+
+
+@unittest.skipIf(
+    os.getenv('HBNB_TYPE_STORAGE') == 'db', 'File Storage test')
+class TestFileStorageLazy(TestFileStorage):
+    """Tests the lazy mode of the File Storage with a tiny cache"""
+
+    def setUp(self):
+        """Stores states and cities, and opens a lazy storage on them
+        caching about one object"""
+        super().setUp()
+        self.states = [State(name=f"State {i}") for i in range(20)]
+        self.cities = [City(name=f"City {i}", state_id=state.id)
+                       for i, state in enumerate(self.states)]
+        storage.new_many(self.states + self.cities)
+        storage.save()
+
+        with mock.patch.dict(os.environ, {
+                "HBNB_FILE_LAZY": "1", "HBNB_FILE_LAZY_CACHE_BYTES": "1"}):
+            self.storage = FileStorage()
+        self.storage.reload()
+
+    def test_reads_past_the_cache(self):
+        """Every object is read, however few are cached"""
+        self.assertEqual(self.storage.count("State"), 20)
+        self.assertEqual(
+            sorted(state.name for state in self.storage.all(State).values()),
+            sorted(state.name for state in self.states))
+        for state, city in zip(self.states, self.cities):
+            self.assertEqual(self.storage.find("State", state.id).name,
+                             state.name)
+            self.assertEqual(
+                [city.name for city in self.storage.find_related(
+                    "City", "state_id", state.id)], [city.name])
+
+    def test_changed_object_not_evicted(self):
+        """An object changed and not saved yet stays as changed while
+        other objects are read, and is saved"""
+        state = self.storage.find("State", self.states[0].id)
+        with mock.patch("models.storage", self.storage):
+            state.name = "Renamed"
+        for other in self.states[1:]:
+            self.storage.find("State", other.id)
+
+        self.assertIs(self.storage.find("State", state.id), state)
+        self.storage.save()
+        storage.reload()
+        self.assertEqual(storage.find("State", state.id).name, "Renamed")
+
+
+@unittest.skipIf(
+    os.getenv('HBNB_TYPE_STORAGE') == 'db', 'File Storage test')
+class TestFileStorageSharded(TestFileStorage):
+    """Tests the sharded mode of the File Storage"""
+
+    def open_storage(self):
+        """Opens a storage with a file per class"""
+        with mock.patch.dict(os.environ, {"HBNB_FILE_SHARDED": "1"}):
+            sharded = FileStorage()
+        sharded.reload()
+        return sharded
+
+    def test_only_changed_classes_rewritten(self):
+        """A save rewrites the files of the classes changed only"""
+        sharded = self.open_storage()
+        state = State(name="California")
+        sharded.new_many([state, City(name="Fresno", state_id=state.id)])
+        sharded.save()
+        version = file_version("file.City.json")
+
+        state.name = "Nevada"
+        sharded.new(state)
+        sharded.save()
+        self.assertEqual(file_version("file.City.json"), version)
+
+        reader = self.open_storage()
+        self.assertEqual(reader.find("State", state.id).name, "Nevada")
+        self.assertEqual(reader.count("City"), 1)
+
+    def test_unsharded_file_read_until_saved(self):
+        """The objects of a class without a file are read from file.json
+        until the class is saved"""
+        state = State(name="California")
+        storage.new(state)
+        storage.save()
+
+        sharded = self.open_storage()
+        self.assertEqual(sharded.find("State", state.id).name, "California")
+        self.assertFalse(os.path.exists("file.State.json"))
+
+        sharded.new(State(name="Nevada"))
+        sharded.save()
+        self.assertEqual(self.open_storage().count("State"), 2)
+
+    def test_reload_sees_other_writers(self):
+        """A reload reads the classes another process saved since"""
+        sharded = self.open_storage()
+        self.assertEqual(sharded.count("State"), 0)
+
+        env = dict(os.environ, PYTHONPATH=ROOT, HBNB_FILE_SHARDED="1")
+        subprocess.run([sys.executable, "-c", WRITER, "0", "2"], env=env,
+                       check=True, timeout=60)
+
+        sharded.reload()
+        self.assertEqual(
+            sorted(state.name for state in sharded.all(State).values()),
+            ["writer 0 state 0", "writer 0 state 1"])
+        self.assertTrue(os.path.exists("file.State.json"))
+
+
+@unittest.skipIf(
+    os.getenv('HBNB_TYPE_STORAGE') == 'db', 'File Storage test')
+class TestFileStorageSnapshotRead(TestFileStorage):
+    """Tests the File Storage reading a published snapshot"""
+
+    def setUp(self):
+        """Publishes a snapshot of states and cities, and opens a storage
+        reading it, caching about one object"""
+        super().setUp()
+        self.states = [State(name=f"State {i}") for i in range(3)]
+        self.cities = [City(name=f"City {i}", state_id=self.states[0].id)
+                       for i in range(2)]
+        storage.new_many(self.states + self.cities)
+        storage.save()
+        storage.publish_snapshot()
+
+        with mock.patch.dict(os.environ, {
+                "HBNB_FILE_SNAPSHOT": "1", "HBNB_FILE_SNAPSHOT_CACHE": "1"}):
+            self.storage = FileStorage()
+        self.storage.reload()
+
+    def tearDown(self):
+        """Drops the objects of the snapshot"""
+        storage.reload()
+
+    def test_reads(self):
+        """Objects are found, listed and counted from the snapshot"""
+        self.assertEqual(self.storage.count("State"), 3)
+        self.assertEqual(self.storage.count("Place"), 0)
+        self.assertEqual(
+            sorted(state.name for state in self.storage.all(State).values()),
+            ["State 0", "State 1", "State 2"])
+        self.assertEqual(len(self.storage.all()), 5)
+
+        state = self.storage.find("State", self.states[1].id)
+        self.assertEqual(state.to_dict(), self.states[1].to_dict())
+        self.assertIsNot(state, self.states[1])
+        self.assertIsNone(self.storage.find("State", "missing"))
+        self.assertTrue(self.storage.exists("City", self.cities[0].id))
+
+    def test_identity_kept_while_referenced(self):
+        """An object still referenced is found again, not decoded twice,
+        however few objects are cached"""
+        state = self.storage.find("State", self.states[0].id)
+        for other in self.states[1:]:
+            self.storage.find("State", other.id)
+
+        self.assertIs(self.storage.find("State", state.id), state)
+
+    def test_related(self):
+        """Objects are found by foreign key from the snapshot"""
+        self.assertEqual(
+            sorted(city.name for city in self.storage.find_related(
+                "City", "state_id", self.states[0].id)),
+            ["City 0", "City 1"])
+        self.assertEqual(self.storage.find_related(
+            "City", "state_id", self.states[1].id), [])
+
+    def test_read_only(self):
+        """Changes are refused"""
+        with self.assertRaises(ValueError):
+            with self.storage.transaction():
+                pass
+        with self.assertRaises(ValueError):
+            self.storage.update_many(State, [self.states[0].id],
+                                     {"name": "Renamed"})
+
+
+@unittest.skipIf(
+    os.getenv('HBNB_TYPE_STORAGE') == 'db', 'File Storage test')
+class TestFileStorageClose(TestFileStorage):
+    """Tests storage.close() of the File Storage"""
+
+    def setUp(self):
+        """Stores states"""
+        super().setUp()
+        self.states = [State(name=f"State {i}") for i in range(3)]
+        storage.new_many(self.states)
+        storage.save()
+
+    def test_nothing_read_without_change(self):
+        """Nothing is merged when the file didn't change"""
+        with mock.patch.object(FileStorage, "_merge") as merge:
+            storage.close()
+
+        merge.assert_not_called()
+        self.assertIs(storage.find("State", self.states[0].id),
+                      self.states[0])
+
+    def test_changes_of_other_process_merged(self):
+        """The objects another process changed, deleted or added are
+        merged, the others keeping their identity"""
+        renamed, deleted, kept = self.states
+        env = dict(os.environ, PYTHONPATH=ROOT)
+        subprocess.run([sys.executable, "-c", CHANGER, renamed.id,
+                        deleted.id], env=env, check=True, timeout=60)
+
+        storage.close()
+        self.assertIs(storage.find("State", kept.id), kept)
+        self.assertEqual(storage.find("State", renamed.id).name, "renamed")
+        self.assertIsNone(storage.find("State", deleted.id))
+        self.assertEqual(
+            sorted(state.name for state in storage.all(State).values()),
+            ["State 2", "added", "renamed"])
+
+    def test_unsaved_changes_discarded(self):
+        """Changes not saved are dropped"""
+        self.states[0].name = "unsaved"
+        storage.new(State(name="unsaved"))
+
+        storage.close()
+        self.assertEqual(storage.find("State", self.states[0].id).name,
+                         "State 0")
+        self.assertEqual(storage.count("State"), 3)
+
+
+@unittest.skipIf(
+    os.getenv('HBNB_TYPE_STORAGE') == 'db', 'File Storage test')
+class TestFileStorageReaders(TestFileStorage):
+    """Tests the reads of the File Storage while it changes"""
+
+    def test_views_are_point_in_time(self):
+        """A view taken before changes keeps its objects"""
+        first, second = State(name="California"), State(name="Nevada")
+        storage.new(first)
+        states, every = storage.all(State), storage.all()
+
+        storage.new(second)
+        storage.delete(first)
+        self.assertEqual(list(states), [f"State.{first.id}"])
+        self.assertEqual(list(every), [f"State.{first.id}"])
+        self.assertEqual(list(storage.all(State)), [f"State.{second.id}"])
+
+    def test_reads_dont_wait_for_a_save(self):
+        """Reads complete while a save is writing the file"""
+        state = State(name="California")
+        storage.new(state)
+        writing, release = threading.Event(), threading.Event()
+
+        def write(*args):
+            writing.set()
+            release.wait(10)
+            return write_atomically(*args)
+
+        with mock.patch("models.engine.file_storage.write_atomically",
+                        side_effect=write):
+            saver = threading.Thread(target=storage.save)
+            saver.start()
+            self.assertTrue(writing.wait(10))
+            reads = []
+            reader = threading.Thread(target=lambda: reads.extend([
+                storage.find("State", state.id),
+                list(storage.all(State).values()),
+                storage.count("State")]))
+            reader.start()
+            reader.join(5)
+            read_during_write = not reader.is_alive()
+            release.set()
+            saver.join()
+            reader.join()
+
+        self.assertTrue(read_during_write)
+        self.assertEqual(reads, [state, [state], 1])
+        self.assertEqual(stored_keys(), {f"State.{state.id}"})
+
+    def test_iteration_during_changes(self):
+        """Views are iterated while another thread adds and deletes"""
+        storage.new_many([State(name=f"State {i}") for i in range(100)])
+        done, errors = threading.Event(), []
+
+        def change():
+            while not done.is_set():
+                state = State(name="churn")
+                storage.new(state)
+                storage.delete(state)
+
+        writer = threading.Thread(target=change)
+        writer.start()
+        try:
+            for _ in range(200):
+                try:
+                    self.assertGreaterEqual(
+                        sum(1 for _ in storage.all(State).values()), 100)
+                except RuntimeError as error:
+                    errors.append(error)
+        finally:
+            done.set()
+            writer.join()
+
+        self.assertEqual(errors, [])
+
+
+@unittest.skipIf(
+    os.getenv('HBNB_TYPE_STORAGE') == 'db', 'File Storage test')
+class TestFileStorageLookups(TestFileStorage):
+    """Tests storage.find_many() and storage.exists() of the File
+    Storage"""
+
+    def test_find_many(self):
+        """The objects found are returned by ID in the order of the IDs,
+        without the IDs not found"""
+        states = [State(name=f"State {i}") for i in range(3)]
+        storage.new_many(states)
+        ids = [states[2].id, "missing", states[0].id, states[2].id]
+
+        found = storage.find_many("State", ids)
+        self.assertEqual(list(found.items()), [(states[2].id, states[2]),
+                                               (states[0].id, states[0])])
+        self.assertEqual(storage.find_many("City", ids), {})
+        self.assertEqual(storage.find_many("Unknown", ids), {})
+
+    def test_exists(self):
+        """Only stored objects exist"""
+        state = State(name="California")
+        storage.new(state)
+
+        self.assertTrue(storage.exists("State", state.id))
+        self.assertFalse(storage.exists("City", state.id))
+        self.assertFalse(storage.exists("State", "missing"))
+        self.assertFalse(storage.exists("Unknown", state.id))
+        self.assertFalse(storage.exists("State", None))
+        storage.delete(state)
+        self.assertFalse(storage.exists("State", state.id))
+
+
+@unittest.skipIf(
+    os.getenv('HBNB_TYPE_STORAGE') == 'db', 'File Storage test')
+class TestFileStorageQuery(TestFileStorage):
+    """Tests storage.query() of the File Storage"""
+
+    def test_foreign_key_values_not_indexed(self):
+        """Conditions on values the indexes skip match as in a scan"""
+        state = State(name="California")
+        cities = [City(name="Fresno", state_id=state.id),
+                  City(name="Nowhere", state_id=""),
+                  City(name="Unknown", state_id=None)]
+        storage.new_many([state] + cities)
+
+        for value, expected in ((state.id, cities[:1]), ("", cities[1:2]),
+                                (None, cities[2:])):
+            self.assertEqual(storage.query(City)
+                             .filter("state_id", "==", value).all(),
+                             expected)
+        self.assertEqual(storage.query(City).order_by("name")
+                         .filter("state_id", "in", ["", state.id]).all(),
+                         cities[:2])
+
+    def test_values_of_mixed_types(self):
+        """Filters and sorts never raise on values of other types"""
+        places = [Place(name="Str", price_by_night="50"),
+                  Place(name="Cheap", price_by_night=20),
+                  Place(name="Dear", price_by_night=120),
+                  Place(name="None", price_by_night=None)]
+        storage.new_many(places)
+
+        self.assertEqual(storage.query(Place)
+                         .filter("price_by_night", "<", 100).all(),
+                         places[1:2])
+        self.assertEqual(storage.query(Place).order_by("price_by_night")
+                         .all(), [places[3], places[1], places[2], places[0]])
+        self.assertEqual(storage.query(Place)
+                         .order_by("-price_by_night")
+                         .first(), places[0])
+
+    def test_only_returns_rows(self):
+        """only() returns rows of the id and the attributes asked for"""
+        states = [State(name=name) for name in ("Nevada", "California")]
+        storage.new_many(states)
+
+        rows = storage.query(State).only("name", "motto").order_by("name") \
+            .all()
+        self.assertEqual(rows, [(states[1].id, "California", None),
+                                (states[0].id, "Nevada", None)])
+        self.assertEqual((rows[0].id, rows[0].name, rows[0].motto),
+                         (states[1].id, "California", None))
+        self.assertEqual(storage.query(State).only("name").order_by("name")
+                         .offset(1).first(), (states[0].id, "Nevada"))
+
+        with self.assertRaises(ValueError):
+            storage.query(State).only("name").load("cities")
+        with self.assertRaises(ValueError):
+            storage.query(State).load("cities").only("name")
+
+
+@unittest.skipIf(
+    os.getenv('HBNB_TYPE_STORAGE') == 'db', 'File Storage test')
+class TestFileStorageProcesses(TestFileStorage):
+    """Tests the File Storage shared by several processes"""
+
+    def test_no_lost_updates(self):
+        """Every State saved by concurrent writers is in the file"""
+        writers_count, saves_count = 4, 5
+        env = dict(os.environ, PYTHONPATH=ROOT)
+        writers = [subprocess.Popen(
+            [sys.executable, "-c", WRITER, str(number), str(saves_count)],
+            env=env) for number in range(writers_count)]
+        for process in writers:
+            self.assertEqual(process.wait(timeout=60), 0)
+
+        storage.reload()
+        self.assertEqual(
+            sorted(state.name for state in storage.all(State).values()),
+            sorted(f"writer {number} state {i}"
+                   for number in range(writers_count)
+                   for i in range(saves_count)))
+
+    def test_updates_of_one_object_merged(self):
+        """Processes changing different attributes of one State saved
+        after both read it keep both changes"""
+        state = State(name="orig", motto="none")
+        storage.new(state)
+        storage.save()
+
+        env = dict(os.environ, PYTHONPATH=ROOT)
+        updaters = [subprocess.Popen(
+            [sys.executable, "-c", UPDATER, state.id, attr, value],
+            env=env) for attr, value in (("name", "renamed"),
+                                         ("motto", "Eureka"))]
+        deadline = time.monotonic() + 60
+        while not (os.path.exists("name.ready") and
+                   os.path.exists("motto.ready")) and \
+                time.monotonic() < deadline:
+            time.sleep(0.01)
+        open("go", "w").close()
+        for process in updaters:
+            self.assertEqual(process.wait(timeout=60), 0)
+
+        storage.reload()
+        state = storage.find("State", state.id)
+        self.assertEqual((state.name, state.motto), ("renamed", "Eureka"))
+
+
+@unittest.skipIf(
+    os.getenv('HBNB_TYPE_STORAGE') == 'db', 'File Storage test')
+class TestFileStorageWriteBehind(TestFileStorage):
+    """Tests transactions of the File Storage in write-behind mode"""
+
+    def setUp(self):
+        """Opens a write-behind storage on the objects"""
+        super().setUp()
+        with mock.patch.dict(os.environ, {
+                "HBNB_FILE_WRITE_BEHIND": "1",
+                "HBNB_FILE_WRITE_BEHIND_MAX_STALENESS": "0.05"}):
+            self.storage = FileStorage()
+
+    def tearDown(self):
+        """Stops the background thread of the storage"""
+        self.storage.shutdown()
+
+    def test_flush_in_transaction_with_pending_write(self):
+        """flush() raises instead of waiting for the writer, which waits
+        for the transaction"""
+        first, second = State(name="California"), State(name="Nevada")
+        self.storage.new(first)
+        self.storage.save()
+
+        with self.storage.transaction():
+            self.storage.new(second)
+            time.sleep(0.1)
+            with self.assertRaises(ValueError):
+                self.storage.flush()
+
+        self.storage.flush()
+        self.assertEqual(stored_keys(),
+                         {f"State.{first.id}", f"State.{second.id}"})
+
+    def test_rollback_isnt_written(self):
+        """The changes of a failed block never reach the file"""
+        state = State(name="California")
+        with self.assertRaises(RuntimeError):
+            with self.storage.transaction():
+                self.storage.new(state)
+                self.storage.save()
+                raise RuntimeError
+
+        self.storage.flush()
+        self.assertIsNone(self.storage.find("State", state.id))
+        self.assertEqual(stored_keys(), set())
+
+    def test_commit_is_written_behind(self):
+        """The changes of a block are written by the background writer"""
+        state = State(name="California")
+        with self.storage.transaction():
+            self.storage.new(state)
+
+        self.storage.flush()
+        self.assertEqual(stored_keys(), {f"State.{state.id}"})
+
+
+@unittest.skipIf(
+    os.getenv('HBNB_TYPE_STORAGE') == 'db', 'File Storage test')
+class TestFileStorageSnapshotPublish(TestFileStorage):
+    """Tests the publication of snapshots by the File Storage"""
+
+    def setUp(self):
+        """Opens a storage publishing snapshots"""
+        super().setUp()
+        with mock.patch.dict(os.environ, {
+                "HBNB_FILE_SNAPSHOT_PUBLISH": "1",
+                "HBNB_FILE_SNAPSHOT_INTERVAL": "0.5"}):
+            self.storage = FileStorage()
+
+    def tearDown(self):
+        """Stops the background thread of the storage"""
+        self.storage.shutdown()
+
+    def test_published_behind_save(self):
+        """save() doesn't wait for the snapshot, published soon after"""
+        state = State(name="California")
+        self.storage.new(state)
+        self.storage.save()
+        self.assertFalse(os.path.exists("file.snapshot"))
+
+        deadline = time.monotonic() + 10
+        while not os.path.exists("file.snapshot") and \
+                time.monotonic() < deadline:
+            time.sleep(0.05)
+        snapshot = Snapshot("file.snapshot")
+        self.assertIsNotNone(snapshot.get(f"State.{state.id}"))
+        snapshot.close()
 
 
 if __name__ == '__main__':
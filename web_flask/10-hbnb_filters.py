@@ -12,8 +12,8 @@ app.url_map.strict_slashes = False
 
 @app.route('/hbnb_filters')
 def hbnb():
-    amenities = storage.all(Amenity).values()
-    states = storage.all(State).values()
+    amenities = storage.query(Amenity).only("name").order_by("name").all()
+    states = storage.query(State).order_by("name").load("cities").all()
     return render_template(
         "10-hbnb_filters.html",
         amenities=amenities,
@@ -18,9 +18,9 @@ app.url_map.strict_slashes = False
 @app.route('/hbnb')
 def hbnb():
     """Displays the main HBnB filters HTML page."""
-    amenities = storage.all(Amenity).values()
-    places = storage.all(Place).values()
-    states = storage.all(State).values()
+    amenities = storage.query(Amenity).only("name").order_by("name").all()
+    places = storage.query(Place).order_by("name").load("user").all()
+    states = storage.query(State).order_by("name").load("cities").all()
     return render_template(
         "100-hbnb.html",
         amenities=amenities,
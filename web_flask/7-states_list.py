@@ -24,7 +24,7 @@ def list_states():
     Returns:
         Rendered HTML template displaying the list of states.
     """
-    states = storage.all(State).values()
+    states = storage.query(State).only("name").order_by("name").all()
     return render_template('7-states_list.html', states=states)
 
 
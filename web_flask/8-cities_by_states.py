@@ -29,7 +29,7 @@ def cities_by_states():
     Returns:
         Rendered HTML template displaying the list of states.
     """
-    states = storage.all(State).values()
+    states = storage.query(State).order_by("name").load("cities").all()
     return render_template('8-cities_by_states.html', states=states)
 
 
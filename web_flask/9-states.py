@@ -25,7 +25,7 @@ def list_states():
     Returns:
         Rendered HTML template displaying the list of states.
     """
-    states = storage.all(State)
+    states = storage.query(State).order_by("name").all()
     return render_template("9-states.html", states=states)
 
 